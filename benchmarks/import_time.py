@@ -0,0 +1,121 @@
+"""
+Import-Time Benchmark
+=====================
+Guards the startup cost of the solver modules. Every module is imported in
+a fresh interpreter (best of several runs) and checked for:
+
+1. Heavy reporting dependencies (pandas, matplotlib, seaborn) being pulled
+   in at import time - these must only load on first use
+2. Import time above the budget (default 300 ms, numpy included)
+
+Usage:
+    python benchmarks/import_time.py [--repeat 5] [--budget-ms 300]
+
+Exits with status 1 if any check fails, so it can run in CI.
+
+Author: [E/21/291]
+Date: January 2026
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+LEGACY_DIR = os.path.join(ROOT_DIR, 'legacy')
+
+# Modules that must import without any plotting or dataframe dependency
+MODULES = [
+    'numpy',
+    'methods.newton_raphson',
+    'methods.reporting',
+    'methods.current_injection',
+    'methods.engines',
+    'methods.helm',
+    'methods.newton_krylov',
+    'methods.broyden',
+    'methods.batch_newton',
+    'methods.state_estimation',
+    'methods.short_circuit',
+    'methods.opf',
+    'methods.transient_stability',
+    'methods.ybus_cache',
+    'methods.psse_raw',
+    'methods.tap_control',
+    'methods.topology',
+    'Gauss_Seidel_Load_Flow',
+    'Fast_Decoupled_Load_Flow',
+    'results_io',
+    'qsts',
+    'service',
+    'synthetic_grid',
+    'tasks.task2_comparison',
+    'tasks.task3_sensitivity',
+    'visualization',
+]
+
+HEAVY_MODULES = ('pandas', 'matplotlib', 'seaborn')
+
+_CHILD = """
+import sys, time, json
+sys.path[:0] = {paths!r}
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'ms': elapsed * 1000,
+                  'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module, repeat=5):
+    """
+    Imports module in fresh interpreters.
+
+    Returns:
+    --------
+    best_ms : float
+        Fastest import time over all runs (ms)
+    heavy : list
+        Heavy dependencies loaded by the import
+    """
+    code = _CHILD.format(paths=[SRC_DIR, LEGACY_DIR], module=module, heavy=HEAVY_MODULES)
+    best_ms, heavy = float('inf'), []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                                text=True, check=True, cwd=SRC_DIR).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        best_ms = min(best_ms, result['ms'])
+        heavy = result['heavy']
+    return best_ms, heavy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=5, help='runs per module (best is kept)')
+    parser.add_argument('--budget-ms', type=float, default=300.0,
+                        help='maximum import time per module (ms)')
+    args = parser.parse_args(argv)
+
+    print(f"{'Module':<28} {'Import (ms)':>12}  Status")
+    print("-" * 60)
+    failures = 0
+    for module in MODULES:
+        ms, heavy = measure_import(module, args.repeat)
+        problems = []
+        if heavy:
+            problems.append(f"loads {', '.join(heavy)}")
+        if ms > args.budget_ms:
+            problems.append(f"over budget ({args.budget_ms:.0f} ms)")
+        failures += bool(problems)
+        print(f"{module:<28} {ms:>12.1f}  {'; '.join(problems) or 'OK'}")
+
+    print("-" * 60)
+    print("FAILED" if failures else "All imports within budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
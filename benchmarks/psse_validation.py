@@ -0,0 +1,223 @@
+"""
+PSS/E Validation and Performance Regression Suite
+=================================================
+Solves every PSS/E RAW case of a directory with every load flow engine
+(methods.engines.ENGINES) and checks each solution against the solved
+state stored in the RAW file itself (bus voltage magnitudes and angles,
+e.g. bus 5 of Ieee_9_bus.raw at 0.99562 ∠ -3.9890°):
+
+1. Accuracy: the engine must converge, and the largest |V| and angle
+   differences from the PSS/E state must stay within the tolerances
+   (angles are compared relative to the slack bus)
+2. Speed: the best solve time (after one warm-up solve) must stay within
+   the case's budget in psse_budget.json
+
+Cases are validated in parallel worker processes, one case per task.
+Timings of parallel workers compete for the CPU, so the stored budgets
+carry BUDGET_HEADROOM over the times they were recorded with.
+
+Usage:
+    python benchmarks/psse_validation.py [data_dir] [--jobs N] [--repeat 5]
+        [--vm-tol 1e-4] [--va-tol 0.01] [--update-budget]
+
+Exits with status 1 if any check fails, so it can run in CI.
+
+Author: [E/21/291]
+Date: January 2026
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+sys.path.insert(0, SRC_DIR)
+
+from methods.engines import ENGINES, get_engine
+from methods.reporting import NULL_REPORTER
+
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'psse_budget.json')
+
+# Budgets written by --update-budget are the measured times times
+# BUDGET_HEADROOM, and at least BUDGET_FLOOR_MS (sub-millisecond solves
+# are dominated by timer and scheduling noise)
+BUDGET_HEADROOM = 2.0
+BUDGET_FLOOR_MS = 5.0
+
+# Cases above this size are solved with a sparse Y-bus
+DENSE_LIMIT = 500
+
+
+def load_case(path):
+    """
+    Reads a RAW case and its PSS/E solution.
+
+    Returns:
+    --------
+    data : tuple
+        Y_bus (fixed shunts included), P_specified, Q_specified, V_init,
+        bus_types for the engines
+    V_reference : complex array
+        Solved voltages stored in the RAW file
+    """
+    from methods.newton_raphson import build_y_bus
+    from methods.psse_raw import read_raw_case, raw_to_load_flow_data
+
+    case = read_raw_case(path)
+    with warnings.catch_warnings():
+        # Fixed shunts are added to the Y-bus below
+        warnings.simplefilter('ignore')
+        num_buses, bus_types, P_spec, Q_spec, V_init, branch_data = raw_to_load_flow_data(case)
+
+    if num_buses <= DENSE_LIMIT:
+        Y_bus = build_y_bus(num_buses, branch_data) + np.diag(case['bus_shunt'])
+    else:
+        import scipy.sparse as sp
+        from methods.admittance import AdmittanceMatrix
+        Y_bus = (AdmittanceMatrix(num_buses, branch_data, sparse=True).Y +
+                 sp.diags(case['bus_shunt'])).tocsr()
+    return (Y_bus, P_spec, Q_spec, V_init, bus_types), case['V_solved']
+
+
+def validate_case(path, engines, tol=1e-6, repeat=5):
+    """
+    Solves one case with every engine.
+
+    Returns:
+    --------
+    rows : list of dicts
+        'case', 'engine', 'converged', 'iterations', 'vm_error' (pu),
+        'va_error' (degrees), 'ms' (best solve time) or 'error' (message
+        of a solver exception)
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    try:
+        data, V_reference = load_case(path)
+    except (ValueError, IndexError, KeyError) as exc:
+        return [{'case': name, 'engine': '-', 'error': f"cannot read case: {exc}"}]
+    bus_types = data[4]
+    slack_bus = np.where(bus_types == 0)[0][0]
+    va_reference = np.angle(V_reference / V_reference[slack_bus])
+
+    rows = []
+    for engine in engines:
+        solver = get_engine(engine)
+        try:
+            best = float('inf')
+            for _ in range(repeat + 1):
+                start = time.perf_counter()
+                V, _, _, iteration_data = solver(*data, tol=tol, verbose=False,
+                                                 reporter=NULL_REPORTER)
+                best = min(best, time.perf_counter() - start)
+        except Exception as exc:  # report the engine, keep validating the others
+            rows.append({'case': name, 'engine': engine, 'error': f"{type(exc).__name__}: {exc}"})
+            continue
+
+        va_error = np.angle(np.exp(1j * (np.angle(V / V[slack_bus]) - va_reference)))
+        rows.append({
+            'case': name,
+            'engine': engine,
+            'converged': bool(iteration_data[-1]['max_mismatch'] < tol),
+            'iterations': len(iteration_data),
+            'vm_error': float(np.max(np.abs(np.abs(V) - np.abs(V_reference)))),
+            'va_error': float(np.degrees(np.max(np.abs(va_error)))),
+            'ms': best * 1000,
+        })
+    return rows
+
+
+def check(row, budget, vm_tol, va_tol):
+    """Returns the list of failed checks of one result row."""
+    if 'error' in row:
+        return [row['error']]
+    problems = []
+    if not row['converged']:
+        problems.append("not converged")
+    if row['vm_error'] > vm_tol:
+        problems.append(f"|V| error > {vm_tol:g} pu")
+    if row['va_error'] > va_tol:
+        problems.append(f"angle error > {va_tol:g} deg")
+    limit = budget.get(row['case'], {}).get(row['engine'])
+    if limit is not None and row['ms'] > limit:
+        problems.append(f"over budget ({limit:.1f} ms)")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('data_dir', nargs='?', default=os.path.join(ROOT_DIR, 'data'),
+                        help='directory of .raw cases (or a single .raw file)')
+    parser.add_argument('--engines', default=','.join(ENGINES),
+                        help='comma-separated engines to validate (default: all)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(),
+                        help='parallel worker processes')
+    parser.add_argument('--repeat', type=int, default=5, help='timed solves (best is kept)')
+    parser.add_argument('--tol', type=float, default=1e-6, help='solver tolerance (pu)')
+    parser.add_argument('--vm-tol', type=float, default=1e-4,
+                        help='maximum |V| difference from PSS/E (pu)')
+    parser.add_argument('--va-tol', type=float, default=0.01,
+                        help='maximum angle difference from PSS/E (degrees)')
+    parser.add_argument('--budget', default=BUDGET_PATH, help='performance budget file')
+    parser.add_argument('--update-budget', action='store_true',
+                        help=f'store the measured times x {BUDGET_HEADROOM:g} as the new budget')
+    args = parser.parse_args(argv)
+
+    paths = ([args.data_dir] if args.data_dir.lower().endswith('.raw')
+             else sorted(glob.glob(os.path.join(args.data_dir, '*.raw'))))
+    if not paths:
+        print(f"No .raw cases found in {args.data_dir}")
+        return 1
+    engines = args.engines.split(',')
+
+    with ProcessPoolExecutor(max_workers=min(args.jobs, len(paths))) as pool:
+        results = pool.map(validate_case, paths, [engines] * len(paths),
+                           [args.tol] * len(paths), [args.repeat] * len(paths))
+        rows = [row for case_rows in results for row in case_rows]
+
+    budget = {}
+    if os.path.exists(args.budget):
+        with open(args.budget) as f:
+            budget = json.load(f)
+
+    print(f"{'Case':<16} {'Engine':<18} {'Iter':>4} {'|V| err (pu)':>13} {'Ang err (°)':>12} "
+          f"{'Time (ms)':>10} {'Budget':>8}  Status")
+    print("-" * 100)
+    failures = 0
+    for row in rows:
+        problems = check(row, budget, args.vm_tol, args.va_tol)
+        failures += bool(problems)
+        limit = budget.get(row['case'], {}).get(row['engine'])
+        limit_text = f"{limit:>8.1f}" if limit is not None else f"{'-':>8}"
+        if 'error' in row:
+            print(f"{row['case']:<16} {row['engine']:<18} {'':>4} {'':>13} {'':>12} "
+                  f"{'':>10} {limit_text}  {'; '.join(problems)}")
+            continue
+        print(f"{row['case']:<16} {row['engine']:<18} {row['iterations']:>4} "
+              f"{row['vm_error']:>13.2e} {row['va_error']:>12.2e} {row['ms']:>10.2f} "
+              f"{limit_text}  {'; '.join(problems) or 'OK'}")
+    print("-" * 100)
+
+    if args.update_budget:
+        for row in rows:
+            if 'ms' in row:
+                budget.setdefault(row['case'], {})[row['engine']] = round(
+                    max(row['ms'] * BUDGET_HEADROOM, BUDGET_FLOOR_MS), 2)
+        with open(args.budget, 'w') as f:
+            json.dump(budget, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Budget written to {args.budget}")
+
+    print("FAILED" if failures else "All cases within tolerance and budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -104,9 +104,16 @@ def build_b_matrices(num_buses, branch_data, bus_types):
             
     return B_prime, B_dprime, non_slack, pq_buses
 
-def fast_decoupled(Y_bus, P_spec, Q_spec, V_init, bus_types, branch_data, max_iter=100, tol=1e-4):
+def fast_decoupled(Y_bus, P_spec, Q_spec, V_init, bus_types, branch_data, max_iter=100, tol=1e-4,
+                   B_matrices=None):
     V = np.array(V_init, copy=True)
-    B_prime, B_dprime, non_slack, pq_buses = build_b_matrices(len(V), branch_data, bus_types)
+    if B_matrices is None:
+        B_prime, B_dprime, non_slack, pq_buses = build_b_matrices(len(V), branch_data, bus_types)
+    else:
+        # Precomputed (B', B'') pair, e.g. from methods.ybus_cache
+        B_prime, B_dprime = B_matrices
+        pq_buses = np.where(bus_types == 1)[0]
+        non_slack = np.sort(np.concatenate((pq_buses, np.where(bus_types == 2)[0])))
     
     for it in range(max_iter):
         S_calc = V * np.conj(Y_bus @ V)
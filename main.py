@@ -25,7 +25,7 @@ if __name__ == "__main__":
     print("This is the main entry point for the IEEE 9-Bus Load Flow Analysis.")
     print()
     print("Available options:")
-    print("  1. Run all tasks               : python main.py --all")
+    print("  1. Run all tasks               : python main.py --all [--headless] [--jobs N]")
     print("  2. Run Task 1 (Newton-Raphson) : python src/methods/newton_raphson.py")
     print("  3. Run Task 2 (Comparison)     : python src/tasks/task2_comparison.py")
     print("  4. Run Task 3 (Sensitivity)    : python src/tasks/task3_sensitivity.py")
@@ -37,7 +37,7 @@ if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "--all":
         print("\nRunning complete analysis suite...\n")
         from run_all import main as run_all_main
-        run_all_main()
+        sys.exit(0 if run_all_main(sys.argv[2:]) else 1)
     else:
         print("\nFor complete analysis, run: python main.py --all")
         print("=" * 100)
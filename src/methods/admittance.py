@@ -0,0 +1,249 @@
+"""
+Mutable Admittance Matrix for Switching, Tap and Parameter Studies
+==================================================================
+build_y_bus() rebuilds the whole Y-bus from branch_data. For studies that
+change one branch at a time (line outages, tap moves, impedance edits) this
+module keeps the Y-bus together with each branch's 2x2 primitive admittance
+and updates only the four affected entries in place.
+
+Branch model (pi-model with the tap on the from side, a = ratio * e^(j*shift)):
+
+    [I_f]   [ (y + jb/2) / |a|^2    -y / conj(a) ] [V_f]
+    [I_t] = [ -y / a                 y + jb/2    ] [V_t]
+
+This is the same model as build_y_bus() (see branch_primitives()).
+
+Factorizations of Y (used by solve()) are cached. After an edit they are
+either corrected with a low-rank (Woodbury) update or, once too many edits
+have piled up, marked dirty and rebuilt on the next solve.
+
+Author: [E/21/291]
+Date: January 2026
+"""
+
+import os
+import sys
+
+if __package__ in (None, ''):  # run as a script: python src/methods/admittance.py
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import scipy.linalg
+import scipy.sparse as sp
+import scipy.sparse.linalg
+
+from methods.newton_raphson import branch_arrays, branch_primitives
+
+
+class AdmittanceMatrix:
+    """
+    Y-bus with in-place branch edits.
+
+    Parameters:
+    -----------
+    num_buses : int
+        Total number of buses in the system
+    branch_data : list of tuples
+        Each tuple: (from_bus, to_bus, R, X, B), optionally followed by
+        (tap_ratio, shift_deg)
+    sparse : bool
+        Store Y as a scipy CSR matrix instead of a dense array
+    max_low_rank : int
+        Number of branch edits absorbed by Woodbury corrections before the
+        factorization is rebuilt from scratch
+
+    Branches are addressed by their position k in branch_data
+    (see branch_index() to look one up by its end buses).
+    """
+
+    def __init__(self, num_buses, branch_data, sparse=False, max_low_rank=8):
+        # Plain (f, t, R, X, B) branches get a nominal tap (1.0, 0.0)
+        (self.from_bus, self.to_bus, self.r, self.x, self.b,
+         self.tap_ratio, self.shift_deg) = (np.array(col) for col in branch_arrays(branch_data))
+        self.num_buses = num_buses
+        self.sparse = sparse
+        self.max_low_rank = max_low_rank
+
+        self.status = np.ones(len(self.r), dtype=int)
+
+        self._prim = np.column_stack(branch_primitives(self.r, self.x, self.b,
+                                                       self.tap_ratio, self.shift_deg))
+        f, t = self.from_bus, self.to_bus
+        rows = np.concatenate((f, f, t, t))
+        cols = np.concatenate((f, t, f, t))
+        values = self._prim.T.ravel()
+
+        if sparse:
+            Y = sp.csr_matrix((values, (rows, cols)), shape=(num_buses, num_buses))
+            Y.sum_duplicates()
+            Y.sort_indices()
+            self.Y = Y
+            # Position of every branch's four entries in Y.data
+            row_of_entry = np.repeat(np.arange(num_buses), np.diff(Y.indptr))
+            keys = row_of_entry * num_buses + Y.indices
+            self._pos = np.searchsorted(keys, rows * num_buses + cols).reshape(4, -1).T
+        else:
+            self.Y = np.zeros((num_buses, num_buses), dtype=complex)
+            np.add.at(self.Y, (rows, cols), values)
+
+        self.version = 0
+        self._lu = None
+        self._pending = []
+        self._woodbury = None
+
+    # ==========================================
+    # BRANCH EDITS
+    # ==========================================
+
+    def branch_index(self, from_bus, to_bus):
+        """Returns the index of the (first) branch between two 1-based buses."""
+        f, t = from_bus - 1, to_bus - 1
+        match = np.where(((self.from_bus == f) & (self.to_bus == t)) |
+                         ((self.from_bus == t) & (self.to_bus == f)))[0]
+        if len(match) == 0:
+            raise KeyError(f"No branch between bus {from_bus} and bus {to_bus}")
+        return int(match[0])
+
+    def set_branch_status(self, k, in_service):
+        """Switches branch k in (True) or out (False) of service."""
+        self.status[k] = 1 if in_service else 0
+        self._update_branch(k)
+
+    def set_branch_impedance(self, k, r=None, x=None, b=None):
+        """Changes R, X and/or total line charging B of branch k."""
+        if r is not None:
+            self.r[k] = r
+        if x is not None:
+            self.x[k] = x
+        if b is not None:
+            self.b[k] = b
+        self._update_branch(k)
+
+    def set_tap(self, k, ratio=None, shift_deg=None):
+        """Changes the off-nominal tap ratio and/or phase shift of branch k."""
+        if ratio is not None:
+            self.tap_ratio[k] = ratio
+        if shift_deg is not None:
+            self.shift_deg[k] = shift_deg
+        self._update_branch(k)
+
+    def _update_branch(self, k):
+        """Applies the change of branch k's primitive to the four Y entries."""
+        new = np.array(branch_primitives(self.r[k], self.x[k], self.b[k], self.tap_ratio[k],
+                                         self.shift_deg[k], self.status[k]))
+        delta = new - self._prim[k]
+        self._prim[k] = new
+
+        if self.sparse:
+            self.Y.data[self._pos[k]] += delta
+        else:
+            f, t = self.from_bus[k], self.to_bus[k]
+            self.Y[f, f] += delta[0]
+            self.Y[f, t] += delta[1]
+            self.Y[t, f] += delta[2]
+            self.Y[t, t] += delta[3]
+
+        self.version += 1
+        if self._lu is not None:
+            self._pending.append((k, delta))
+            self._woodbury = None
+            if len(self._pending) > self.max_low_rank:
+                self._lu = None
+                self._pending = []
+
+    @property
+    def dirty(self):
+        """True when the next solve() has to refactorize Y."""
+        return self._lu is None
+
+    def branch_data(self):
+        """
+        Returns the current in-service branches in branch_data format.
+
+        Branches with an off-nominal tap carry (tap_ratio, shift_deg) as
+        6th and 7th entries.
+        """
+        branches = []
+        for k in np.where(self.status == 1)[0]:
+            branch = (int(self.from_bus[k]) + 1, int(self.to_bus[k]) + 1,
+                      float(self.r[k]), float(self.x[k]), float(self.b[k]))
+            if self.tap_ratio[k] != 1.0 or self.shift_deg[k] != 0.0:
+                branch += (float(self.tap_ratio[k]), float(self.shift_deg[k]))
+            branches.append(branch)
+        return branches
+
+    # ==========================================
+    # FACTORIZED SOLVES
+    # ==========================================
+
+    def _factorize(self):
+        if self.sparse:
+            lu = scipy.sparse.linalg.splu(self.Y.tocsc())
+            self._lu = lu.solve
+        else:
+            lu = scipy.linalg.lu_factor(self.Y)
+            self._lu = lambda rhs: scipy.linalg.lu_solve(lu, rhs)
+        self._pending = []
+        self._woodbury = None
+
+    def _woodbury_terms(self):
+        """
+        Builds the terms of the Woodbury identity for the pending edits:
+        Y = Y0 + U C U^T, so Y^-1 = Y0^-1 - W (I + C U^T W)^-1 C U^T Y0^-1
+        with W = Y0^-1 U.
+        """
+        m = len(self._pending)
+        U_idx = np.empty(2 * m, dtype=int)
+        C = np.zeros((2 * m, 2 * m), dtype=complex)
+        for n, (k, delta) in enumerate(self._pending):
+            U_idx[2 * n:2 * n + 2] = (self.from_bus[k], self.to_bus[k])
+            C[2 * n:2 * n + 2, 2 * n:2 * n + 2] = delta.reshape(2, 2)
+
+        U = np.zeros((self.num_buses, 2 * m), dtype=complex)
+        U[U_idx, np.arange(2 * m)] = 1
+        W = self._lu(U)
+        capacitance = np.eye(2 * m) + C @ W[U_idx]
+        self._woodbury = (U_idx, C, W, capacitance)
+
+    def solve(self, rhs):
+        """
+        Solves Y x = rhs using the cached factorization of Y.
+
+        rhs may be a vector or a (num_buses x k) matrix.
+        """
+        if self._lu is None:
+            self._factorize()
+        x = self._lu(np.asarray(rhs, dtype=complex))
+        if not self._pending:
+            return x
+
+        if self._woodbury is None:
+            self._woodbury_terms()
+        U_idx, C, W, capacitance = self._woodbury
+        correction = np.linalg.solve(capacitance, C @ x[U_idx])
+        return x - W @ correction
+
+
+# ==========================================
+# MAIN EXECUTION
+# ==========================================
+
+if __name__ == "__main__":
+    from methods.newton_raphson import get_ieee_9_bus_data, build_y_bus, newton_raphson
+
+    num_buses, bus_types, P_spec, Q_spec, V_init, branch_data = get_ieee_9_bus_data()
+    Y = AdmittanceMatrix(num_buses, branch_data)
+    print(f"Matches build_y_bus(): {np.allclose(Y.Y, build_y_bus(num_buses, branch_data))}")
+
+    # Switch out line 5-7 and re-solve without rebuilding the Y-bus
+    k = Y.branch_index(5, 7)
+    Y.set_branch_status(k, False)
+    V, P_calc, Q_calc, iter_data = newton_raphson(
+        Y.Y, P_spec, Q_spec, V_init, bus_types, verbose=False
+    )
+    print(f"Line 5-7 out: converged in {len(iter_data)} iterations, "
+          f"V5 = {np.abs(V[4]):.4f} pu, V7 = {np.abs(V[6]):.4f} pu")
+
+    Y.set_branch_status(k, True)
+    print(f"Line 5-7 restored: matches build_y_bus(): "
+          f"{np.allclose(Y.Y, build_y_bus(num_buses, branch_data))}")
@@ -0,0 +1,162 @@
+"""
+Batched Newton-Raphson Load Flow
+================================
+Solves many scenarios of ONE network (same Y-bus and bus types, different
+P/Q injections or start voltages) in a single vectorized Newton pass:
+the mismatches, the Jacobians and the Newton steps of all scenarios are
+computed with stacked numpy operations instead of one Python-level solve
+per scenario.
+
+Jacobian of scenario b (same blocks as newton_raphson()), from the complex
+derivatives of S = V conj(Y V):
+
+    ∂S/∂δ   = j diag(V) conj(diag(I) - Y diag(V))
+    ∂S/∂|V| = diag(V) conj(Y diag(V/|V|)) + conj(diag(I)) diag(V/|V|)
+
+    J = [[Re ∂S/∂δ (non-slack, non-slack),  Re ∂S/∂|V| (non-slack, PQ)],
+         [Im ∂S/∂δ (PQ, non-slack),         Im ∂S/∂|V| (PQ, PQ)]]
+
+and all Newton steps are one batched np.linalg.solve. Scenarios drop out
+of the batch as soon as they converge. The Jacobians are dense
+(scenarios x size x size), so this suits small and medium networks - the
+ones solved interactively many times over.
+
+Author: [E/21/291]
+Date: January 2026
+"""
+
+import os
+import sys
+
+if __package__ in (None, ''):  # run as a script: python src/methods/batch_newton.py
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+
+def newton_raphson_batch(Y_bus, P_specified, Q_specified, V_init, bus_types,
+                         max_iter=20, tol=1e-4):
+    """
+    Solves a batch of load flow scenarios of one network.
+
+    Parameters:
+    -----------
+    Y_bus : complex array or scipy.sparse matrix
+        Bus admittance matrix (n x n)
+    P_specified, Q_specified : array (scenarios x n)
+        Specified injections of every scenario
+    V_init : complex array (n,) or (scenarios x n)
+        Start voltages (one profile for all scenarios or one per scenario);
+        also the slack voltage and PV set points
+    bus_types : array
+        0 = slack, 1 = PQ, 2 = PV
+    max_iter, tol : int, float
+        As for newton_raphson()
+
+    Returns:
+    --------
+    V : complex array (scenarios x n)
+    P_calc, Q_calc : array (scenarios x n)
+    info : dict
+        'iterations' (per scenario, counted as len(iteration_data) of
+        newton_raphson()), 'max_mismatch' and 'converged' arrays
+    """
+    Y = Y_bus.toarray() if hasattr(Y_bus, 'toarray') else np.asarray(Y_bus)
+    P_specified = np.atleast_2d(np.asarray(P_specified, dtype=float))
+    Q_specified = np.atleast_2d(np.asarray(Q_specified, dtype=float))
+    num_scenarios, num_buses = P_specified.shape
+
+    pq_buses = np.where(bus_types == 1)[0]
+    pv_buses = np.where(bus_types == 2)[0]
+    non_slack_buses = np.sort(np.concatenate((pq_buses, pv_buses)))
+    n_ns = len(non_slack_buses)
+    pq_pos = np.searchsorted(non_slack_buses, pq_buses)
+    diag_ns = np.arange(n_ns)
+    diag_pq = np.arange(len(pq_buses))
+
+    Y_nn = Y[np.ix_(non_slack_buses, non_slack_buses)]
+    Y_np = Y[np.ix_(non_slack_buses, pq_buses)]
+
+    V = np.array(np.broadcast_to(V_init, (num_scenarios, num_buses)), dtype=complex)
+    vm = np.abs(V)
+    va = np.angle(V)
+    P_calc = np.empty((num_scenarios, num_buses))
+    Q_calc = np.empty((num_scenarios, num_buses))
+    iterations = np.zeros(num_scenarios, dtype=np.int32)
+    max_mismatch = np.full(num_scenarios, np.inf)
+    converged = np.zeros(num_scenarios, dtype=bool)
+    active = np.arange(num_scenarios)
+
+    for iteration in range(max_iter):
+        # Mismatches of the scenarios still iterating
+        V_a = V[active]
+        I = V_a @ Y.T
+        S = V_a * np.conj(I)
+        P_calc[active] = S.real
+        Q_calc[active] = S.imag
+        mismatch = np.concatenate((
+            P_specified[active][:, non_slack_buses] - S.real[:, non_slack_buses],
+            Q_specified[active][:, pq_buses] - S.imag[:, pq_buses]), axis=1)
+        max_mismatch[active] = np.max(np.abs(mismatch), axis=1, initial=0.0)
+        iterations[active] = iteration + 1
+
+        done = max_mismatch[active] < tol
+        converged[active[done]] = True
+        active, V_a, I, mismatch = active[~done], V_a[~done], I[~done], mismatch[~done]
+        if len(active) == 0:
+            break
+        if iteration == max_iter - 1:
+            break
+
+        # Stacked Jacobians
+        V_ns, I_ns = V_a[:, non_slack_buses], I[:, non_slack_buses]
+        Vn_pq = V_a[:, pq_buses] / np.abs(V_a[:, pq_buses])
+        dS_dva = -1j * V_ns[:, :, None] * np.conj(Y_nn[None] * V_ns[:, None, :])
+        dS_dva[:, diag_ns, diag_ns] += 1j * V_ns * np.conj(I_ns)
+        dS_dvm = V_ns[:, :, None] * np.conj(Y_np[None] * Vn_pq[:, None, :])
+        dS_dvm[:, pq_pos, diag_pq] += np.conj(I[:, pq_buses]) * Vn_pq
+
+        J = np.empty((len(active), len(mismatch[0]), len(mismatch[0])))
+        J[:, :n_ns, :n_ns] = dS_dva.real
+        J[:, :n_ns, n_ns:] = dS_dvm.real
+        J[:, n_ns:, :n_ns] = dS_dva[:, pq_pos, :].imag
+        J[:, n_ns:, n_ns:] = dS_dvm[:, pq_pos, :].imag
+
+        # All Newton steps at once
+        dx = np.linalg.solve(J, mismatch[:, :, None])[:, :, 0]
+        va[np.ix_(active, non_slack_buses)] += dx[:, :n_ns]
+        vm[np.ix_(active, pq_buses)] += dx[:, n_ns:]
+        V[active] = vm[active] * np.exp(1j * va[active])
+
+    return V, P_calc, Q_calc, {'iterations': iterations, 'max_mismatch': max_mismatch,
+                               'converged': converged}
+
+
+# ==========================================
+# MAIN EXECUTION
+# ==========================================
+
+if __name__ == "__main__":
+    import time
+
+    from methods.newton_raphson import get_ieee_9_bus_data, build_y_bus, newton_raphson
+
+    num_buses, bus_types, P_spec, Q_spec, V_init, branch_data = get_ieee_9_bus_data()
+    Y_bus = build_y_bus(num_buses, branch_data)
+
+    rng = np.random.default_rng(0)
+    scale = rng.uniform(0.5, 1.5, size=(256, num_buses))
+    P_batch, Q_batch = P_spec * scale, Q_spec * scale
+
+    start_time = time.time()
+    V_loop = np.array([newton_raphson(Y_bus, P, Q, V_init, bus_types, verbose=False)[0]
+                       for P, Q in zip(P_batch, Q_batch)])
+    t_loop = time.time() - start_time
+
+    start_time = time.time()
+    V_batch, _, _, info = newton_raphson_batch(Y_bus, P_batch, Q_batch, V_init, bus_types)
+    t_batch = time.time() - start_time
+
+    print(f"{len(scale)} scenarios: one solve each {t_loop:.4f} s, batched {t_batch:.4f} s "
+          f"({info['converged'].sum()} converged)")
+    print(f"Max |V_batch - V_loop| = {np.max(np.abs(V_batch - V_loop)):.2e} pu")
@@ -0,0 +1,233 @@
+"""
+Rectangular Current-Injection Newton-Raphson Load Flow
+======================================================
+Alternative Newton engine to newton_raphson() (polar power mismatch).
+
+Unknowns are the rectangular voltage components V = e + jf of every
+non-slack bus, plus the reactive injection Q of every PV bus. Equations:
+
+    Real/imaginary current mismatch at every non-slack bus:
+        F_k = (Y_bus V)_k - (P_k - jQ_k) / conj(V_k) = 0
+    Voltage magnitude at every PV bus:
+        e_k^2 + f_k^2 - |V_k,spec|^2 = 0
+
+The derivative of (Y_bus V) with respect to (e, f) is the real form of
+the Y-bus:
+
+    [dIr/de  dIr/df]   [G  -B]
+    [dIi/de  dIi/df] = [B   G]
+
+so it is built once. Only the 2x2 diagonal block of every bus (from the
+injected current) and the PV-bus entries change per iteration - no trig
+functions and no off-diagonal updates.
+
+Convergence is judged on the same power mismatch as newton_raphson()
+(P at non-slack buses, Q at PQ buses), so iteration counts and tolerances
+are comparable. A scipy.sparse Y-bus gives a sparse Jacobian solved with
+SuperLU; a dense Y-bus gives a dense Jacobian.
+
+Author: [E/21/291]
+Date: January 2026
+"""
+
+import os
+import sys
+import time
+
+if __package__ in (None, ''):  # run as a script: python src/methods/current_injection.py
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from methods.reporting import DEBUG, INFO, WARNING, get_reporter
+
+
+def _jacobian_pattern(n_ns, pv_pos):
+    """
+    Returns the (row, col) positions of the Jacobian entries that change
+    every iteration: the 2x2 diagonal block of each non-slack bus followed
+    by the four PV-bus entries (Q column and voltage row) of each PV bus.
+    """
+    p = np.arange(n_ns)
+    t = 2 * n_ns + np.arange(len(pv_pos))
+    rows = np.concatenate((p, p, n_ns + p, n_ns + p,
+                           pv_pos, n_ns + pv_pos, t, t))
+    cols = np.concatenate((p, n_ns + p, p, n_ns + p,
+                           t, t, pv_pos, n_ns + pv_pos))
+    return rows, cols
+
+
+def newton_raphson_current_injection(Y_bus, P_specified, Q_specified, V_init, bus_types,
+                                     max_iter=100, tol=1e-4, verbose=True, reporter=None):
+    """
+    Solves power flow equations with the rectangular current-injection
+    Newton-Raphson method.
+
+    Same parameters and return values as newton_raphson(); Y_bus may also
+    be a scipy.sparse matrix.
+
+    Returns:
+    --------
+    V : complex array
+        Final voltage phasors
+    P_calc, Q_calc : array
+        Calculated real and reactive power
+    iteration_data : list
+        Data from each iteration ('dP' and 'dQ' are power mismatches)
+    """
+    import scipy.sparse as sp
+    import scipy.sparse.linalg
+
+    V = np.array(V_init, dtype=complex)
+    num_buses = len(V)
+    sparse = sp.issparse(Y_bus)
+
+    # Identify bus types
+    slack_bus = np.where(bus_types == 0)[0][0]
+    pq_buses = np.where(bus_types == 1)[0]
+    pv_buses = np.where(bus_types == 2)[0]
+    non_slack_buses = np.sort(np.concatenate((pq_buses, pv_buses)))
+    n_ns, n_pv = len(non_slack_buses), len(pv_buses)
+    size = 2 * n_ns + n_pv
+
+    # Position of every PV bus among the non-slack buses
+    pv_pos = np.searchsorted(non_slack_buses, pv_buses)
+    V_spec_sq = np.abs(V[pv_buses])**2
+
+    # Constant part of the Jacobian: real form of Y_bus (non-slack rows/cols)
+    # with explicit zeros at the entries that change every iteration
+    var_rows, var_cols = _jacobian_pattern(n_ns, pv_pos)
+    if sparse:
+        Y_ns = sp.csr_matrix(Y_bus)[non_slack_buses][:, non_slack_buses].tocoo()
+        G, B = Y_ns.data.real, Y_ns.data.imag
+        r, c = Y_ns.row, Y_ns.col
+        rows = np.concatenate((r, r, n_ns + r, n_ns + r, var_rows))
+        cols = np.concatenate((c, n_ns + c, c, n_ns + c, var_cols))
+        values = np.concatenate((G, -B, B, G, np.zeros(len(var_rows))))
+        J = sp.csr_matrix((values, (rows, cols)), shape=(size, size))
+        J.sum_duplicates()
+        J.sort_indices()
+        J_const = J.data.copy()
+        row_of_entry = np.repeat(np.arange(size), np.diff(J.indptr))
+        var_pos = np.searchsorted(row_of_entry * size + J.indices, var_rows * size + var_cols)
+        J_values = J.data
+    else:
+        Y_ns = np.asarray(Y_bus)[np.ix_(non_slack_buses, non_slack_buses)]
+        G, B = Y_ns.real, Y_ns.imag
+        J_const = np.zeros((size, size))
+        J_const[:n_ns, :n_ns] = G
+        J_const[:n_ns, n_ns:2*n_ns] = -B
+        J_const[n_ns:2*n_ns, :n_ns] = B
+        J_const[n_ns:2*n_ns, n_ns:2*n_ns] = G
+        J = np.empty_like(J_const)
+        var_pos = var_rows * size + var_cols
+        J_values = J.reshape(-1)
+
+    # Specified injections; PV-bus Q is an unknown, started from the
+    # injection at the initial voltages
+    P_ns = np.asarray(P_specified, dtype=float)[non_slack_buses]
+    Q_ns = np.asarray(Q_specified, dtype=float)[non_slack_buses].copy()
+    Q_ns[pv_pos] = np.imag(V * np.conj(Y_bus @ V))[pv_buses]
+
+    F = np.empty(size)
+    iteration_data = []
+
+    report = get_reporter(reporter, verbose)
+    report.emit(INFO, 'nr_start', num_buses=num_buses, slack_bus=slack_bus,
+                pv_buses=pv_buses, pq_buses=pq_buses, tol=tol, max_iter=max_iter)
+
+    for iteration in range(max_iter):
+        # Network currents and power injections
+        I_calc = Y_bus @ V
+        S_calc = V * np.conj(I_calc)
+        P_calc = np.real(S_calc)
+        Q_calc = np.imag(S_calc)
+
+        # Power mismatches (convergence check, same as newton_raphson)
+        dP = np.asarray(P_specified)[non_slack_buses] - P_calc[non_slack_buses]
+        dQ = np.asarray(Q_specified)[pq_buses] - Q_calc[pq_buses]
+        V_ns = V[non_slack_buses]
+        v2 = np.real(V_ns * np.conj(V_ns))
+        dV2 = v2[pv_pos] - V_spec_sq
+        max_mismatch = max(np.max(np.abs(dP), initial=0.0), np.max(np.abs(dQ), initial=0.0))
+
+        if report.enabled(DEBUG):
+            report.emit(DEBUG, 'nr_iteration', iteration=iteration + 1,
+                        max_mismatch=max_mismatch, V=V)
+
+        iteration_data.append({
+            'iteration': iteration + 1,
+            'V': V.copy(),
+            'P_calc': P_calc,
+            'Q_calc': Q_calc,
+            'dP': dP,
+            'dQ': dQ,
+            'max_mismatch': max_mismatch
+        })
+
+        if max_mismatch < tol and np.max(np.abs(dV2), initial=0.0) < tol:
+            report.emit(INFO, 'nr_converged', iterations=iteration + 1,
+                        max_mismatch=max_mismatch, tol=tol)
+            report.flush()
+            return V, P_calc, Q_calc, iteration_data
+
+        # Current mismatch F = I_calc - (P - jQ) / conj(V) and PV voltage rows
+        I_spec = (P_ns - 1j * Q_ns) / np.conj(V_ns)
+        F[:n_ns] = np.real(I_calc[non_slack_buses] - I_spec)
+        F[n_ns:2*n_ns] = np.imag(I_calc[non_slack_buses] - I_spec)
+        F[2*n_ns:] = dV2
+
+        # Derivatives of the injected current (P e + Q f, P f - Q e) / |V|^2
+        e, f = V_ns.real, V_ns.imag
+        v4 = v2**2
+        dIr_de = (P_ns * (f**2 - e**2) - 2 * Q_ns * e * f) / v4
+        dIr_df = (Q_ns * (e**2 - f**2) - 2 * P_ns * e * f) / v4
+        e_pv, f_pv, v2_pv = e[pv_pos], f[pv_pos], v2[pv_pos]
+
+        # Refresh the changing entries (order of _jacobian_pattern())
+        np.copyto(J_values, J_const.reshape(-1))
+        J_values[var_pos] += np.concatenate((
+            -dIr_de, -dIr_df, -dIr_df, dIr_de,
+            -f_pv / v2_pv, e_pv / v2_pv, 2 * e_pv, 2 * f_pv
+        ))
+
+        # Solve J * dx = -F
+        if sparse:
+            dx = scipy.sparse.linalg.spsolve(J.tocsc(), -F)
+        else:
+            dx = np.linalg.solve(J, -F)
+
+        # Update e, f (non-slack buses) and Q (PV buses)
+        V[non_slack_buses] += dx[:n_ns] + 1j * dx[n_ns:2*n_ns]
+        Q_ns[pv_pos] += dx[2*n_ns:]
+
+    report.emit(WARNING, 'nr_not_converged', max_iter=max_iter,
+                max_mismatch=max_mismatch)
+    report.flush()
+    return V, P_calc, Q_calc, iteration_data
+
+
+# ==========================================
+# MAIN EXECUTION
+# ==========================================
+
+if __name__ == "__main__":
+    import scipy.sparse as sp
+
+    from methods.newton_raphson import build_y_bus, newton_raphson
+    from synthetic_grid import generate_synthetic_grid
+
+    print(f"{'Buses':>7} {'Polar NR':>18} {'Current injection':>22} {'Max |dV| (pu)':>14}")
+    for size in (9, 99, 504):
+        num_buses, bus_types, P_spec, Q_spec, V_init, branch_data = generate_synthetic_grid(size)
+        Y_bus = build_y_bus(num_buses, branch_data)
+        runs = []
+        for solver, Y in ((newton_raphson, Y_bus),
+                          (newton_raphson_current_injection, sp.csr_matrix(Y_bus))):
+            start_time = time.time()
+            V, _, _, iter_data = solver(Y, P_spec, Q_spec, V_init, bus_types,
+                                        tol=1e-8, verbose=False)
+            runs.append((V, len(iter_data), time.time() - start_time))
+        (V_polar, it_polar, t_polar), (V_ci, it_ci, t_ci) = runs
+        print(f"{num_buses:>7} {it_polar:>4} it {t_polar:9.4f} s {it_ci:>8} it {t_ci:9.4f} s "
+              f"{np.max(np.abs(V_polar - V_ci)):>14.2e}")
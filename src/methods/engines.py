@@ -0,0 +1,43 @@
+"""
+Load Flow Engines
+=================
+Registry of the interchangeable load flow engines. Every engine has the
+signature of newton_raphson():
+
+    engine(Y_bus, P_specified, Q_specified, V_init, bus_types,
+           max_iter=100, tol=1e-4, verbose=True, reporter=None)
+    -> V, P_calc, Q_calc, iteration_data
+
+Engines are imported on first use, so selecting one does not load the
+others.
+
+Author: [E/21/291]
+Date: January 2026
+"""
+
+from importlib import import_module
+
+# Engine name -> (module, function)
+ENGINES = {
+    'polar': ('methods.newton_raphson', 'newton_raphson'),
+    'current_injection': ('methods.current_injection', 'newton_raphson_current_injection'),
+    'helm': ('methods.helm', 'helm'),
+    'newton_krylov': ('methods.newton_krylov', 'newton_krylov'),
+    'broyden': ('methods.broyden', 'broyden'),
+}
+
+
+def get_engine(name):
+    """Returns the solver function of a load flow engine (see ENGINES)."""
+    try:
+        module, function = ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown load flow engine '{name}' "
+                         f"(available: {', '.join(ENGINES)})") from None
+    return getattr(import_module(module), function)
+
+
+def solve_load_flow(Y_bus, P_specified, Q_specified, V_init, bus_types,
+                    engine='polar', **kwargs):
+    """Solves the load flow with the named engine (keyword arguments are passed on)."""
+    return get_engine(engine)(Y_bus, P_specified, Q_specified, V_init, bus_types, **kwargs)
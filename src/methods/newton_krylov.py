@@ -0,0 +1,250 @@
+"""
+Jacobian-Free Newton-Krylov Load Flow
+=====================================
+Inexact Newton engine for large networks: the Newton correction equation
+
+    J dx = mismatch,    J = [[∂P/∂δ, ∂P/∂|V|], [∂Q/∂δ, ∂Q/∂|V|]]
+
+is solved with a Krylov method (GMRES or BiCGStab) instead of a Jacobian
+factorization. The Jacobian is never formed: every product J v comes from
+one extra mismatch evaluation (finite difference along v),
+
+    J v ≈ -(mismatch(x + εv) - mismatch(x)) / ε
+
+Preconditioner: the Fast Decoupled matrices B' and B'' (constant, so
+each is factorized once per solve with SuperLU):
+
+    dδ ≈ -B'^-1 (ΔP / |V|),    d|V| ≈ -B''^-1 (ΔQ / |V|)
+
+Forcing terms (Eisenstat-Walker, choice 2): the Krylov tolerance is loose
+while the mismatch is large and tightens as Newton converges, so early
+iterations cost only a few Krylov steps.
+
+Author: [E/21/291]
+Date: January 2026
+"""
+
+import os
+import sys
+
+if __package__ in (None, ''):  # run as a script: python src/methods/newton_krylov.py
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from methods.newton_raphson import SolverState
+from methods.reporting import DEBUG, INFO, WARNING, get_reporter, register_format
+
+# Eisenstat-Walker forcing term parameters
+ETA_MAX = 0.9
+ETA_GAMMA = 0.9
+ETA_ALPHA = 2.0
+
+# A Krylov solve that stops short of its tolerance is retried once from
+# its last iterate with KRYLOV_RETRY_FACTOR x max_krylov iterations
+KRYLOV_RETRY_FACTOR = 4
+
+
+def b_matrices_from_y_bus(Y_bus, non_slack_buses, pq_buses):
+    """
+    Returns (B', B'') in the convention of build_b_matrices() (diagonal
+    -Σ b_ij, off-diagonal +b_ij), taken from the series part of Im(Y_bus).
+    """
+    import scipy.sparse as sp
+
+    B = sp.csr_matrix(Y_bus).imag.tolil()
+    B.setdiag(0)
+    B = B.tocsr()
+    B = B - sp.diags(np.asarray(B.sum(axis=1)).ravel())
+    return B[non_slack_buses][:, non_slack_buses], B[pq_buses][:, pq_buses]
+
+
+def newton_krylov(Y_bus, P_specified, Q_specified, V_init, bus_types,
+                  max_iter=50, tol=1e-4, verbose=True, reporter=None,
+                  B_matrices=None, krylov='gmres', max_krylov=200):
+    """
+    Solves power flow equations with the Jacobian-free Newton-Krylov method.
+
+    Same parameters and return values as newton_raphson(); Y_bus may also
+    be a scipy.sparse matrix. Additionally:
+
+    B_matrices : (B_prime, B_dprime), optional
+        Fast Decoupled matrices for the preconditioner (e.g. from
+        ybus_cache.get_network_matrices); derived from Y_bus if omitted
+    krylov : {'gmres', 'bicgstab'}
+        Krylov solver of the correction equation
+    max_krylov : int
+        Maximum Krylov iterations per Newton iteration (one retry with
+        KRYLOV_RETRY_FACTOR times as many if the tolerance is not reached)
+
+    iteration_data entries also hold 'krylov_iterations', 'forcing' (the
+    relative Krylov tolerance used) and 'krylov_info' (the solver's exit
+    code: 0 converged, > 0 iteration limit reached, < 0 breakdown).
+    """
+    import scipy.sparse as sp
+    import scipy.sparse.linalg
+
+    if krylov not in ('gmres', 'bicgstab'):
+        raise ValueError(f"Unknown Krylov solver '{krylov}' (use 'gmres' or 'bicgstab')")
+    num_buses = len(V_init)
+
+    # Identify bus types
+    slack_bus = np.where(bus_types == 0)[0][0]
+    pq_buses = np.where(bus_types == 1)[0]
+    pv_buses = np.where(bus_types == 2)[0]
+    non_slack_buses = np.sort(np.concatenate((pq_buses, pv_buses)))
+    n_ns = len(non_slack_buses)
+    size = n_ns + len(pq_buses)
+
+    state = SolverState(Y_bus, P_specified, Q_specified, V_init, pq_buses, non_slack_buses)
+    V, P_calc, Q_calc = state.V, state.P, state.Q
+
+    # Preconditioner: B' and B'' factorized once
+    if B_matrices is None:
+        B_matrices = b_matrices_from_y_bus(Y_bus, non_slack_buses, pq_buses)
+    lu_prime = scipy.sparse.linalg.splu(sp.csc_matrix(B_matrices[0]))
+    lu_dprime = scipy.sparse.linalg.splu(sp.csc_matrix(B_matrices[1]))
+    correction = np.empty(size)
+
+    def precondition(r):
+        correction[:n_ns] = -lu_prime.solve(r[:n_ns] / state.vm[non_slack_buses])
+        correction[n_ns:] = -lu_dprime.solve(r[n_ns:] / state.vm[pq_buses])
+        return correction.copy()
+
+    # Finite-difference Jacobian-vector product around the current point
+    g0 = np.empty(size)
+    x_norm = [0.0]
+
+    def jacobian_product(v):
+        v_norm = np.linalg.norm(v)
+        if v_norm == 0:
+            return np.zeros(size)
+        eps = np.sqrt(np.finfo(float).eps) * (1 + x_norm[0]) / v_norm
+        state.save()
+        state.apply_correction(v, eps)
+        state.compute_mismatch()
+        Jv = (g0 - state.mismatch) / eps
+        state.restore()
+        return Jv
+
+    J = scipy.sparse.linalg.LinearOperator((size, size), matvec=jacobian_product)
+    M = scipy.sparse.linalg.LinearOperator((size, size), matvec=precondition)
+    solve = scipy.sparse.linalg.gmres if krylov == 'gmres' else scipy.sparse.linalg.bicgstab
+
+    iteration_data = []
+    eta = 0.5
+    previous_norm = None
+
+    report = get_reporter(reporter, verbose)
+    report.emit(INFO, 'nr_start', num_buses=num_buses, slack_bus=slack_bus,
+                pv_buses=pv_buses, pq_buses=pq_buses, tol=tol, max_iter=max_iter)
+
+    for iteration in range(max_iter):
+        max_mismatch = state.compute_mismatch()
+        norm = np.linalg.norm(state.mismatch)
+
+        if report.enabled(DEBUG):
+            report.emit(DEBUG, 'nr_iteration', iteration=iteration + 1,
+                        max_mismatch=max_mismatch, V=V)
+
+        iteration_data.append({
+            'iteration': iteration + 1,
+            'V': V.copy(),
+            'P_calc': P_calc.copy(),
+            'Q_calc': Q_calc.copy(),
+            'dP': state.dP.copy(),
+            'dQ': state.dQ.copy(),
+            'max_mismatch': max_mismatch
+        })
+
+        if max_mismatch < tol:
+            report.emit(INFO, 'nr_converged', iterations=iteration + 1,
+                        max_mismatch=max_mismatch, tol=tol)
+            report.flush()
+            return V, P_calc.copy(), Q_calc.copy(), iteration_data
+
+        # Forcing term: eta_k = gamma (||F_k|| / ||F_k-1||)^alpha with the
+        # usual safeguards, and no tighter than needed to reach tol
+        if previous_norm is not None:
+            eta_new = ETA_GAMMA * (norm / previous_norm)**ETA_ALPHA
+            if ETA_GAMMA * eta**ETA_ALPHA > 0.1:
+                eta_new = max(eta_new, ETA_GAMMA * eta**ETA_ALPHA)
+            eta = min(ETA_MAX, eta_new)
+        eta = max(eta, 0.5 * tol / norm)
+        previous_norm = norm
+
+        # Inexact Newton step: ||J dx - mismatch|| <= eta ||mismatch||
+        np.copyto(g0, state.mismatch)
+        x_norm[0] = np.sqrt(np.sum(state.va[non_slack_buses]**2) +
+                            np.sum(state.vm[pq_buses]**2))
+        krylov_iterations = [0]
+
+        def count(_):
+            krylov_iterations[0] += 1
+
+        kwargs = {'callback_type': 'pr_norm', 'restart': min(size, 50)} if krylov == 'gmres' else {}
+        dx, info = solve(J, g0.copy(), rtol=eta, atol=0.0, maxiter=max_krylov, M=M,
+                         callback=count, **kwargs)
+        if info > 0:
+            if report.enabled(DEBUG):
+                report.emit(DEBUG, 'krylov_retry', iteration=iteration + 1,
+                            krylov=krylov, max_krylov=KRYLOV_RETRY_FACTOR * max_krylov)
+            dx, info = solve(J, g0.copy(), x0=dx, rtol=eta, atol=0.0,
+                             maxiter=KRYLOV_RETRY_FACTOR * max_krylov, M=M,
+                             callback=count, **kwargs)
+        if info != 0:
+            # The partial correction is still applied: an inexact step
+            # usually reduces the mismatch, and the next Newton iteration
+            # starts from the new point
+            report.emit(WARNING, 'krylov_not_converged', iteration=iteration + 1,
+                        krylov=krylov, info=info, forcing=eta)
+        iteration_data[-1]['krylov_iterations'] = krylov_iterations[0]
+        iteration_data[-1]['forcing'] = eta
+        iteration_data[-1]['krylov_info'] = info
+
+        state.apply_correction(dx)
+
+    report.emit(WARNING, 'nr_not_converged', max_iter=max_iter,
+                max_mismatch=max_mismatch)
+    report.flush()
+    return V, P_calc.copy(), Q_calc.copy(), iteration_data
+
+
+register_format('krylov_retry', lambda f: [
+    f"  it {f['iteration']}: {f['krylov']} did not reach the forcing tolerance, "
+    f"retrying with max_krylov = {f['max_krylov']}"])
+register_format('krylov_not_converged', lambda f: [
+    f"WARNING: {f['krylov']} stopped short of the forcing tolerance {f['forcing']:.1e} "
+    f"in Newton iteration {f['iteration']} (info = {f['info']}); applying the partial step"])
+
+
+# ==========================================
+# MAIN EXECUTION
+# ==========================================
+
+if __name__ == "__main__":
+    import time
+
+    from methods.admittance import AdmittanceMatrix
+    from methods.current_injection import newton_raphson_current_injection
+    from synthetic_grid import generate_synthetic_grid
+
+    print(f"{'Buses':>7} {'Sparse LU (current inj.)':>26} {'Newton-Krylov':>32} {'Max |dV| (pu)':>14}")
+    for size in (99, 1008, 10008):
+        num_buses, bus_types, P_spec, Q_spec, V_init, branch_data = generate_synthetic_grid(size)
+        Y_bus = AdmittanceMatrix(num_buses, branch_data, sparse=True).Y
+
+        start_time = time.time()
+        V_ci, _, _, ci_data = newton_raphson_current_injection(
+            Y_bus, P_spec, Q_spec, V_init, bus_types, tol=1e-6, verbose=False)
+        t_ci = time.time() - start_time
+
+        start_time = time.time()
+        V_nk, _, _, nk_data = newton_krylov(Y_bus, P_spec, Q_spec, V_init, bus_types,
+                                            tol=1e-6, verbose=False)
+        t_nk = time.time() - start_time
+        krylov_total = sum(d.get('krylov_iterations', 0) for d in nk_data)
+
+        print(f"{num_buses:>7} {len(ci_data):>8} it {t_ci:10.4f} s "
+              f"{len(nk_data):>8} it ({krylov_total:3d} Krylov) {t_nk:8.4f} s "
+              f"{np.max(np.abs(V_ci - V_nk)):>14.2e}")
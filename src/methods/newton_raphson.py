@@ -20,6 +20,11 @@ Date: January 2026
 import numpy as np
 import time
 
+try:
+    from methods.reporting import DEBUG, INFO, WARNING, get_reporter, register_format
+except ImportError:  # run as a script: python src/methods/newton_raphson.py
+    from reporting import DEBUG, INFO, WARNING, get_reporter, register_format
+
 # ==========================================
 # LINES 25-100: DATA INPUT AND Y-BUS CONSTRUCTION
 # ==========================================
@@ -93,6 +98,50 @@ def get_ieee_9_bus_data():
     return num_buses, bus_types, P_specified, Q_specified, V_init, branch_data
 
 
+def branch_arrays(branch_data):
+    """
+    Converts branch_data into column arrays.
+    
+    Branches are (from_bus, to_bus, R, X, B) or, for transformers with an
+    off-nominal tap, (from_bus, to_bus, R, X, B, tap_ratio, shift_deg).
+    Plain branches get a nominal tap (ratio 1.0, shift 0 degrees).
+    
+    Returns:
+    --------
+    from_bus, to_bus : int arrays (0-based bus indices)
+    r, x, b, tap_ratio, shift_deg : float arrays
+    """
+    data = np.array([tuple(branch) + (1.0, 0.0)[len(branch) - 5:]
+                     for branch in branch_data], dtype=float).reshape(-1, 7)
+    from_bus = data[:, 0].astype(int) - 1
+    to_bus = data[:, 1].astype(int) - 1
+    return from_bus, to_bus, data[:, 2], data[:, 3], data[:, 4], data[:, 5], data[:, 6]
+
+
+def branch_primitives(r, x, b, tap_ratio=1.0, shift_deg=0.0, status=1):
+    """
+    Returns the primitive admittances (Y_ff, Y_ft, Y_tf, Y_tt) of branches.
+    
+    Pi-model with the tap on the from side, a = tap_ratio * e^(j*shift):
+    
+        [I_f]   [ (y + jb/2) / |a|^2    -y / conj(a) ] [V_f]
+        [I_t] = [ -y / a                 y + jb/2    ] [V_t]
+    
+    where y = 1/(r + jx). With a = 1 this is the plain line model.
+    All arguments may be scalars or arrays of equal length.
+    """
+    y_series = 1 / (np.asarray(r) + 1j * np.asarray(x))
+    y_shunt = 1j * np.asarray(b) / 2
+    a = np.asarray(tap_ratio) * np.exp(1j * np.radians(shift_deg))
+    on = np.asarray(status, dtype=float)
+    
+    Y_ff = on * (y_series + y_shunt) / np.abs(a)**2
+    Y_ft = on * -y_series / np.conj(a)
+    Y_tf = on * -y_series / a
+    Y_tt = on * (y_series + y_shunt)
+    return Y_ff, Y_ft, Y_tf, Y_tt
+
+
 def build_y_bus(num_buses, branch_data):
     """
     Constructs the Y-bus admittance matrix from branch data.
@@ -101,12 +150,16 @@ def build_y_bus(num_buses, branch_data):
     - Diagonal elements (Y_ii): Sum of all admittances connected to bus i
     - Off-diagonal elements (Y_ij): Negative of admittance between buses i and j
     
+    Transformers with an off-nominal tap ratio or phase shift make Y
+    asymmetric (see branch_primitives()).
+    
     Parameters:
     -----------
     num_buses : int
         Total number of buses in the system
     branch_data : list of tuples
-        Each tuple: (from_bus, to_bus, R, X, B)
+        Each tuple: (from_bus, to_bus, R, X, B) or
+        (from_bus, to_bus, R, X, B, tap_ratio, shift_deg)
     
     Returns:
     --------
@@ -119,38 +172,332 @@ def build_y_bus(num_buses, branch_data):
     # Initialize Y-bus matrix as complex zeros
     Y_bus = np.zeros((num_buses, num_buses), dtype=complex)
     
-    # Build Y-bus by processing each branch
-    for branch in branch_data:
-        f, t, r, x, b = branch
-        # Convert 1-based bus numbering to 0-based array indexing
-        i = int(f) - 1
-        j = int(t) - 1
+    # Branch parameters as arrays (1-based bus numbers converted to 0-based)
+    i, j, r, x, b, tap_ratio, shift_deg = branch_arrays(branch_data)
+    
+    # Primitive admittances of every branch (series y = 1/(r + jx),
+    # half of the line charging at each end, tap on the from side)
+    Y_ff, Y_ft, Y_tf, Y_tt = branch_primitives(r, x, b, tap_ratio, shift_deg)
+    
+    # Add every branch to the four Y-bus entries it touches
+    # (np.add.at accumulates parallel branches correctly)
+    np.add.at(Y_bus, (i, i), Y_ff)
+    np.add.at(Y_bus, (j, j), Y_tt)
+    np.add.at(Y_bus, (i, j), Y_ft)
+    np.add.at(Y_bus, (j, i), Y_tf)
+    
+    return Y_bus
+
+
+# ==========================================
+# LINES 148-350: NEWTON-RAPHSON ALGORITHM
+# ==========================================
+
+def power_injection_derivatives(Y_bus, V):
+    """
+    Returns the bus injections S = V conj(Y_bus V) and their sparse complex
+    derivatives with respect to all bus angles and magnitudes:
+    
+        ∂S/∂δ   = j diag(V) conj(diag(I) - Y diag(V))
+        ∂S/∂|V| = diag(V) conj(Y diag(V/|V|)) + conj(diag(I)) diag(V/|V|)
+    
+    The real and imaginary parts of the rows/columns of the non-slack and
+    PQ buses are the Jacobian blocks J1-J4 (see SolverState.update_jacobian()).
+    
+    Parameters:
+    -----------
+    Y_bus : complex array or scipy.sparse matrix
+        Bus admittance matrix
+    V : complex array
+        Bus voltages
+    
+    Returns:
+    --------
+    S : complex array
+    dS_dva, dS_dvm : scipy.sparse matrices (n x n)
+    """
+    import scipy.sparse as sp
+    
+    Y_bus = sp.csr_matrix(Y_bus)
+    I = Y_bus @ V
+    diag_V = sp.diags(V)
+    diag_Vn = sp.diags(V / np.abs(V))
+    dS_dva = 1j * diag_V @ (sp.diags(I) - Y_bus @ diag_V).conj()
+    dS_dvm = diag_V @ (Y_bus @ diag_Vn).conj() + sp.diags(np.conj(I)) @ diag_Vn
+    return V * np.conj(I), dS_dva.tocsr(), dS_dvm.tocsr()
+
+
+class SolverState:
+    """
+    Bus voltages and preallocated work buffers of one Newton-Raphson solve.
+    
+    The voltage is kept as magnitude and angle arrays (vm, va); the phasor
+    V, the injections S = P + jQ and the mismatch vector are recomputed
+    into the same buffers every iteration with out= ufuncs, so the
+    mismatch and voltage update allocate no arrays. P and Q are views of
+    S, dP and dQ are views of mismatch.
+    
+    Parameters:
+    -----------
+    Y_bus : complex array or scipy.sparse matrix
+        Bus admittance matrix
+    P_specified, Q_specified : array
+        Specified bus injections (pu)
+    V_init : complex array
+        Initial voltage phasors
+    pq_buses, non_slack_buses : int arrays
+        Bus index sets of the mismatch equations
+    """
+    
+    def __init__(self, Y_bus, P_specified, Q_specified, V_init, pq_buses, non_slack_buses):
+        V_init = np.asarray(V_init, dtype=complex)
+        n, n_ns, n_pq = len(V_init), len(non_slack_buses), len(pq_buses)
+        self.Y_bus = Y_bus
+        self.pq_buses = pq_buses
+        self.non_slack_buses = non_slack_buses
         
-        # Calculate series admittance: y = 1/z = 1/(r + jx)
-        z = complex(r, x)
-        y_series = 1 / z
+        self.vm = np.abs(V_init)
+        self.va = np.angle(V_init)
+        self.V = np.empty(n, dtype=complex)
+        self.I = np.empty(n, dtype=complex)
+        self.S = np.empty(n, dtype=complex)
+        self.P = self.S.real
+        self.Q = self.S.imag
         
-        # Calculate shunt admittance (half of total line charging at each end)
-        y_shunt = complex(0, b / 2)
+        # Specified injections of the mismatch equations (gathered once)
+        self.P_spec = np.asarray(P_specified, dtype=float)[non_slack_buses]
+        self.Q_spec = np.asarray(Q_specified, dtype=float)[pq_buses]
         
-        # Update Y-bus matrix elements
-        # Diagonal elements: self-admittance of each bus
-        Y_bus[i, i] += y_series + y_shunt
-        Y_bus[j, j] += y_series + y_shunt
+        self.mismatch = np.empty(n_ns + n_pq)
+        self.dP = self.mismatch[:n_ns]
+        self.dQ = self.mismatch[n_ns:]
+        self.J = np.empty((n_ns + n_pq, n_ns + n_pq))
+        self.J1 = self.J[:n_ns, :n_ns]  # ∂P/∂δ
+        self.J2 = self.J[:n_ns, n_ns:]  # ∂P/∂|V|
+        self.J3 = self.J[n_ns:, :n_ns]  # ∂Q/∂δ
+        self.J4 = self.J[n_ns:, n_ns:]  # ∂Q/∂|V|
+        self._abs = np.empty(n_ns + n_pq)
+        self._ns = np.empty(n_ns)
+        self._pq = np.empty(n_pq)
+        self._step = np.empty(n_ns + n_pq)
         
-        # Off-diagonal elements: mutual admittance (negative)
-        Y_bus[i, j] -= y_series
-        Y_bus[j, i] -= y_series
+        # Saved point for trial steps (see save() / restore())
+        self._va_saved = np.empty(n)
+        self._vm_saved = np.empty(n)
+        self.mismatch_saved = np.empty(n_ns + n_pq)
         
-    return Y_bus
+        self.update_voltage()
+    
+    def update_voltage(self):
+        """Recomputes V = vm * e^(j*va) in place."""
+        np.cos(self.va, out=self.V.real)
+        np.sin(self.va, out=self.V.imag)
+        np.multiply(self.V.real, self.vm, out=self.V.real)
+        np.multiply(self.V.imag, self.vm, out=self.V.imag)
+    
+    def compute_mismatch(self):
+        """
+        Recomputes S = V * conj(Y_bus * V), the mismatch vector [dP, dQ]
+        and returns the maximum absolute mismatch.
+        """
+        if isinstance(self.Y_bus, np.ndarray):
+            np.matmul(self.Y_bus, self.V, out=self.I)
+        else:
+            self.I[:] = self.Y_bus @ self.V
+        np.conjugate(self.I, out=self.I)
+        np.multiply(self.V, self.I, out=self.S)
+        
+        # ΔP = P_specified - P_calculated (non-slack buses)
+        np.take(self.P, self.non_slack_buses, out=self.dP)
+        np.subtract(self.P_spec, self.dP, out=self.dP)
+        # ΔQ = Q_specified - Q_calculated (PQ buses)
+        np.take(self.Q, self.pq_buses, out=self.dQ)
+        np.subtract(self.Q_spec, self.dQ, out=self.dQ)
+        
+        np.abs(self.mismatch, out=self._abs)
+        return self._abs.max()
+    
+    def apply_correction(self, dx, step=1.0):
+        """Adds step * dx (dx = [Δδ, Δ|V|]) to va and vm and updates V."""
+        n_ns = len(self.non_slack_buses)
+        if step != 1.0:
+            dx = np.multiply(dx, step, out=self._step)
+        np.take(self.va, self.non_slack_buses, out=self._ns)
+        np.add(self._ns, dx[:n_ns], out=self._ns)
+        np.put(self.va, self.non_slack_buses, self._ns)
+        np.take(self.vm, self.pq_buses, out=self._pq)
+        np.add(self._pq, dx[n_ns:], out=self._pq)
+        np.put(self.vm, self.pq_buses, self._pq)
+        self.update_voltage()
+    
+    def update_jacobian(self):
+        """
+        Fills the Jacobian J at the current voltages (call after
+        compute_mismatch(), which provides P and Q).
+        
+        Jacobian structure:
+            [J1  J2]     [∂P/∂δ   ∂P/∂|V|]
+        J = [J3  J4]  =  [∂Q/∂δ   ∂Q/∂|V|]
+        """
+        Y_bus, vm, va = self.Y_bus, self.vm, self.va
+        P_calc, Q_calc = self.P, self.Q
+        non_slack_buses, pq_buses = self.non_slack_buses, self.pq_buses
+        J1, J2, J3, J4 = self.J1, self.J2, self.J3, self.J4
+        
+        # LINES 314-325: Fill J1 and J3 (derivatives w.r.t. angles)
+        for r, i in enumerate(non_slack_buses):
+            for c, k in enumerate(non_slack_buses):
+                if i == k:
+                    # Diagonal elements
+                    J1[r, c] = -Q_calc[i] - np.imag(Y_bus[i, i]) * vm[i]**2
+                else:
+                    # Off-diagonal elements
+                    y_ik = Y_bus[i, k]
+                    delta_ik = va[i] - va[k]
+                    J1[r, c] = vm[i] * vm[k] * (
+                        np.real(y_ik) * np.sin(delta_ik) - 
+                        np.imag(y_ik) * np.cos(delta_ik)
+                    )
+        
+        for r, i in enumerate(pq_buses):
+            for c, k in enumerate(non_slack_buses):
+                if i == k:
+                    # Diagonal elements
+                    J3[r, c] = P_calc[i] - np.real(Y_bus[i, i]) * vm[i]**2
+                else:
+                    # Off-diagonal elements
+                    y_ik = Y_bus[i, k]
+                    delta_ik = va[i] - va[k]
+                    J3[r, c] = -vm[i] * vm[k] * (
+                        np.real(y_ik) * np.cos(delta_ik) + 
+                        np.imag(y_ik) * np.sin(delta_ik)
+                    )
+        
+        # LINES 350-370: Fill J2 and J4 (derivatives w.r.t. voltage magnitudes)
+        for r, i in enumerate(non_slack_buses):
+            for c, k in enumerate(pq_buses):
+                if i == k:
+                    # Diagonal elements
+                    J2[r, c] = P_calc[i] / vm[i] + np.real(Y_bus[i, i]) * vm[i]
+                else:
+                    # Off-diagonal elements
+                    y_ik = Y_bus[i, k]
+                    delta_ik = va[i] - va[k]
+                    J2[r, c] = vm[i] * (
+                        np.real(y_ik) * np.cos(delta_ik) + 
+                        np.imag(y_ik) * np.sin(delta_ik)
+                    )
+        
+        for r, i in enumerate(pq_buses):
+            for c, k in enumerate(pq_buses):
+                if i == k:
+                    # Diagonal elements
+                    J4[r, c] = Q_calc[i] / vm[i] - np.imag(Y_bus[i, i]) * vm[i]
+                else:
+                    # Off-diagonal elements
+                    y_ik = Y_bus[i, k]
+                    delta_ik = va[i] - va[k]
+                    J4[r, c] = vm[i] * (
+                        np.real(y_ik) * np.sin(delta_ik) - 
+                        np.imag(y_ik) * np.cos(delta_ik)
+                    )
+    
+    def save(self):
+        """Saves the current voltages and mismatch vector."""
+        np.copyto(self._va_saved, self.va)
+        np.copyto(self._vm_saved, self.vm)
+        np.copyto(self.mismatch_saved, self.mismatch)
+    
+    def restore(self):
+        """Returns to the voltages saved by save() (mismatch not recomputed)."""
+        np.copyto(self.va, self._va_saved)
+        np.copyto(self.vm, self._vm_saved)
+        self.update_voltage()
+
+
+class JacobianFactors:
+    """
+    LU factors of a Newton-Raphson Jacobian kept for reuse.
+    
+    Pass the same object to several newton_raphson(jacobian_reuse=True)
+    calls, e.g. load variations of one network, so that each solve starts
+    with the factors left by the previous one instead of a new
+    factorization.
+    """
+    
+    def __init__(self):
+        self.lu = None          # scipy.linalg.lu_factor() output
+        self.factorizations = 0
+        self.solves = 0
 
 
 # ==========================================
-# LINES 148-350: NEWTON-RAPHSON ALGORITHM
+# STEP CONTROL
 # ==========================================
 
+def line_search_step(state, dx, min_step=1/64, sufficient_decrease=1e-4):
+    """
+    Backtracking line search on the mismatch norm.
+    
+    Halves the step until ||mismatch||^2 decreases sufficiently (Armijo
+    condition) or min_step is reached. Every trial only re-evaluates the
+    mismatch; the Jacobian is not recomputed. Leaves the state at the
+    accepted point and returns the step length.
+    """
+    state.save()
+    norm0 = state.mismatch_saved @ state.mismatch_saved
+    step = 1.0
+    while True:
+        state.apply_correction(dx, step)
+        state.compute_mismatch()
+        norm = state.mismatch @ state.mismatch
+        if norm <= (1 - 2 * sufficient_decrease * step) * norm0 or step <= min_step:
+            return step
+        state.restore()
+        step /= 2
+
+
+def optimal_multiplier_step(state, dx, max_step=2.0):
+    """
+    Iwamoto optimal multiplier.
+    
+    The mismatch along the Newton direction is approximated by
+    g(μ) = a (1 - μ) + μ² c, with a the mismatch at the current point and
+    c the mismatch after the full step (one extra mismatch evaluation).
+    μ minimizes ||g(μ)||², a root of the cubic
+    2Σc² μ³ - 3Σac μ² + (Σa² + 2Σac) μ - Σa² = 0.
+    Leaves the state at the new point and returns μ.
+    """
+    state.save()
+    state.apply_correction(dx)
+    state.compute_mismatch()
+    a, c = state.mismatch_saved, state.mismatch
+    aa, ac, cc = a @ a, a @ c, c @ c
+    
+    step = 1.0
+    roots = np.roots([2 * cc, -3 * ac, aa + 2 * ac, -aa])
+    candidates = [mu.real for mu in roots
+                  if abs(mu.imag) < 1e-12 and 0 < mu.real <= max_step]
+    if candidates:
+        step = min(candidates, key=lambda mu: (1 - mu)**2 * aa + 2 * (1 - mu) * mu**2 * ac
+                   + mu**4 * cc)
+    
+    if step != 1.0:
+        state.restore()
+        state.apply_correction(dx, step)
+    return step
+
+
+STEP_CONTROLS = {
+    'line_search': line_search_step,
+    'iwamoto': optimal_multiplier_step,
+}
+
+
 def newton_raphson(Y_bus, P_specified, Q_specified, V_init, bus_types, 
-                   max_iter=100, tol=1e-4, verbose=True):
+                   max_iter=100, tol=1e-4, verbose=True, reporter=None,
+                   step_control=None, jacobian_reuse=False, max_contraction=0.5,
+                   factors=None):
     """
     Solves power flow equations using Full Newton-Raphson method.
     
@@ -182,6 +529,24 @@ def newton_raphson(Y_bus, P_specified, Q_specified, V_init, bus_types,
         Convergence tolerance (pu)
     verbose : bool
         Print iteration details
+    reporter : reporting.Reporter, optional
+        Receives the progress events ('nr_start', 'nr_iteration',
+        'nr_converged', 'nr_not_converged') instead of stdout; overrides
+        verbose
+    step_control : {None, 'line_search', 'iwamoto'}
+        None takes the full Newton step; 'line_search' backtracks on the
+        mismatch norm, 'iwamoto' scales the step by the optimal multiplier
+        (see line_search_step() / optimal_multiplier_step())
+    jacobian_reuse : bool
+        Keep the LU factors of the Jacobian across iterations (Shamanskii /
+        "dishonest" Newton) and refactorize only when the maximum mismatch
+        shrinks by less than max_contraction per iteration
+    max_contraction : float
+        Largest mismatch ratio (this / previous iteration) at which the
+        factors are kept
+    factors : JacobianFactors, optional
+        With jacobian_reuse, factors to start from (e.g. of a base case)
+        and updated in place - share one object across nearby scenarios
     
     Returns:
     --------
@@ -192,15 +557,14 @@ def newton_raphson(Y_bus, P_specified, Q_specified, V_init, bus_types,
     Q_calc : array
         Calculated reactive power
     iteration_data : list
-        Data from each iteration (for Task 1 requirement)
+        Data from each iteration (for Task 1 requirement); with step
+        control, 'step' holds the step length taken after the iteration;
+        with jacobian_reuse, 'jacobian_reused' tells if old factors were used
     
     Flowchart Box 3-7: Iterative Solution
     Line Numbers: 148-350
     """
-    num_buses = len(Y_bus)
-    
-    # LINE 215: Initialize voltage phasors
-    V = np.array(V_init, copy=True)
+    num_buses = len(V_init)
     
     # LINES 218-225: Identify bus types
     slack_bus = np.where(bus_types == 0)[0][0]
@@ -208,49 +572,52 @@ def newton_raphson(Y_bus, P_specified, Q_specified, V_init, bus_types,
     pv_buses = np.where(bus_types == 2)[0]
     non_slack_buses = np.sort(np.concatenate((pq_buses, pv_buses)))
     
+    if step_control is not None and step_control not in STEP_CONTROLS:
+        raise ValueError(f"Unknown step control '{step_control}' "
+                         f"(available: {', '.join(STEP_CONTROLS)})")
+    
+    # LINE 215: Initialize voltages (magnitude/angle) and work buffers
+    state = SolverState(Y_bus, P_specified, Q_specified, V_init, pq_buses, non_slack_buses)
+    V = state.V
+    P_calc, Q_calc = state.P, state.Q
+    J = state.J
+    
+    # Jacobian reuse: start from the factors left by an earlier solve if
+    # they fit this network
+    if jacobian_reuse:
+        from scipy.linalg import lu_factor, lu_solve
+        if factors is None:
+            factors = JacobianFactors()
+        if factors.lu is not None and factors.lu[0].shape != J.shape:
+            factors.lu = None
+    previous_mismatch = None
+    stale_step = False
+    
     # Storage for iteration data (for Task 1: 2nd iteration output)
     iteration_data = []
     
-    if verbose:
-        print("\n" + "="*80)
-        print("STARTING NEWTON-RAPHSON LOAD FLOW ANALYSIS")
-        print("="*80)
-        print(f"Number of buses: {num_buses}")
-        print(f"Slack bus: {slack_bus + 1}")
-        print(f"PV buses: {pv_buses + 1}")
-        print(f"PQ buses: {pq_buses + 1}")
-        print(f"Convergence tolerance: {tol} pu")
-        print(f"Maximum iterations: {max_iter}")
-        print("="*80)
+    report = get_reporter(reporter, verbose)
+    report.emit(INFO, 'nr_start', num_buses=num_buses, slack_bus=slack_bus,
+                pv_buses=pv_buses, pq_buses=pq_buses, tol=tol, max_iter=max_iter)
     
     # LINES 242-345: Main iteration loop
     for iteration in range(max_iter):
-        if verbose:
-            print(f"\n--- ITERATION {iteration + 1} ---")
-        
-        # LINE 248: Calculate power injections at all buses
-        # S = V * conj(I) = V * conj(Y_bus * V)
-        S_calc = V * np.conj(Y_bus @ V)
-        P_calc = np.real(S_calc)
-        Q_calc = np.imag(S_calc)
-        
-        # LINES 254-257: Calculate power mismatches
+        # LINES 248-257: Calculate power injections at all buses
+        # S = V * conj(I) = V * conj(Y_bus * V) and the power mismatches
         # ΔP = P_specified - P_calculated (for non-slack buses)
         # ΔQ = Q_specified - Q_calculated (for PQ buses only)
-        dP = P_specified[non_slack_buses] - P_calc[non_slack_buses]
-        dQ = Q_specified[pq_buses] - Q_calc[pq_buses]
+        max_mismatch = state.compute_mismatch()
         
-        # Combine mismatches into single vector
-        mismatch = np.concatenate((dP, dQ))
+        # A step with old Jacobian factors that increased the mismatch is
+        # undone, and the Jacobian is refactorized at the previous point
+        if stale_step and max_mismatch > previous_mismatch:
+            state.restore()
+            max_mismatch = state.compute_mismatch()
+            factors.lu = None
         
-        # Calculate maximum mismatch for convergence check
-        max_mismatch = np.max(np.abs(mismatch))
-        
-        if verbose:
-            print(f"Maximum power mismatch: {max_mismatch:.6f} pu")
-            print(f"Bus voltages (pu):")
-            for i in range(num_buses):
-                print(f"  Bus {i+1}: {np.abs(V[i]):.4f} ∠ {np.degrees(np.angle(V[i])):7.3f}°")
+        if report.enabled(DEBUG):
+            report.emit(DEBUG, 'nr_iteration', iteration=iteration + 1,
+                        max_mismatch=max_mismatch, V=V)
         
         # Store iteration data (especially for 2nd iteration output requirement)
         iteration_data.append({
@@ -258,117 +625,51 @@ def newton_raphson(Y_bus, P_specified, Q_specified, V_init, bus_types,
             'V': V.copy(),
             'P_calc': P_calc.copy(),
             'Q_calc': Q_calc.copy(),
-            'dP': dP.copy(),
-            'dQ': dQ.copy(),
+            'dP': state.dP.copy(),
+            'dQ': state.dQ.copy(),
             'max_mismatch': max_mismatch
         })
         
         # LINE 286: Check for convergence
         if max_mismatch < tol:
-            if verbose:
-                print(f"\n{'='*80}")
-                print(f"CONVERGED in {iteration + 1} iterations!")
-                print(f"Maximum mismatch: {max_mismatch:.8f} pu < {tol} pu")
-                print(f"{'='*80}")
-            return V, P_calc, Q_calc, iteration_data
-        
-        # LINES 296-340: Build Jacobian Matrix
-        # Jacobian structure:
-        #     [J1  J2]     [∂P/∂δ   ∂P/∂|V|]
-        # J = [J3  J4]  =  [∂Q/∂δ   ∂Q/∂|V|]
-        
-        n_non_slack = len(non_slack_buses)
-        n_pq = len(pq_buses)
-        
-        # Initialize Jacobian submatrices
-        J1 = np.zeros((n_non_slack, n_non_slack))  # ∂P/∂δ
-        J2 = np.zeros((n_non_slack, n_pq))         # ∂P/∂|V|
-        J3 = np.zeros((n_pq, n_non_slack))         # ∂Q/∂δ
-        J4 = np.zeros((n_pq, n_pq))                # ∂Q/∂|V|
-        
-        # LINES 314-325: Fill J1 and J3 (derivatives w.r.t. angles)
-        for r, i in enumerate(non_slack_buses):
-            for c, k in enumerate(non_slack_buses):
-                if i == k:
-                    # Diagonal elements
-                    J1[r, c] = -Q_calc[i] - np.imag(Y_bus[i, i]) * np.abs(V[i])**2
-                else:
-                    # Off-diagonal elements
-                    y_ik = Y_bus[i, k]
-                    delta_ik = np.angle(V[i]) - np.angle(V[k])
-                    J1[r, c] = np.abs(V[i] * V[k]) * (
-                        np.real(y_ik) * np.sin(delta_ik) - 
-                        np.imag(y_ik) * np.cos(delta_ik)
-                    )
-        
-        for r, i in enumerate(pq_buses):
-            for c, k in enumerate(non_slack_buses):
-                if i == k:
-                    # Diagonal elements
-                    J3[r, c] = P_calc[i] - np.real(Y_bus[i, i]) * np.abs(V[i])**2
-                else:
-                    # Off-diagonal elements
-                    y_ik = Y_bus[i, k]
-                    delta_ik = np.angle(V[i]) - np.angle(V[k])
-                    J3[r, c] = -np.abs(V[i] * V[k]) * (
-                        np.real(y_ik) * np.cos(delta_ik) + 
-                        np.imag(y_ik) * np.sin(delta_ik)
-                    )
-        
-        # LINES 350-370: Fill J2 and J4 (derivatives w.r.t. voltage magnitudes)
-        for r, i in enumerate(non_slack_buses):
-            for c, k in enumerate(pq_buses):
-                if i == k:
-                    # Diagonal elements
-                    J2[r, c] = P_calc[i] / np.abs(V[i]) + np.real(Y_bus[i, i]) * np.abs(V[i])
-                else:
-                    # Off-diagonal elements
-                    y_ik = Y_bus[i, k]
-                    delta_ik = np.angle(V[i]) - np.angle(V[k])
-                    J2[r, c] = np.abs(V[i]) * (
-                        np.real(y_ik) * np.cos(delta_ik) + 
-                        np.imag(y_ik) * np.sin(delta_ik)
-                    )
-        
-        for r, i in enumerate(pq_buses):
-            for c, k in enumerate(pq_buses):
-                if i == k:
-                    # Diagonal elements
-                    J4[r, c] = Q_calc[i] / np.abs(V[i]) - np.imag(Y_bus[i, i]) * np.abs(V[i])
-                else:
-                    # Off-diagonal elements
-                    y_ik = Y_bus[i, k]
-                    delta_ik = np.angle(V[i]) - np.angle(V[k])
-                    J4[r, c] = np.abs(V[i]) * (
-                        np.real(y_ik) * np.sin(delta_ik) - 
-                        np.imag(y_ik) * np.cos(delta_ik)
-                    )
-        
-        # LINE 391: Assemble full Jacobian matrix
-        J = np.block([[J1, J2], [J3, J4]])
+            report.emit(INFO, 'nr_converged', iterations=iteration + 1,
+                        max_mismatch=max_mismatch, tol=tol)
+            report.flush()
+            return V, P_calc.copy(), Q_calc.copy(), iteration_data
         
+        # LINES 296-370: Build Jacobian matrix (trig-heavy J1-J4)
         # LINE 394: Solve linear system: J * dx = mismatch
-        dx = np.linalg.solve(J, mismatch)
-        
-        # LINES 397-405: Extract corrections and update voltages
-        d_angle = dx[:n_non_slack]  # Angle corrections
-        d_vmag = dx[n_non_slack:]    # Magnitude corrections
+        if jacobian_reuse:
+            # Keep the factors while the mismatch still contracts fast enough
+            reuse = factors.lu is not None and (
+                previous_mismatch is None or max_mismatch <= max_contraction * previous_mismatch)
+            if not reuse:
+                state.update_jacobian()
+                factors.lu = lu_factor(J)
+                factors.factorizations += 1
+            factors.solves += 1
+            iteration_data[-1]['jacobian_reused'] = reuse
+            dx = lu_solve(factors.lu, state.mismatch)
+            previous_mismatch = max_mismatch
+            stale_step = reuse
+            if reuse:
+                state.save()
+        else:
+            state.update_jacobian()
+            dx = np.linalg.solve(J, state.mismatch)
         
-        # Update voltage angles
-        current_angles = np.angle(V)
-        current_angles[non_slack_buses] += d_angle
-        
-        # Update voltage magnitudes (PQ buses only)
-        current_mags = np.abs(V)
-        current_mags[pq_buses] += d_vmag
-        
-        # Reconstruct voltage phasor: V = |V| * e^(jθ)
-        V = current_mags * np.exp(1j * current_angles)
+        # LINES 397-405: Update voltage angles (non-slack buses) and
+        # magnitudes (PQ buses), then V = |V| * e^(jθ) - all in place
+        if step_control is None:
+            state.apply_correction(dx)
+        else:
+            iteration_data[-1]['step'] = STEP_CONTROLS[step_control](state, dx)
     
     # If we reach here, convergence was not achieved
-    print(f"\nWARNING: Newton-Raphson did not converge within {max_iter} iterations.")
-    print(f"Final maximum mismatch: {max_mismatch:.6f} pu")
-    return V, P_calc, Q_calc, iteration_data
+    report.emit(WARNING, 'nr_not_converged', max_iter=max_iter,
+                max_mismatch=max_mismatch)
+    report.flush()
+    return V, P_calc.copy(), Q_calc.copy(), iteration_data
 
 
 # ==========================================
@@ -380,7 +681,8 @@ def calculate_line_flows(V, branch_data):
     Calculates power flows and losses in all transmission lines and transformers.
     
     For each branch from bus i to bus j:
-    - Current: I_ij = (V_i - V_j) * y_series + V_i * y_shunt
+    - Current: I_ij = Y_ff * V_i + Y_ft * V_j  (= (V_i - V_j) * y_series
+      + V_i * y_shunt for a plain line, see branch_primitives())
     - Power flow: S_ij = V_i * conj(I_ij)
     - Loss: S_loss = S_ij + S_ji
     
@@ -389,7 +691,7 @@ def calculate_line_flows(V, branch_data):
     V : complex array
         Final voltage phasors
     branch_data : list
-        Branch parameters
+        Branch parameters (off-nominal taps and phase shifts included)
     
     Returns:
     --------
@@ -403,97 +705,146 @@ def calculate_line_flows(V, branch_data):
     Flowchart Box 8: Post-Processing
     Line Numbers: 420-520
     """
-    line_flows = []
-    total_loss_P = 0
-    total_loss_Q = 0
+    i, j, r, x, b, tap_ratio, shift_deg = branch_arrays(branch_data)
+    Y_ff, Y_ft, Y_tf, Y_tt = branch_primitives(r, x, b, tap_ratio, shift_deg)
     
-    for branch in branch_data:
-        f, t, r, x, b = branch
-        i = int(f) - 1
-        j = int(t) - 1
-        
-        # Calculate branch admittances
-        z = complex(r, x)
-        y_series = 1 / z
-        y_shunt = complex(0, b / 2)
-        
-        # Current from i to j
-        I_ij = (V[i] - V[j]) * y_series + V[i] * y_shunt
-        S_ij = V[i] * np.conj(I_ij)
-        
-        # Current from j to i
-        I_ji = (V[j] - V[i]) * y_series + V[j] * y_shunt
-        S_ji = V[j] * np.conj(I_ji)
-        
-        # Branch loss
-        S_loss = S_ij + S_ji
-        
-        total_loss_P += np.real(S_loss)
-        total_loss_Q += np.imag(S_loss)
-        
+    # Branch end currents and power flows for all branches at once
+    I_ij = Y_ff * V[i] + Y_ft * V[j]
+    I_ji = Y_tf * V[i] + Y_tt * V[j]
+    S_ij = V[i] * np.conj(I_ij)
+    S_ji = V[j] * np.conj(I_ji)
+    
+    # Branch losses
+    S_loss = S_ij + S_ji
+    total_loss_P = np.sum(np.real(S_loss))
+    total_loss_Q = np.sum(np.imag(S_loss))
+    
+    line_flows = []
+    for k, branch in enumerate(branch_data):
         line_flows.append({
-            'from': f,
-            'to': t,
-            'P_ij': np.real(S_ij),
-            'Q_ij': np.imag(S_ij),
-            'P_ji': np.real(S_ji),
-            'Q_ji': np.imag(S_ji),
-            'P_loss': np.real(S_loss),
-            'Q_loss': np.imag(S_loss)
+            'from': branch[0],
+            'to': branch[1],
+            'P_ij': np.real(S_ij[k]),
+            'Q_ij': np.imag(S_ij[k]),
+            'P_ji': np.real(S_ji[k]),
+            'Q_ji': np.imag(S_ji[k]),
+            'P_loss': np.real(S_loss[k]),
+            'Q_loss': np.imag(S_loss[k])
         })
     
     return line_flows, total_loss_P, total_loss_Q
 
 
 def print_results(V, P_calc, Q_calc, line_flows, total_loss_P, total_loss_Q, 
-                  iteration_data, num_buses):
+                  iteration_data, num_buses, reporter=None):
     """
     Prints formatted results for the load flow analysis.
     
+    The tables are emitted as one 'nr_results' event, so a reporter with
+    a JSON-lines sink records the same data in structured form.
+    
     Flowchart Box 9: Output Display
     Line Numbers: 520-600
     """
-    print("\n" + "="*80)
-    print("FINAL RESULTS - BUS DATA")
-    print("="*80)
-    print(f"{'Bus':<6} {'V (pu)':<12} {'Angle (°)':<12} {'P (pu)':<12} {'Q (pu)':<12}")
-    print("-"*80)
-    
-    for i in range(num_buses):
+    report = get_reporter(reporter, verbose=True)
+    report.emit(INFO, 'nr_results', V=V, P_calc=P_calc, Q_calc=Q_calc,
+                line_flows=line_flows, total_loss_P=total_loss_P,
+                total_loss_Q=total_loss_Q,
+                iteration_2=iteration_data[1] if len(iteration_data) >= 2 else None,
+                num_buses=num_buses)
+    report.flush()
+
+
+# ==========================================
+# REPORT FORMATS (text of the solver events)
+# ==========================================
+
+def _format_start(f):
+    return ["\n" + "="*80,
+            "STARTING NEWTON-RAPHSON LOAD FLOW ANALYSIS",
+            "="*80,
+            f"Number of buses: {f['num_buses']}",
+            f"Slack bus: {f['slack_bus'] + 1}",
+            f"PV buses: {f['pv_buses'] + 1}",
+            f"PQ buses: {f['pq_buses'] + 1}",
+            f"Convergence tolerance: {f['tol']} pu",
+            f"Maximum iterations: {f['max_iter']}",
+            "="*80]
+
+
+def _format_iteration(f):
+    V = f['V']
+    mags, angles = np.abs(V), np.degrees(np.angle(V))
+    return ([f"\n--- ITERATION {f['iteration']} ---",
+             f"Maximum power mismatch: {f['max_mismatch']:.6f} pu",
+             "Bus voltages (pu):"] +
+            [f"  Bus {i+1}: {mags[i]:.4f} ∠ {angles[i]:7.3f}°" for i in range(len(V))])
+
+
+def _format_converged(f):
+    return [f"\n{'='*80}",
+            f"CONVERGED in {f['iterations']} iterations!",
+            f"Maximum mismatch: {f['max_mismatch']:.8f} pu < {f['tol']} pu",
+            f"{'='*80}"]
+
+
+def _format_not_converged(f):
+    return [f"\nWARNING: Newton-Raphson did not converge within {f['max_iter']} iterations.",
+            f"Final maximum mismatch: {f['max_mismatch']:.6f} pu"]
+
+
+def _format_results(f):
+    V, P_calc, Q_calc = f['V'], f['P_calc'], f['Q_calc']
+    lines = ["\n" + "="*80,
+             "FINAL RESULTS - BUS DATA",
+             "="*80,
+             f"{'Bus':<6} {'V (pu)':<12} {'Angle (°)':<12} {'P (pu)':<12} {'Q (pu)':<12}",
+             "-"*80]
+    
+    for i in range(f['num_buses']):
         v_mag = np.abs(V[i])
         v_ang = np.degrees(np.angle(V[i]))
-        print(f"{i+1:<6} {v_mag:<12.6f} {v_ang:<12.4f} {P_calc[i]:<12.6f} {Q_calc[i]:<12.6f}")
-    
-    print("\n" + "="*80)
-    print("LINE FLOWS AND LOSSES")
-    print("="*80)
-    print(f"{'From':<6} {'To':<6} {'P_flow':<12} {'Q_flow':<12} {'P_loss':<12} {'Q_loss':<12}")
-    print(f"{'Bus':<6} {'Bus':<6} {'(pu)':<12} {'(pu)':<12} {'(pu)':<12} {'(pu)':<12}")
-    print("-"*80)
-    
-    for flow in line_flows:
-        print(f"{flow['from']:<6} {flow['to']:<6} {flow['P_ij']:<12.6f} "
-              f"{flow['Q_ij']:<12.6f} {flow['P_loss']:<12.6f} {flow['Q_loss']:<12.6f}")
-    
-    print("-"*80)
-    print(f"{'TOTAL SYSTEM LOSSES:':<24} {total_loss_P:<12.6f} {total_loss_Q:<12.6f}")
-    print("="*80)
-    
-    # Print 2nd iteration details (Task 1 requirement)
-    if len(iteration_data) >= 2:
-        print("\n" + "="*80)
-        print("SECOND ITERATION DETAILS (Task 1 Requirement)")
-        print("="*80)
-        iter2 = iteration_data[1]
-        print(f"Iteration: {iter2['iteration']}")
-        print(f"Maximum Mismatch: {iter2['max_mismatch']:.8f} pu")
-        print(f"\nVoltage Profile:")
-        for i in range(num_buses):
-            print(f"  Bus {i+1}: {np.abs(iter2['V'][i]):.6f} ∠ {np.degrees(np.angle(iter2['V'][i])):8.4f}°")
-        print(f"\nPower Mismatches:")
-        print(f"  ΔP (non-slack buses): {iter2['dP']}")
-        print(f"  ΔQ (PQ buses): {iter2['dQ']}")
-        print("="*80)
+        lines.append(f"{i+1:<6} {v_mag:<12.6f} {v_ang:<12.4f} {P_calc[i]:<12.6f} {Q_calc[i]:<12.6f}")
+    
+    lines += ["\n" + "="*80,
+              "LINE FLOWS AND LOSSES",
+              "="*80,
+              f"{'From':<6} {'To':<6} {'P_flow':<12} {'Q_flow':<12} {'P_loss':<12} {'Q_loss':<12}",
+              f"{'Bus':<6} {'Bus':<6} {'(pu)':<12} {'(pu)':<12} {'(pu)':<12} {'(pu)':<12}",
+              "-"*80]
+    
+    for flow in f['line_flows']:
+        lines.append(f"{flow['from']:<6} {flow['to']:<6} {flow['P_ij']:<12.6f} "
+                     f"{flow['Q_ij']:<12.6f} {flow['P_loss']:<12.6f} {flow['Q_loss']:<12.6f}")
+    
+    lines += ["-"*80,
+              f"{'TOTAL SYSTEM LOSSES:':<24} {f['total_loss_P']:<12.6f} {f['total_loss_Q']:<12.6f}",
+              "="*80]
+    
+    # 2nd iteration details (Task 1 requirement)
+    iter2 = f['iteration_2']
+    if iter2 is not None:
+        lines += ["\n" + "="*80,
+                  "SECOND ITERATION DETAILS (Task 1 Requirement)",
+                  "="*80,
+                  f"Iteration: {iter2['iteration']}",
+                  f"Maximum Mismatch: {iter2['max_mismatch']:.8f} pu",
+                  f"\nVoltage Profile:"]
+        for i in range(f['num_buses']):
+            lines.append(f"  Bus {i+1}: {np.abs(iter2['V'][i]):.6f} ∠ "
+                         f"{np.degrees(np.angle(iter2['V'][i])):8.4f}°")
+        lines += [f"\nPower Mismatches:",
+                  f"  ΔP (non-slack buses): {iter2['dP']}",
+                  f"  ΔQ (PQ buses): {iter2['dQ']}",
+                  "="*80]
+    return lines
+
+
+register_format('nr_start', _format_start)
+register_format('nr_iteration', _format_iteration)
+register_format('nr_converged', _format_converged)
+register_format('nr_not_converged', _format_not_converged)
+register_format('nr_results', _format_results)
 
 
 # ==========================================
@@ -564,6 +915,36 @@ if __name__ == "__main__":
     print(f"Average time per iteration: {computation_time/len(iter_data):.6f} seconds")
     print("="*80)
     
+    # Jacobian reuse: +/-10% load variations of every load bus, each solved
+    # with a fresh Jacobian per iteration and with the factors shared
+    # across all solves (chord / Shamanskii steps)
+    print("\n--- Jacobian Reuse on Load Variations ---")
+    load_buses = np.where(bus_types == 1)[0]
+    scenarios = []
+    for bus in load_buses:
+        for scale in (0.9, 1.1):
+            P_var, Q_var = P_spec.copy(), Q_spec.copy()
+            P_var[bus] *= scale
+            Q_var[bus] *= scale
+            scenarios.append((P_var, Q_var))
+    factors = JacobianFactors()
+    full_iterations = full_factorizations = reuse_iterations = 0
+    max_difference = 0.0
+    for P_var, Q_var in scenarios:
+        V_full, _, _, full_data = newton_raphson(Y_bus, P_var, Q_var, V_init, bus_types,
+                                                 tol=1e-4, verbose=False)
+        V_reuse, _, _, reuse_data = newton_raphson(Y_bus, P_var, Q_var, V_init, bus_types,
+                                                   tol=1e-4, verbose=False,
+                                                   jacobian_reuse=True, factors=factors)
+        full_iterations += len(full_data)
+        full_factorizations += len(full_data) - 1  # none at the converged iteration
+        reuse_iterations += len(reuse_data)
+        max_difference = max(max_difference, np.max(np.abs(V_full - V_reuse)))
+    print(f"{len(scenarios)} scenarios: full Newton {full_iterations} iterations "
+          f"({full_factorizations} factorizations), reuse {reuse_iterations} iterations "
+          f"({factors.factorizations} factorizations)")
+    print(f"Max |V_full - V_reuse| = {max_difference:.2e} pu (tolerance 1e-4 pu)")
+    
     print("\n" + "*"*80)
     print("*" + " "*25 + "LOAD FLOW ANALYSIS COMPLETE" + " "*28 + "*")
     print("*"*80 + "\n")
@@ -0,0 +1,396 @@
+"""
+AC Optimal Power Flow (Primal-Dual Interior Point)
+==================================================
+Economic dispatch on the full AC network. Instead of fixing the generator
+outputs (P_specified of buses 2 and 3 in get_ieee_9_bus_data()), the
+generator set points are chosen to minimize the total cost
+
+    min   sum_g  c2_g Pg^2 + c1_g Pg + c0_g               ($/h, Pg in MW)
+
+    s.t.  P(V) - Cg Pg + Pd = 0,   Q(V) - Cg Qg + Qd = 0  (power balance)
+          Vmin <= |V| <= Vmax,  Pmin <= Pg <= Pmax,  Qmin <= Qg <= Qmax
+
+where P(V) + jQ(V) = V conj(Y_bus V) are the load flow's injection
+equations. Variables: x = [angles of all buses but the slack (the angle
+reference), all magnitudes, Pg, Qg].
+
+Solved with a primal-dual interior point method (the MIPS scheme used by
+MATPOWER). Every iteration is one Newton step on the perturbed KKT
+conditions h + z = 0, mu z = gamma:
+
+    [ Lxx + dh' diag(mu/z) dh   dg' ] [ dx  ]     [ Lx + dh' (mu h + gamma)/z ]
+    [ dg                        0   ] [ dlam] = - [ g                         ]
+
+- dg, the power balance Jacobian, holds the Newton-Raphson blocks
+  ∂P/∂δ, ∂P/∂|V|, ∂Q/∂δ, ∂Q/∂|V| of ALL buses, as sparse matrices from
+  newton_raphson.power_injection_derivatives()
+- Lxx holds their second derivatives weighted by the multipliers, also
+  sparse (same pattern as the Y-bus in every block)
+- the inequalities are simple bounds, so dh' diag(mu/z) dh is diagonal
+
+so each iteration is one sparse LU of the KKT matrix. Started from a
+solved load flow (V_start and the generator outputs it implies) the
+method typically needs 10-20 iterations, on the 9-bus case and on
+synthetic grids with thousands of buses alike (10k buses: about 10 s).
+
+The multipliers of the P balance are the locational marginal prices.
+Branch flow limits are not modelled: branch_data carries no ratings.
+
+Author: [E/21/291]
+Date: January 2026
+"""
+
+import os
+import sys
+import time
+
+if __package__ in (None, ''):  # run as a script: python src/methods/opf.py
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from methods.newton_raphson import power_injection_derivatives
+from methods.reporting import DEBUG, INFO, WARNING, get_reporter, register_format
+
+# Costs are scaled by COST_SCALE inside the solver ($/h values are large
+# next to the per-unit constraint residuals)
+COST_SCALE = 1e-4
+
+# Fraction of the distance to the boundary taken by a step, and the
+# centering parameter (gamma = CENTERING * z'mu / number of bounds)
+STEP_FRACTION = 0.99995
+CENTERING = 0.1
+
+
+def get_ieee_9_bus_opf_data():
+    """
+    Returns OPF data of the generators of the IEEE 9-bus system (the
+    WSCC 9-bus cost data distributed with MATPOWER, case9).
+
+    Returns:
+    --------
+    gen_buses : int array (0-based)
+    cost : array (generators x 3)
+        c2 ($/MW^2h), c1 ($/MWh), c0 ($/h)
+    Pg_limits, Qg_limits : arrays (generators x 2)
+        Minimum and maximum output (pu)
+    V_limits : tuple
+        (Vmin, Vmax) for all buses (pu)
+    """
+    gen_buses = np.array([0, 1, 2])
+    cost = np.array([[0.11, 5.0, 150.0],
+                     [0.085, 1.2, 600.0],
+                     [0.1225, 1.0, 335.0]])
+    Pg_limits = np.array([[0.10, 2.50], [0.10, 3.00], [0.10, 2.70]])
+    Qg_limits = np.array([[-3.0, 3.0]] * 3)
+    return gen_buses, cost, Pg_limits, Qg_limits, (0.9, 1.1)
+
+
+def power_injection_hessians(Y_bus, V, lam):
+    """
+    Returns the second derivatives of lam^T S (lam: one weight per bus)
+    with respect to the bus angles and magnitudes, as the sparse complex
+    blocks G_aa, G_av, G_va, G_vv. The Hessian of lam_P^T P + lam_Q^T Q
+    is Re G(lam_P) + Im G(lam_Q).
+    """
+    import scipy.sparse as sp
+
+    I = Y_bus @ V
+    diag_V = sp.diags(V)
+    A = sp.diags(lam * V)
+    B = Y_bus @ diag_V
+    C = A @ B.conj()
+    D = Y_bus.conj().T @ diag_V
+    E = diag_V.conj() @ (D @ sp.diags(lam) - sp.diags(D @ lam))
+    F = C - A @ sp.diags(np.conj(I))
+    G = sp.diags(1 / np.abs(V))
+
+    G_aa = E + F
+    G_va = 1j * G @ (E - F)
+    G_av = G_va.T
+    G_vv = G @ (C + C.T) @ G
+    return G_aa, G_av, G_va, G_vv
+
+
+def ac_opf(Y_bus, P_load, Q_load, bus_types, gen_buses, cost, Pg_limits, Qg_limits,
+           V_limits=(0.9, 1.1), V_start=None, Pg_start=None, Qg_start=None, base_mva=100.0,
+           max_iter=100, tol=1e-6, verbose=True, reporter=None):
+    """
+    Solves the AC optimal power flow.
+
+    Parameters:
+    -----------
+    Y_bus : complex array or scipy.sparse matrix
+        Bus admittance matrix
+    P_load, Q_load : array
+        Bus demand (pu, positive = consumption)
+    bus_types : array
+        The slack bus (type 0) is the angle reference; PV/PQ types are
+        otherwise ignored (all magnitudes are optimized within V_limits)
+    gen_buses : int array
+        Bus of each generator (0-based)
+    cost : array (generators x 3)
+        Quadratic cost coefficients c2, c1, c0 (Pg in MW)
+    Pg_limits, Qg_limits : arrays (generators x 2)
+        Output limits (pu)
+    V_limits : tuple or (n x 2) array
+        Voltage magnitude limits (pu)
+    V_start : complex array, optional
+        Start voltages, normally a solved load flow (default: flat start)
+    Pg_start, Qg_start : array, optional
+        Start outputs (default: the injections implied by V_start,
+        shared equally by the generators of a bus)
+    base_mva : float
+        System MVA base
+    max_iter, tol : int, float
+        Iteration limit and tolerance of the KKT conditions
+
+    Returns:
+    --------
+    result : dict
+        'V', 'Pg', 'Qg' (pu), 'cost' ($/h), 'lmp' ($/MWh per bus),
+        'converged', 'iterations', 'time' (s) and 'iteration_data'
+        (dicts with iteration, cost, feasibility, gradient,
+        complementarity, gamma and step)
+    """
+    import scipy.sparse as sp
+    import scipy.sparse.linalg
+
+    Y_bus = sp.csr_matrix(Y_bus)
+    num_buses = Y_bus.shape[0]
+    num_gens = len(gen_buses)
+    P_load = np.asarray(P_load, dtype=float)
+    Q_load = np.asarray(Q_load, dtype=float)
+    gen_buses = np.asarray(gen_buses)
+    cost = np.asarray(cost, dtype=float)
+    Pg_limits = np.asarray(Pg_limits, dtype=float)
+    Qg_limits = np.asarray(Qg_limits, dtype=float)
+    V_limits = np.broadcast_to(np.asarray(V_limits, dtype=float), (num_buses, 2))
+    report = get_reporter(reporter, verbose)
+    start_time = time.time()
+
+    # Variable layout: [va (non-reference), vm, Pg, Qg]
+    reference_bus = np.where(np.asarray(bus_types) == 0)[0][0]
+    angle_buses = np.delete(np.arange(num_buses), reference_bus)
+    n_va = len(angle_buses)
+    vm_slice = slice(n_va, n_va + num_buses)
+    pg_slice = slice(n_va + num_buses, n_va + num_buses + num_gens)
+    qg_slice = slice(n_va + num_buses + num_gens, n_va + num_buses + 2 * num_gens)
+    num_vars = n_va + num_buses + 2 * num_gens
+    voltage_vars = np.concatenate((angle_buses, num_buses + np.arange(num_buses)))
+
+    # Generator-to-bus incidence
+    C_g = sp.csr_matrix((np.ones(num_gens), (gen_buses, np.arange(num_gens))),
+                        shape=(num_buses, num_gens))
+
+    # Bounds (angles are free); h = [x - ub (upper), lb - x (lower)] <= 0
+    lb = np.concatenate((np.full(n_va, -np.inf), V_limits[:, 0], Pg_limits[:, 0], Qg_limits[:, 0]))
+    ub = np.concatenate((np.full(n_va, np.inf), V_limits[:, 1], Pg_limits[:, 1], Qg_limits[:, 1]))
+    upper = np.where(np.isfinite(ub))[0]
+    lower = np.where(np.isfinite(lb))[0]
+    num_upper = len(upper)
+    num_bounds = num_upper + len(lower)
+
+    def bound_residuals(x):
+        return np.concatenate((x[upper] - ub[upper], lb[lower] - x[lower]))
+
+    def bound_transpose(v):
+        """dh' v for a vector over the bounds."""
+        out = np.zeros(num_vars)
+        np.add.at(out, upper, v[:num_upper])
+        np.subtract.at(out, lower, v[num_upper:])
+        return out
+
+    def bound_diagonal(w):
+        """Diagonal of dh' diag(w) dh."""
+        out = np.zeros(num_vars)
+        np.add.at(out, upper, w[:num_upper])
+        np.add.at(out, lower, w[num_upper:])
+        return out
+
+    def bound_product(dx):
+        """dh dx."""
+        return np.concatenate((dx[upper], -dx[lower]))
+
+    # Cost (scaled) with Pg in pu
+    c2 = cost[:, 0] * base_mva**2 * COST_SCALE
+    c1 = cost[:, 1] * base_mva * COST_SCALE
+    c0 = cost[:, 2] * COST_SCALE
+    cost_hessian = sp.diags(np.concatenate((np.zeros(n_va + num_buses), 2 * c2,
+                                            np.zeros(num_gens))))
+
+    def unpack(x):
+        va = np.zeros(num_buses)
+        va[angle_buses] = x[:n_va]
+        return x[vm_slice] * np.exp(1j * va), x[pg_slice], x[qg_slice]
+
+    def evaluate(x):
+        """Cost, its gradient, power balance residuals and their Jacobian."""
+        V, Pg, Qg = unpack(x)
+        f = np.sum(c2 * Pg**2 + c1 * Pg + c0)
+        df = np.zeros(num_vars)
+        df[pg_slice] = 2 * c2 * Pg + c1
+        S, dS_dva, dS_dvm = power_injection_derivatives(Y_bus, V)
+        g = np.concatenate((S.real + P_load - C_g @ Pg, S.imag + Q_load - C_g @ Qg))
+        dS_dva = dS_dva[:, angle_buses]
+        dg = sp.bmat([[dS_dva.real, dS_dvm.real, -C_g, None],
+                      [dS_dva.imag, dS_dvm.imag, None, -C_g]], format='csr')
+        return f, df, g, dg, V
+
+    # Start point: warm start from the load flow voltages
+    V0 = (np.ones(num_buses, dtype=complex) if V_start is None
+          else np.asarray(V_start, dtype=complex))
+    if Pg_start is None or Qg_start is None:
+        S0 = V0 * np.conj(Y_bus @ V0)
+        per_bus = np.bincount(gen_buses, minlength=num_buses)[gen_buses]
+        Pg_start = (S0.real + P_load)[gen_buses] / per_bus if Pg_start is None else Pg_start
+        Qg_start = (S0.imag + Q_load)[gen_buses] / per_bus if Qg_start is None else Qg_start
+    x = np.concatenate((np.angle(V0)[angle_buses] - np.angle(V0)[reference_bus], np.abs(V0),
+                        Pg_start, Qg_start))
+    # Strictly inside the bounds (1% of the range or 1e-4 from each bound)
+    margin = np.minimum(0.01 * (ub - lb), 1e-4)
+    finite = np.isfinite(margin)
+    x[finite] = np.clip(x[finite], lb[finite] + margin[finite], ub[finite] - margin[finite])
+
+    f, df, g, dg, V = evaluate(x)
+    h = bound_residuals(x)
+    z = np.maximum(-h, 1.0)
+    mu = 1.0 / z
+    lam = np.zeros(2 * num_buses)
+    gamma = 1.0
+
+    report.emit(INFO, 'opf_start', num_buses=num_buses, num_gens=num_gens,
+                num_vars=num_vars, tol=tol)
+
+    iteration_data = []
+    converged = False
+    for iteration in range(max_iter + 1):
+        Lx = df + dg.T @ lam + bound_transpose(mu)
+        feasibility = (max(np.max(np.abs(g)), np.max(h, initial=0.0)) /
+                       (1 + max(np.max(np.abs(x)), np.max(z, initial=0.0))))
+        gradient = np.max(np.abs(Lx)) / (1 + max(np.max(np.abs(lam)), np.max(mu, initial=0.0)))
+        complementarity = (z @ mu) / (1 + np.max(np.abs(x)))
+        step = iteration_data[-1]['step'] if iteration_data else 0.0
+        iteration_data.append({'iteration': iteration, 'cost': f / COST_SCALE,
+                               'feasibility': feasibility, 'gradient': gradient,
+                               'complementarity': complementarity, 'gamma': gamma,
+                               'step': step})
+        report.emit(DEBUG, 'opf_iteration', **iteration_data[-1])
+        if feasibility < tol and gradient < tol and complementarity < tol:
+            converged = True
+            break
+        if iteration == max_iter:
+            break
+
+        # Hessian of the Lagrangian (cost + multiplier-weighted power balance)
+        # (Re G(lam_P) + Im G(lam_Q) = Re G(lam_P - j lam_Q): G is linear in lam)
+        G_aa, G_av, G_va, G_vv = power_injection_hessians(
+            Y_bus, V, lam[:num_buses] - 1j * lam[num_buses:])
+        H_V = sp.bmat([[G_aa.real, G_av.real], [G_va.real, G_vv.real]], format='csr')
+        H_V = H_V[voltage_vars][:, voltage_vars]
+        Lxx = sp.block_diag((H_V, sp.csr_matrix((2 * num_gens, 2 * num_gens)))) + cost_hessian
+
+        # Newton step on the perturbed KKT conditions
+        M = Lxx + sp.diags(bound_diagonal(mu / z))
+        N = Lx + bound_transpose((mu * h + gamma) / z)
+        kkt = sp.bmat([[M, dg.T], [dg, None]], format='csc')
+        solution = scipy.sparse.linalg.splu(kkt).solve(np.concatenate((-N, -g)))
+        dx, dlam = solution[:num_vars], solution[num_vars:]
+        dz = -h - z - bound_product(dx)
+        dmu = -mu + (gamma - mu * dz) / z
+
+        # Step lengths keeping z and mu positive
+        alpha_p = min(STEP_FRACTION * np.min(-z[dz < 0] / dz[dz < 0], initial=np.inf), 1.0)
+        alpha_d = min(STEP_FRACTION * np.min(-mu[dmu < 0] / dmu[dmu < 0], initial=np.inf), 1.0)
+        x = x + alpha_p * dx
+        z = z + alpha_p * dz
+        lam = lam + alpha_d * dlam
+        mu = mu + alpha_d * dmu
+        gamma = CENTERING * (z @ mu) / num_bounds
+        iteration_data[-1]['step'] = alpha_p
+
+        f, df, g, dg, V = evaluate(x)
+        h = bound_residuals(x)
+
+    V, Pg, Qg = unpack(x)
+    elapsed = time.time() - start_time
+    if converged:
+        report.emit(INFO, 'opf_converged', iterations=iteration, cost=f / COST_SCALE,
+                    elapsed=elapsed)
+    else:
+        report.emit(WARNING, 'opf_not_converged', max_iter=max_iter,
+                    feasibility=feasibility, gradient=gradient)
+    report.flush()
+
+    return {'V': V, 'Pg': Pg, 'Qg': Qg, 'cost': f / COST_SCALE,
+            'lmp': lam[:num_buses] / (COST_SCALE * base_mva),
+            'converged': converged, 'iterations': iteration, 'time': elapsed,
+            'iteration_data': iteration_data}
+
+
+register_format('opf_start', lambda f: [
+    f"AC OPF (interior point): {f['num_buses']} buses, {f['num_gens']} generators, "
+    f"{f['num_vars']} variables, tolerance {f['tol']}"])
+register_format('opf_iteration', lambda f: [
+    f"  it {f['iteration']:3d}: cost {f['cost']:14.4f} $/h  feas {f['feasibility']:.2e}  "
+    f"grad {f['gradient']:.2e}  comp {f['complementarity']:.2e}  step {f['step']:.3f}"])
+register_format('opf_converged', lambda f: [
+    f"OPF converged in {f['iterations']} iterations ({f['elapsed']:.3f} s): "
+    f"cost {f['cost']:.2f} $/h"])
+register_format('opf_not_converged', lambda f: [
+    f"WARNING: OPF did not converge within {f['max_iter']} iterations "
+    f"(feasibility {f['feasibility']:.2e}, gradient {f['gradient']:.2e})"])
+
+
+# ==========================================
+# MAIN EXECUTION
+# ==========================================
+
+if __name__ == "__main__":
+    from methods.admittance import AdmittanceMatrix
+    from methods.current_injection import newton_raphson_current_injection
+    from methods.newton_raphson import get_ieee_9_bus_data, build_y_bus, newton_raphson
+    from synthetic_grid import generate_synthetic_grid
+
+    # IEEE 9-bus: fixed dispatch of the load flow vs. optimal dispatch
+    num_buses, bus_types, P_spec, Q_spec, V_init, branch_data = get_ieee_9_bus_data()
+    Y_bus = build_y_bus(num_buses, branch_data)
+    gen_buses, cost, Pg_limits, Qg_limits, V_limits = get_ieee_9_bus_opf_data()
+    P_load, Q_load = -np.minimum(P_spec, 0), -np.minimum(Q_spec, 0)
+
+    V_lf, P_calc, _, _ = newton_raphson(Y_bus, P_spec, Q_spec, V_init, bus_types, verbose=False)
+    Pg_lf = (P_calc + P_load)[gen_buses] * 100
+    cost_lf = np.sum(cost[:, 0] * Pg_lf**2 + cost[:, 1] * Pg_lf + cost[:, 2])
+
+    result = ac_opf(Y_bus, P_load, Q_load, bus_types, gen_buses, cost, Pg_limits, Qg_limits,
+                    V_limits, V_start=V_lf, verbose=False)
+    print("IEEE 9-BUS ECONOMIC DISPATCH (AC OPF)")
+    print(f"Load flow dispatch:  Pg = {np.round(Pg_lf, 2)} MW, cost {cost_lf:.2f} $/h")
+    print(f"Optimal dispatch:    Pg = {np.round(result['Pg'] * 100, 2)} MW, "
+          f"cost {result['cost']:.2f} $/h ({result['iterations']} iterations, "
+          f"{result['time'] * 1000:.1f} ms)")
+    print(f"|V| = {np.round(np.abs(result['V']), 4)}")
+    print(f"LMP = {np.round(result['lmp'], 2)} $/MWh")
+
+    # Synthetic grids, warm-started from their load flow
+    rng = np.random.default_rng(0)
+    for size in (1008, 10008):
+        num_buses, bus_types, P_spec, Q_spec, V_init, branch_data = generate_synthetic_grid(size)
+        Y_bus = AdmittanceMatrix(num_buses, branch_data, sparse=True).Y
+        gen_buses = np.where(bus_types != 1)[0]
+        P_load, Q_load = -np.minimum(P_spec, 0), -np.minimum(Q_spec, 0)
+        cost = np.column_stack((rng.uniform(0.08, 0.13, len(gen_buses)),
+                                rng.uniform(1.0, 5.0, len(gen_buses)),
+                                rng.uniform(150, 600, len(gen_buses))))
+        Pg_max = 2 * np.maximum(P_spec[gen_buses], 0.5)
+        Pg_limits = np.column_stack((0.1 * np.ones(len(gen_buses)), Pg_max))
+        Qg_limits = np.column_stack((-Pg_max, Pg_max))
+
+        V_lf = newton_raphson_current_injection(Y_bus, P_spec, Q_spec, V_init, bus_types,
+                                                tol=1e-6, verbose=False)[0]
+        result = ac_opf(Y_bus, P_load, Q_load, bus_types, gen_buses, cost, Pg_limits,
+                        Qg_limits, V_start=V_lf, verbose=False)
+        print(f"{num_buses} buses, {len(gen_buses)} generators: "
+              f"{'converged' if result['converged'] else 'NOT converged'} in "
+              f"{result['iterations']} iterations, {result['time']:.2f} s, "
+              f"cost {result['cost']:.0f} $/h")
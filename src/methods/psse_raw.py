@@ -0,0 +1,259 @@
+"""
+PSS/E RAW Case Reader
+=====================
+Reads a PSS/E version 32 RAW file (such as data/Ieee_9_bus.raw) into the
+data format used by the load flow programs.
+
+Supported records: bus, load, fixed shunt, generator, non-transformer
+branch and two-winding transformer data. Later sections (areas, DC lines,
+switched shunts, ...) are skipped.
+
+Transformers keep their winding ratio and phase angle: they are returned as
+7-tuple branches (from_bus, to_bus, R, X, B, tap_ratio, shift_deg) with the
+tap on the winding 1 (from) side, which build_y_bus() and
+calculate_line_flows() model as an off-nominal tap / phase shifter.
+
+Author: [E/21/291]
+Date: January 2026
+"""
+
+import csv
+import os
+import sys
+import warnings
+
+if __package__ in (None, ''):  # run as a script: python src/methods/psse_raw.py
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+# Record sections of a version 32 RAW file, in file order
+SECTIONS = ['bus', 'load', 'fixed_shunt', 'generator', 'branch', 'transformer']
+
+
+def _fields(line):
+    """Splits one RAW record into fields (quoted names, '/' comments)."""
+    # Drop the trailing comment, ignoring '/' inside quoted strings
+    in_quote = False
+    for pos, char in enumerate(line):
+        if char == "'":
+            in_quote = not in_quote
+        elif char == '/' and not in_quote:
+            line = line[:pos]
+            break
+    fields = next(csv.reader([line], quotechar="'", skipinitialspace=True), [])
+    return [field.strip() for field in fields]
+
+
+def _read_sections(lines):
+    """Groups the data records of the file by section."""
+    sections = {name: [] for name in SECTIONS}
+    section = 0
+    n = 0
+    while n < len(lines) and section < len(SECTIONS):
+        fields = _fields(lines[n])
+        if not fields or fields[0] in ('0', 'Q'):
+            section += 1
+            n += 1
+            continue
+
+        name = SECTIONS[section]
+        if name == 'transformer':
+            # Two-winding transformers take 4 lines, three-winding ones 5
+            if int(fields[2]) != 0:
+                raise ValueError(f"Three-winding transformer {fields[0]}-{fields[1]}-"
+                                 f"{fields[2]} is not supported")
+            sections[name].append([fields] + [_fields(lines[n + k]) for k in (1, 2, 3)])
+            n += 4
+        else:
+            sections[name].append(fields)
+            n += 1
+    return sections
+
+
+def read_raw_case(path):
+    """
+    Reads a PSS/E v32 RAW file.
+
+    Parameters:
+    -----------
+    path : str
+        Path of the .raw file
+
+    Returns:
+    --------
+    case : dict
+        'base_mva' : system MVA base
+        'bus_numbers' : int array of the PSS/E bus numbers; bus k (1-based)
+            in branch_data is bus_numbers[k-1]
+        'bus_types' : array (0=Slack, 1=PQ, 2=PV)
+        'base_kv' : bus base voltages (kV)
+        'V_solved' : complex array of the solved voltages stored in the file
+        'P_load', 'Q_load' : bus loads (pu)
+        'bus_shunt' : complex array of fixed shunt admittances G + jB (pu)
+        'generators' : list of dicts with 'bus' (1-based), 'P', 'Q', 'Q_max',
+            'Q_min', 'V_set' (pu), 'mbase' (MVA), 'R_source', 'X_source'
+            (pu on mbase, X_source is the subtransient reactance)
+        'branch_data' : list of branch tuples (transformers as 7-tuples)
+        'transformers' : list of dicts with 'branch' (index into
+            branch_data), 'control_bus' (1-based, 0 = none), 'mode' (PSS/E
+            COD1), 'tap_max', 'tap_min', 'v_max', 'v_min', 'steps'
+    """
+    with open(path) as f:
+        lines = f.read().splitlines()
+
+    header = _fields(lines[0])
+    base_mva = float(header[1])
+    sections = _read_sections(lines[3:])
+
+    # Buses: map PSS/E numbers onto consecutive 1-based indices
+    buses = sections['bus']
+    bus_numbers = np.array([int(rec[0]) for rec in buses])
+    index = {number: k + 1 for k, number in enumerate(bus_numbers)}
+    num_buses = len(buses)
+
+    ide = np.array([int(rec[3]) for rec in buses])
+    bus_types = np.select([ide == 3, ide == 2], [0, 2], default=1)
+    base_kv = np.array([float(rec[2]) for rec in buses])
+    V_solved = np.array([float(rec[7]) * np.exp(1j * np.radians(float(rec[8])))
+                         for rec in buses])
+
+    P_load = np.zeros(num_buses)
+    Q_load = np.zeros(num_buses)
+    for rec in sections['load']:
+        if int(rec[2]) == 1:
+            k = index[int(rec[0])] - 1
+            P_load[k] += float(rec[5]) / base_mva
+            Q_load[k] += float(rec[6]) / base_mva
+
+    bus_shunt = np.zeros(num_buses, dtype=complex)
+    for rec in sections['fixed_shunt']:
+        if int(rec[2]) == 1:
+            bus_shunt[index[int(rec[0])] - 1] += complex(float(rec[3]), float(rec[4])) / base_mva
+
+    generators = []
+    for rec in sections['generator']:
+        if int(rec[14]) != 1:
+            continue
+        generators.append({
+            'bus': index[int(rec[0])],
+            'P': float(rec[2]) / base_mva,
+            'Q': float(rec[3]) / base_mva,
+            'Q_max': float(rec[4]) / base_mva,
+            'Q_min': float(rec[5]) / base_mva,
+            'V_set': float(rec[6]),
+            'mbase': float(rec[8]),
+            'R_source': float(rec[9]),
+            'X_source': float(rec[10]),
+        })
+
+    branch_data = []
+    for rec in sections['branch']:
+        if int(rec[13]) == 1:
+            branch_data.append((index[int(rec[0])], index[int(rec[1])],
+                                float(rec[3]), float(rec[4]), float(rec[5])))
+
+    transformers = []
+    for rec1, rec2, rec3, rec4 in sections['transformer']:
+        if int(rec1[11]) == 0:
+            continue
+        f, t = index[int(rec1[0])], index[int(rec1[1])]
+        cw, cz = int(rec1[4]), int(rec1[5])
+
+        # Series impedance on the system base
+        r, x = float(rec2[0]), float(rec2[1])
+        if cz == 2:
+            r, x = r * base_mva / float(rec2[2]), x * base_mva / float(rec2[2])
+        elif cz != 1:
+            raise ValueError(f"Transformer {rec1[0]}-{rec1[1]}: impedance code CZ={cz} "
+                             f"is not supported")
+
+        # Off-nominal ratio t = WINDV1 / WINDV2 in pu of the bus base voltages
+        windv1, windv2 = float(rec3[0]), float(rec4[0])
+        if cw == 2:
+            windv1 /= base_kv[f - 1]
+            windv2 /= base_kv[t - 1]
+        elif cw == 3:
+            windv1 *= (float(rec3[1]) or base_kv[f - 1]) / base_kv[f - 1]
+            windv2 *= (float(rec4[1]) or base_kv[t - 1]) / base_kv[t - 1]
+
+        if float(rec1[7]) != 0 or float(rec1[8]) != 0:
+            warnings.warn(f"Transformer {rec1[0]}-{rec1[1]}: magnetizing admittance ignored")
+
+        transformers.append({
+            'branch': len(branch_data),
+            'control_bus': index.get(abs(int(rec3[7])), 0),
+            'mode': int(rec3[6]),
+            'tap_max': float(rec3[8]),
+            'tap_min': float(rec3[9]),
+            'v_max': float(rec3[10]),
+            'v_min': float(rec3[11]),
+            'steps': int(rec3[12]),
+        })
+        branch_data.append((f, t, r, x, 0.0, windv1 / windv2, float(rec3[2])))
+
+    return {
+        'base_mva': base_mva,
+        'bus_numbers': bus_numbers,
+        'bus_types': bus_types,
+        'base_kv': base_kv,
+        'V_solved': V_solved,
+        'P_load': P_load,
+        'Q_load': Q_load,
+        'bus_shunt': bus_shunt,
+        'generators': generators,
+        'branch_data': branch_data,
+        'transformers': transformers,
+    }
+
+
+def raw_to_load_flow_data(case):
+    """
+    Converts a case from read_raw_case() into the load flow data tuple.
+
+    Returns:
+    --------
+    Same as get_ieee_9_bus_data(): num_buses, bus_types, P_specified,
+    Q_specified, V_init (flat start with generator set points), branch_data
+    """
+    num_buses = len(case['bus_numbers'])
+    bus_types = case['bus_types'].copy()
+    P_specified = -case['P_load'].copy()
+    Q_specified = -case['Q_load'].copy()
+    V_init = np.ones(num_buses, dtype=complex)
+
+    for gen in case['generators']:
+        k = gen['bus'] - 1
+        P_specified[k] += gen['P']
+        Q_specified[k] += gen['Q']
+        if bus_types[k] != 1:
+            V_init[k] = gen['V_set']
+
+    if np.any(case['bus_shunt'] != 0):
+        warnings.warn("Fixed shunts are not part of the load flow data and are ignored")
+
+    return num_buses, bus_types, P_specified, Q_specified, V_init, list(case['branch_data'])
+
+
+# ==========================================
+# MAIN EXECUTION
+# ==========================================
+
+if __name__ == "__main__":
+    from methods.newton_raphson import build_y_bus, newton_raphson
+
+    raw_path = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'Ieee_9_bus.raw')
+    case = read_raw_case(raw_path)
+    num_buses, bus_types, P_spec, Q_spec, V_init, branch_data = raw_to_load_flow_data(case)
+
+    print(f"Read {num_buses} buses, {len(branch_data)} branches "
+          f"({len(case['transformers'])} transformers)")
+    for branch in branch_data:
+        print(f"  {branch}")
+
+    Y_bus = build_y_bus(num_buses, branch_data)
+    V, P_calc, Q_calc, iter_data = newton_raphson(Y_bus, P_spec, Q_spec, V_init,
+                                                  bus_types, verbose=False)
+    error = np.max(np.abs(V - case['V_solved']))
+    print(f"Converged in {len(iter_data)} iterations, "
+          f"max |V - V_PSSE| = {error:.2e} pu")
@@ -0,0 +1,197 @@
+"""
+Solver Reporting Layer
+======================
+Solvers report progress as structured events instead of printing:
+
+    report.emit(DEBUG, 'nr_iteration', iteration=2, max_mismatch=..., V=V)
+
+An event is only handed to the sinks whose level admits it, and only a
+sink turns it into text. Hot loops guard their events with
+report.enabled(level), so with a quiet reporter an iteration costs one
+integer comparison - no string formatting, no I/O.
+
+Sinks:
+- TextSink: human-readable text, buffered and written in blocks. The text
+  of every event comes from a formatter registered with register_format()
+  by the module that emits the event.
+- JsonLinesSink: one JSON object per event (arrays as lists, complex
+  values as [re, im] pairs), buffered the same way
+- NullSink: discards everything
+
+Levels are the standard logging levels (DEBUG, INFO, WARNING).
+
+Author: [E/21/291]
+Date: January 2026
+"""
+
+import json
+import sys
+
+import numpy as np
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+
+# Level above every event: a sink at this level receives nothing
+SILENT = 100
+
+# Event name -> function(fields) returning the text lines of the event
+_formatters = {}
+
+
+def register_format(event, formatter):
+    """
+    Registers the text formatter of an event.
+
+    Parameters:
+    -----------
+    event : str
+        Event name
+    formatter : callable
+        formatter(fields) -> list of str (one entry per output line)
+    """
+    _formatters[event] = formatter
+
+
+def format_event(event, fields):
+    """Returns the text lines of an event (generic key=value if unregistered)."""
+    formatter = _formatters.get(event)
+    if formatter is not None:
+        return formatter(fields)
+    return [f"{event}: " + ", ".join(f"{k}={v}" for k, v in fields.items())]
+
+
+class NullSink:
+    """Sink discarding every event."""
+
+    level = SILENT
+
+    def handle(self, level, event, fields):
+        pass
+
+    def flush(self):
+        pass
+
+
+class _BufferedSink:
+    """Common buffering of the text-producing sinks."""
+
+    def __init__(self, stream=None, level=INFO, buffer_lines=1000):
+        # stream=None writes to the sys.stdout current at flush time (so
+        # redirected output, e.g. in the pipeline workers, is honoured)
+        self.stream = stream
+        self.level = level
+        self.buffer_lines = buffer_lines
+        self._buffer = []
+
+    def _append(self, lines):
+        self._buffer.extend(lines)
+        if len(self._buffer) >= self.buffer_lines:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write("\n".join(self._buffer) + "\n")
+        self._buffer.clear()
+
+    def getvalue(self):
+        """Returns the buffered (not yet written) text."""
+        return "\n".join(self._buffer)
+
+
+class TextSink(_BufferedSink):
+    """Sink writing human-readable text in blocks of buffer_lines lines."""
+
+    def handle(self, level, event, fields):
+        self._append(format_event(event, fields))
+
+
+def _jsonable(value):
+    """Converts numpy arrays and scalars to JSON-serializable values."""
+    if isinstance(value, np.ndarray):
+        if np.iscomplexobj(value):
+            return np.stack((value.real, value.imag), axis=-1).tolist()
+        return value.tolist()
+    if isinstance(value, (complex, np.complexfloating)):
+        return [value.real, value.imag]
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+class JsonLinesSink(_BufferedSink):
+    """Sink writing one JSON object per event ({'event', 'level', **fields})."""
+
+    def __init__(self, stream=None, level=DEBUG, buffer_lines=1000):
+        super().__init__(stream, level, buffer_lines)
+
+    def handle(self, level, event, fields):
+        record = {'event': event, 'level': level}
+        record.update(_jsonable(fields))
+        self._append([json.dumps(record)])
+
+
+class Reporter:
+    """
+    Dispatches solver events to a set of sinks.
+
+    Parameters:
+    -----------
+    *sinks : sink objects
+        Each with a 'level' attribute and handle(level, event, fields)
+        and flush() methods
+    """
+
+    def __init__(self, *sinks):
+        self.sinks = list(sinks)
+        self.level = min((sink.level for sink in self.sinks), default=SILENT)
+
+    def enabled(self, level):
+        """True if at least one sink receives events of this level."""
+        return level >= self.level
+
+    def emit(self, level, event, **fields):
+        """
+        Hands an event to every sink whose level admits it.
+
+        Array fields may be solver work buffers that change after the
+        call, so sinks format or copy them in handle().
+        """
+        if level < self.level:
+            return
+        for sink in self.sinks:
+            if level >= sink.level:
+                sink.handle(level, event, fields)
+
+    def flush(self):
+        """Writes out everything the sinks have buffered."""
+        for sink in self.sinks:
+            sink.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+
+NULL_REPORTER = Reporter()
+
+
+def get_reporter(reporter=None, verbose=False):
+    """
+    Returns the reporter a solver should use.
+
+    An explicit reporter wins. Otherwise the solver reports to stdout as
+    text: everything down to DEBUG if verbose, warnings only if not.
+    """
+    if reporter is not None:
+        return reporter
+    return Reporter(TextSink(level=DEBUG if verbose else WARNING))
@@ -0,0 +1,173 @@
+"""
+Automatic On-Load Tap Changer (OLTC) Control
+============================================
+Outer control loop around the Newton-Raphson load flow that moves
+transformer taps until each regulated bus voltage lies inside its band.
+
+Outer loop:
+1. Solve the load flow (warm-started from the previous solution)
+2. For every controlled transformer whose bus voltage is outside
+   [v_min, v_max], move the tap by whole steps towards mid-band
+3. Stop when no tap moves (all voltages in band or taps at their limits)
+
+Tap moves go through AdmittanceMatrix.set_tap(), so only the four Y-bus
+entries of the moved transformer are updated - the Y-bus is never rebuilt.
+
+Author: [E/21/291]
+Date: January 2026
+"""
+
+import os
+import sys
+
+if __package__ in (None, ''):  # run as a script: python src/methods/tap_control.py
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from methods.newton_raphson import newton_raphson
+from methods.reporting import DEBUG, get_reporter, register_format
+
+
+def voltage_controls(case):
+    """
+    Returns the voltage-controlling transformers of a RAW case.
+
+    Parameters:
+    -----------
+    case : dict
+        Case from psse_raw.read_raw_case()
+
+    Returns:
+    --------
+    controls : list of dicts (see regulate_taps())
+    """
+    return [dict(trafo) for trafo in case['transformers']
+            if trafo['mode'] == 1 and trafo['control_bus'] > 0]
+
+
+def _tap_move(Y, control, V_bus):
+    """
+    Returns the new tap ratio for one control, or None if the tap stays.
+
+    The tap is on the from side (V_to ~ V_from / a), so raising the ratio
+    lowers the voltage on the to side and raises it on the from side.
+    """
+    k = control['branch']
+    v_min, v_max = control['v_min'], control['v_max']
+    if v_min <= V_bus <= v_max:
+        return None
+
+    tap_min, tap_max = control['tap_min'], control['tap_max']
+    step = (tap_max - tap_min) / max(control['steps'] - 1, 1)
+    ratio = Y.tap_ratio[k]
+
+    # dV/V ~ -da/a for a bus on the to side: steps needed to reach mid-band
+    v_target = (v_min + v_max) / 2
+    sign = -1 if control['control_bus'] - 1 == Y.to_bus[k] else 1
+    n_steps = max(1, int(round(abs(v_target - V_bus) / V_bus * ratio / step)))
+    new_ratio = ratio + sign * np.sign(v_target - V_bus) * n_steps * step
+    new_ratio = min(max(new_ratio, tap_min), tap_max)
+
+    if np.isclose(new_ratio, ratio):
+        return None  # already at the limit
+    return new_ratio
+
+
+def regulate_taps(Y, P_specified, Q_specified, V_init, bus_types, controls,
+                  max_outer=20, max_iter=100, tol=1e-4, verbose=True, reporter=None):
+    """
+    Solves the load flow with automatic tap changer control.
+
+    Parameters:
+    -----------
+    Y : AdmittanceMatrix
+        Network (taps are moved in place)
+    P_specified, Q_specified : array
+        Specified bus injections (pu)
+    V_init : complex array
+        Initial voltage phasors
+    bus_types : array
+        Bus type codes (0=Slack, 1=PQ, 2=PV)
+    controls : list of dicts
+        One per OLTC: 'branch' (index in Y), 'control_bus' (1-based),
+        'v_min', 'v_max' (pu), 'tap_min', 'tap_max', 'steps' (number of
+        tap positions)
+    max_outer : int
+        Maximum number of tap adjustment rounds
+    max_iter, tol : int, float
+        Newton-Raphson settings of every inner solve
+    verbose : bool
+        Print the tap moves of every round
+    reporter : reporting.Reporter, optional
+        Receives the 'tap_move' events instead of stdout; overrides verbose
+
+    Returns:
+    --------
+    V, P_calc, Q_calc : final load flow solution
+    history : list of dicts
+        Per outer round: 'nr_iterations', 'taps' (ratios after the round)
+        and 'voltages' (controlled bus voltages before the moves)
+    """
+    report = get_reporter(reporter, verbose)
+    V = np.asarray(V_init, dtype=complex).copy()
+    history = []
+
+    for outer in range(max_outer):
+        V, P_calc, Q_calc, iter_data = newton_raphson(
+            Y.Y, P_specified, Q_specified, V, bus_types,
+            max_iter=max_iter, tol=tol, verbose=False
+        )
+
+        voltages = [float(np.abs(V[c['control_bus'] - 1])) for c in controls]
+        moves = [(c['branch'], _tap_move(Y, c, v)) for c, v in zip(controls, voltages)]
+        moves = [(k, ratio) for k, ratio in moves if ratio is not None]
+
+        for k, ratio in moves:
+            report.emit(DEBUG, 'tap_move', round=outer + 1,
+                        from_bus=Y.from_bus[k] + 1, to_bus=Y.to_bus[k] + 1,
+                        old_ratio=Y.tap_ratio[k], new_ratio=ratio)
+            Y.set_tap(k, ratio=ratio)
+
+        history.append({
+            'nr_iterations': len(iter_data),
+            'taps': [float(Y.tap_ratio[c['branch']]) for c in controls],
+            'voltages': voltages,
+        })
+        if not moves:
+            break
+
+    report.flush()
+    return V, P_calc, Q_calc, history
+
+
+register_format('tap_move', lambda f: [
+    f"  Round {f['round']}: tap of branch {f['from_bus']}-{f['to_bus']} "
+    f"{f['old_ratio']:.4f} -> {f['new_ratio']:.4f}"])
+
+
+# ==========================================
+# MAIN EXECUTION
+# ==========================================
+
+if __name__ == "__main__":
+    from methods.admittance import AdmittanceMatrix
+    from methods.newton_raphson import get_ieee_9_bus_data
+
+    num_buses, bus_types, P_spec, Q_spec, V_init, branch_data = get_ieee_9_bus_data()
+
+    # Make generator transformer 2-7 an OLTC holding bus 7 in [0.99, 1.01] pu
+    # (33 positions between 0.9 and 1.1, tap on the bus 7 side)
+    branch_data = [(7, 2, 0.0, 0.0625, 0.0, 1.0, 0.0) if br[:2] == (2, 7) else br
+                   for br in branch_data]
+    Y = AdmittanceMatrix(num_buses, branch_data)
+    controls = [{
+        'branch': Y.branch_index(7, 2), 'control_bus': 7,
+        'v_min': 0.99, 'v_max': 1.01,
+        'tap_min': 0.9, 'tap_max': 1.1, 'steps': 33,
+    }]
+
+    V, P_calc, Q_calc, history = regulate_taps(Y, P_spec, Q_spec, V_init,
+                                               bus_types, controls)
+    print(f"{len(history)} outer rounds, final tap {history[-1]['taps'][0]:.4f}, "
+          f"V7 = {np.abs(V[6]):.4f} pu")
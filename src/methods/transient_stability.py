@@ -0,0 +1,378 @@
+"""
+Transient Stability Simulation (Classical Machine Model)
+========================================================
+Time-domain simulation of the rotor swings after a three-phase fault,
+started from a converged load flow. Every generator is a constant EMF
+E' behind its reactance (classical model); loads are constant
+admittances fixed at their pre-fault voltage:
+
+    E'_g = V_g + (R_source + jX_source) I_g           (pre-fault)
+
+    dδ/dt = ω_s Δω,     2H dΔω/dt = Pm - Pe - D Δω,     Pe = Re(E' conj(I_g))
+
+Network solution: the augmented Y-bus (network + load admittances +
+generator admittances y_g) is factorized once (short_circuit.ShortCircuit)
+and reduced to the generator internal nodes through the Z-bus entries of
+the buses that matter - generator buses, faulted buses and the ends of
+tripped branches - obtained by sparse solves:
+
+    pre/post-fault:        I = Y_red E',  Y_red = diag(y_g) - diag(y_g) Z_GG diag(y_g)
+    fault at bus k (Z_f):  I = Y_red E' + y_g Z_Gk (Z_kG y_g . E') / (Z_kk + Z_f)
+    branch i-j tripped:    I = Y_red E' + y_g Z_G,ij W Z_ij,G y_g E',
+                           W = (1 + dY Z_ij,ij)^-1 dY,  dY = -(branch primitive)
+
+so faults are rank-one and branch trips rank-two corrections of one
+dense reduced matrix. The machine states of all generators AND of all
+cases (fault bus, clearing time, tripped branch) are integrated together
+as (generators x cases) arrays with the modified Euler method: one step
+of every case costs two products Y_red @ E' of (generators x cases)
+matrices. Cases leave the batch as soon as they lose synchronism.
+
+The generator reactance is the RAW file's X_source (on mbase). For the
+IEEE 9-bus case these are the transient reactances X'd of the machines
+(0.0608, 0.1198, 0.1813 pu); inertia constants are not in RAW files and
+are passed in.
+
+Author: [E/21/291]
+Date: January 2026
+"""
+
+import os
+import sys
+
+if __package__ in (None, ''):  # run as a script: python src/methods/transient_stability.py
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from methods.newton_raphson import branch_arrays, branch_primitives
+
+# A case is unstable once the rotor angle spread (max - min over the
+# generators) exceeds this limit
+ANGLE_LIMIT_DEG = 180.0
+
+# Inertia constants of the IEEE 9-bus machines (s, on 100 MVA), as in
+# Anderson & Fouad, "Power System Control and Stability"
+IEEE_9_BUS_INERTIA = np.array([23.64, 6.40, 3.01])
+
+
+class TransientStability:
+    """
+    Pre-fault operating point and factorized network of one system.
+
+    Parameters:
+    -----------
+    num_buses : int
+        Total number of buses
+    branch_data : list of tuples
+        As for build_y_bus()
+    generators : list of dicts
+        'bus' (1-based), 'R_source', 'X_source' (pu on 'mbase') and
+        'mbase' (MVA), as in read_raw_case()['generators']
+    V : complex array
+        Converged pre-fault load flow voltages
+    P_load, Q_load : array
+        Bus loads (pu), modelled as constant admittances
+    H : array
+        Inertia constant of each generator (s, on its mbase)
+    D : array, optional
+        Damping of each generator (pu power per pu speed, on its mbase)
+    base_mva : float
+        System MVA base
+    frequency : float
+        Nominal frequency (Hz)
+    bus_shunt : complex array, optional
+        Fixed shunt admittances not in branch_data (pu)
+
+    The pre-fault output of a bus's generators is the load flow injection
+    plus the bus's load and shunt consumption, shared in proportion to mbase.
+    """
+
+    def __init__(self, num_buses, branch_data, generators, V, P_load, Q_load, H, D=None,
+                 base_mva=100.0, frequency=60.0, bus_shunt=None):
+        from methods.admittance import AdmittanceMatrix
+        from methods.short_circuit import ShortCircuit
+
+        V = np.asarray(V, dtype=complex)
+        Y_bus = AdmittanceMatrix(num_buses, branch_data, sparse=True).Y
+        bus_shunt = (np.zeros(num_buses, dtype=complex) if bus_shunt is None
+                     else np.asarray(bus_shunt, dtype=complex))
+        S_load = np.asarray(P_load) + 1j * np.asarray(Q_load)
+        y_load = np.conj(S_load) / np.abs(V)**2
+
+        self.branch_data = branch_data
+        self.gen_bus = np.array([gen['bus'] - 1 for gen in generators])
+        mbase = np.array([gen['mbase'] for gen in generators], dtype=float)
+        z_source = np.array([complex(gen['R_source'], gen['X_source'])
+                             for gen in generators]) * base_mva / mbase
+        self.y_gen = 1 / z_source
+
+        # Generator outputs and internal EMFs at the operating point
+        S_bus = V * np.conj(Y_bus @ V) + S_load + np.abs(V)**2 * np.conj(bus_shunt)
+        share = mbase / np.bincount(self.gen_bus, weights=mbase, minlength=num_buses)[self.gen_bus]
+        S_gen = S_bus[self.gen_bus] * share
+        I_gen = np.conj(S_gen / V[self.gen_bus])
+        E = V[self.gen_bus] + z_source * I_gen
+        self.E_mag = np.abs(E)
+        self.delta0 = np.angle(E)
+        self.P_mech = np.real(E * np.conj(I_gen))
+
+        self.H = np.asarray(H, dtype=float) * mbase / base_mva
+        self.D = (np.zeros(len(generators)) if D is None
+                  else np.asarray(D, dtype=float) * mbase / base_mva)
+        self.omega_s = 2 * np.pi * frequency
+
+        self._sc = ShortCircuit(Y_bus, generators, base_mva, V_prefault=V,
+                                bus_shunt=y_load + bus_shunt)
+
+    # ------------------------------------------
+    # Reduced network
+    # ------------------------------------------
+
+    def _network(self, fault_bus, trip_branch, Z_f):
+        """
+        Reduced matrix and the per-case fault / trip correction factors.
+
+        fault_bus, trip_branch : int arrays (cases,), 0-based, -1 = none
+        """
+        f, t, r, x, b, tap_ratio, shift_deg = branch_arrays(self.branch_data)
+        trips = trip_branch[trip_branch >= 0]
+        buses = np.unique(np.concatenate((self.gen_bus, fault_bus[fault_bus >= 0],
+                                          f[trips], t[trips])))
+        position = {bus: k for k, bus in enumerate(buses)}
+        Z = self._sc.z_columns(buses)[buses]
+        gen_pos = np.array([position[bus] for bus in self.gen_bus])
+        y_g = self.y_gen
+
+        Z_GG = Z[np.ix_(gen_pos, gen_pos)]
+        Y_red = np.diag(y_g) - y_g[:, None] * Z_GG * y_g[None, :]
+
+        # Fault at bus k: I += a (b . E) with a = y_g Z_Gk / (Z_kk + Z_f), b = Z_kG y_g
+        num_cases = len(fault_bus)
+        num_gens = len(y_g)
+        fault_a = np.zeros((num_gens, num_cases), dtype=complex)
+        fault_b = np.zeros((num_gens, num_cases), dtype=complex)
+        for c in np.where(fault_bus >= 0)[0]:
+            k = position[fault_bus[c]]
+            fault_a[:, c] = y_g * Z[gen_pos, k] / (Z[k, k] + Z_f)
+            fault_b[:, c] = Z[k, gen_pos] * y_g
+
+        # Branch i-j tripped: I += A W B E (Woodbury update of Z)
+        trip_a = np.zeros((num_cases, num_gens, 2), dtype=complex)
+        trip_b = np.zeros((num_cases, 2, num_gens), dtype=complex)
+        Y_ff, Y_ft, Y_tf, Y_tt = branch_primitives(r, x, b, tap_ratio, shift_deg)
+        for c in np.where(trip_branch >= 0)[0]:
+            k = trip_branch[c]
+            ends = [position[f[k]], position[t[k]]]
+            dY = -np.array([[Y_ff[k], Y_ft[k]], [Y_tf[k], Y_tt[k]]])
+            W = np.linalg.solve(np.eye(2) + dY @ Z[np.ix_(ends, ends)], dY)
+            trip_a[c] = (y_g[:, None] * Z[np.ix_(gen_pos, ends)]) @ W
+            trip_b[c] = Z[np.ix_(ends, gen_pos)] * y_g[None, :]
+
+        return Y_red, fault_a, fault_b, trip_a, trip_b
+
+    # ------------------------------------------
+    # Simulation
+    # ------------------------------------------
+
+    def simulate(self, fault_bus, clear_time, trip_branch=None, Z_f=0.0, t_end=3.0, dt=0.005,
+                 record=False):
+        """
+        Simulates a batch of fault cases (fault applied at t = 0).
+
+        Parameters:
+        -----------
+        fault_bus : int array (cases,)
+            Faulted bus of each case (0-based)
+        clear_time : array (cases,)
+            Fault clearing time of each case (s); the fault is removed at
+            the first integration step at or after it
+        trip_branch : int array (cases,), optional
+            Branch (index into branch_data) tripped at clearing, -1 = none
+        Z_f : complex
+            Fault impedance (pu)
+        t_end, dt : float
+            Simulated time and integration step (s)
+        record : bool
+            Keep the rotor angle and speed trajectories
+
+        Returns:
+        --------
+        result : dict
+            'stable' (bool per case), 'unstable_time' (s, NaN if stable),
+            'max_spread' (largest rotor angle spread, degrees) and, with
+            record=True, 'time', 'delta' (steps x generators x cases,
+            degrees) and 'speed' (pu deviation)
+        """
+        fault_bus = np.atleast_1d(np.asarray(fault_bus))
+        clear_time = np.broadcast_to(np.asarray(clear_time, dtype=float), fault_bus.shape)
+        trip_branch = (np.full(fault_bus.shape, -1) if trip_branch is None
+                       else np.broadcast_to(np.asarray(trip_branch), fault_bus.shape))
+        network = self._network(fault_bus, trip_branch, Z_f)
+        return self._integrate(network, clear_time, trip_branch >= 0, t_end, dt, record)
+
+    def _integrate(self, network, clear_time, tripped, t_end, dt, record):
+        Y_red, fault_a, fault_b, trip_a, trip_b = network
+        num_gens, num_cases = fault_a.shape
+        num_steps = int(round(t_end / dt))
+        limit = np.radians(ANGLE_LIMIT_DEG)
+        H2 = 2 * self.H[:, None]
+        P_mech, D = self.P_mech[:, None], self.D[:, None]
+        E_mag = self.E_mag[:, None]
+
+        max_spread = np.zeros(num_cases)
+        unstable_time = np.full(num_cases, np.nan)
+        if record:
+            delta_out = np.full((num_steps + 1, num_gens, num_cases), np.nan)
+            speed_out = np.full((num_steps + 1, num_gens, num_cases), np.nan)
+            delta_out[0] = self.delta0[:, None]
+            speed_out[0] = 0.0
+
+        # Working arrays of the cases still in synchronism (compacted when
+        # cases drop out, not gathered every step)
+        active = np.arange(num_cases)
+        d = np.repeat(self.delta0[:, None], num_cases, axis=1)
+        w = np.zeros((num_gens, num_cases))
+        clear, trip = clear_time.copy(), tripped.copy()
+        fa, fb, ta, tb = fault_a, fault_b, trip_a, trip_b
+
+        def electrical_power(d, faulted, post_trip):
+            E = E_mag * np.exp(1j * d)
+            I = Y_red @ E
+            if faulted.any():
+                I[:, faulted] += fa[:, faulted] * np.sum(fb[:, faulted] * E[:, faulted], axis=0)
+            if post_trip.any():
+                I[:, post_trip] += np.einsum('cgi,cij,jc->gc', ta[post_trip], tb[post_trip],
+                                             E[:, post_trip], optimize=True)
+            return np.real(E * np.conj(I))
+
+        for step in range(num_steps):
+            t = step * dt
+            faulted = t < clear - 1e-9
+            post_trip = ~faulted & trip
+
+            # Modified Euler: predictor and corrector with the network of time t
+            P_e = electrical_power(d, faulted, post_trip)
+            d_dot = self.omega_s * w
+            w_dot = (P_mech - P_e - D * w) / H2
+            d_pred, w_pred = d + dt * d_dot, w + dt * w_dot
+            P_e = electrical_power(d_pred, faulted, post_trip)
+            d = d + 0.5 * dt * (d_dot + self.omega_s * w_pred)
+            w = w + 0.5 * dt * (w_dot + (P_mech - P_e - D * w_pred) / H2)
+            if record:
+                delta_out[step + 1][:, active] = d
+                speed_out[step + 1][:, active] = w
+
+            spread = d.max(axis=0) - d.min(axis=0)
+            max_spread[active] = np.maximum(max_spread[active], spread)
+            lost = spread > limit
+            if lost.any():
+                unstable_time[active[lost]] = t + dt
+                keep = ~lost
+                active, clear, trip = active[keep], clear[keep], trip[keep]
+                d, w = d[:, keep], w[:, keep]
+                fa, fb, ta, tb = fa[:, keep], fb[:, keep], ta[keep], tb[keep]
+                if len(active) == 0:
+                    break
+
+        result = {'stable': np.isnan(unstable_time), 'unstable_time': unstable_time,
+                  'max_spread': np.degrees(max_spread)}
+        if record:
+            result.update({'time': np.arange(num_steps + 1) * dt,
+                           'delta': np.degrees(delta_out), 'speed': speed_out})
+        return result
+
+    def critical_clearing_times(self, fault_bus, trip_branch=None, Z_f=0.0, t_max=1.0,
+                                tolerance=0.002, t_end=3.0, dt=0.005):
+        """
+        Critical clearing time of every fault by bisection, with all faults
+        simulated together in each bisection round.
+
+        Parameters:
+        -----------
+        fault_bus, trip_branch, Z_f :
+            Fault cases, as for simulate()
+        t_max : float
+            Longest clearing time considered (s)
+        tolerance : float
+            Width of the final bracket (s)
+
+        Returns:
+        --------
+        cct : array
+            Largest stable clearing time found per fault (s); t_max if the
+            fault is stable at t_max, 0 if it is unstable at any clearing time
+        """
+        fault_bus = np.atleast_1d(np.asarray(fault_bus))
+        trip_branch = (np.full(fault_bus.shape, -1) if trip_branch is None
+                       else np.broadcast_to(np.asarray(trip_branch), fault_bus.shape))
+        tripped = trip_branch >= 0
+        network = self._network(fault_bus, trip_branch, Z_f)
+
+        stable_at = np.zeros(len(fault_bus))
+        unstable_at = np.full(len(fault_bus), t_max)
+        at_max = self._integrate(network, unstable_at, tripped, t_end, dt, False)['stable']
+        stable_at[at_max] = t_max
+        while np.any(unstable_at - stable_at > tolerance):
+            mid = np.where(at_max, t_max, 0.5 * (stable_at + unstable_at))
+            stable = self._integrate(network, mid, tripped, t_end, dt, False)['stable']
+            stable_at = np.where(stable & ~at_max, mid, stable_at)
+            unstable_at = np.where(~stable & ~at_max, mid, unstable_at)
+        return stable_at
+
+
+# ==========================================
+# MAIN EXECUTION
+# ==========================================
+
+if __name__ == "__main__":
+    import time
+
+    from methods.psse_raw import read_raw_case
+    from synthetic_grid import generate_synthetic_grid
+    from methods.current_injection import newton_raphson_current_injection
+    from methods.admittance import AdmittanceMatrix
+
+    # IEEE 9-bus from the RAW file, pre-fault state = PSS/E solved voltages
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    case = read_raw_case(os.path.join(root_dir, 'data', 'Ieee_9_bus.raw'))
+    num_buses = len(case['bus_numbers'])
+    ts = TransientStability(num_buses, case['branch_data'], case['generators'],
+                            case['V_solved'], case['P_load'], case['Q_load'],
+                            H=IEEE_9_BUS_INERTIA, bus_shunt=case['bus_shunt'])
+
+    # Fault at bus 7 cleared by tripping line 5-7, at 5 cycles and at 20 cycles
+    line_5_7 = [k for k, br in enumerate(case['branch_data']) if set(br[:2]) == {5, 7}][0]
+    result = ts.simulate([6, 6], [5 / 60, 20 / 60], trip_branch=line_5_7, t_end=2.0,
+                         record=True)
+    print("IEEE 9-BUS: FAULT AT BUS 7, LINE 5-7 TRIPPED AT CLEARING")
+    for c, cycles in enumerate((5, 20)):
+        rel = result['delta'][:, 1:, c] - result['delta'][:, :1, c]
+        status = 'stable' if result['stable'][c] else 'UNSTABLE'
+        print(f"  cleared at {cycles:2d} cycles: {status}, "
+              f"max angle of gens 2/3 relative to gen 1: "
+              f"{np.nanmax(rel, axis=0).round(1)} deg")
+
+    cct = ts.critical_clearing_times(np.arange(num_buses))
+    print("  Critical clearing times (bus faults, no tripping): " +
+          ", ".join(f"bus {k + 1}: {t * 1000:.0f} ms" for k, t in enumerate(cct)))
+
+    # Synthetic grid: CCT of faults at 100 buses (generators: X'd = 0.2 pu, H = 5 s)
+    num_buses, bus_types, P_spec, Q_spec, V_init, branch_data = generate_synthetic_grid(1008)
+    Y_bus = AdmittanceMatrix(num_buses, branch_data, sparse=True).Y
+    V = newton_raphson_current_injection(Y_bus, P_spec, Q_spec, V_init, bus_types,
+                                         tol=1e-8, verbose=False)[0]
+    gen_buses = np.where(bus_types != 1)[0]
+    generators = [{'bus': k + 1, 'R_source': 0.0, 'X_source': 0.2, 'mbase': 100.0}
+                  for k in gen_buses]
+    P_load, Q_load = -np.minimum(P_spec, 0), -np.minimum(Q_spec, 0)
+    ts = TransientStability(num_buses, branch_data, generators, V, P_load, Q_load,
+                            H=np.full(len(generators), 5.0))
+    fault_buses = np.arange(0, num_buses, 10)
+    start_time = time.time()
+    cct = ts.critical_clearing_times(fault_buses, t_max=0.5, t_end=2.0)
+    elapsed = time.time() - start_time
+    rounds = int(np.ceil(np.log2(0.5 / 0.002))) + 1
+    print(f"{num_buses} buses, {len(generators)} generators: CCT of {len(fault_buses)} faults "
+          f"({rounds * len(fault_buses)} simulations) in {elapsed:.1f} s, "
+          f"CCT {cct.min() * 1000:.0f}-{cct.max() * 1000:.0f} ms")
@@ -0,0 +1,230 @@
+"""
+Y-bus Build Cache
+=================
+Process-wide cache of the network matrices built from branch data, so that
+Task 1, Task 2, Task 3 and the plotting stage do not rebuild the same Y-bus
+over and over again.
+
+Each entry is keyed by a content hash of the network (number of buses,
+branch arrays and bus types) and holds:
+- Y_bus : admittance matrix (from build_y_bus)
+- B_prime, B_dprime : Fast Decoupled matrices (same convention as
+  build_b_matrices in legacy/Fast_Decoupled_Load_Flow.py)
+- slack_bus, pv_buses, pq_buses, non_slack_buses : bus index arrays
+- from_bus, to_bus, x : 0-based branch end indices and branch reactances
+
+The cache keeps the most recently used entries (LRU eviction). It can also
+persist entries to disk as .npz files so that later runs skip the build;
+disk file names also carry results_cache.code_version(), so matrices built
+by an older version of the repo's code are never loaded.
+
+Cached arrays are shared between callers and are therefore read-only;
+copy them before modifying.
+
+Author: [E/21/291]
+Date: January 2026
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from methods.newton_raphson import branch_arrays, build_y_bus
+
+# Maximum number of networks kept in memory
+MAX_ENTRIES = 8
+
+# Directory for on-disk persistence (None = memory only)
+_cache_dir = None
+
+_cache = OrderedDict()
+_stats = {'hits': 0, 'misses': 0, 'disk_hits': 0}
+
+
+def network_hash(num_buses, branch_data, bus_types=None):
+    """
+    Returns a content hash (hex string) identifying a network.
+
+    Two networks get the same hash only if they have the same number of
+    buses, identical branch data and identical bus types.
+    """
+    h = hashlib.sha1()
+    h.update(np.int64(num_buses).tobytes())
+    # Hash the padded branch columns so that a 5-tuple and the equivalent
+    # 7-tuple with a nominal tap give the same key
+    for column in branch_arrays(branch_data):
+        h.update(np.ascontiguousarray(column, dtype=float).tobytes())
+    h.update(np.int64(len(branch_data)).tobytes())
+    if bus_types is not None:
+        h.update(np.ascontiguousarray(np.asarray(bus_types, dtype=np.int64)).tobytes())
+    return h.hexdigest()
+
+
+def _build_b_matrices(num_buses, from_bus, to_bus, x, non_slack, pq_buses):
+    """
+    Builds B' and B'' with the same convention as the legacy
+    build_b_matrices(): B[i,i] -= 1/x and B[i,j] += 1/x for every branch.
+    """
+    b = 1.0 / x
+    B_full = np.zeros((num_buses, num_buses))
+    np.add.at(B_full, (from_bus, from_bus), -b)
+    np.add.at(B_full, (to_bus, to_bus), -b)
+    np.add.at(B_full, (from_bus, to_bus), b)
+    np.add.at(B_full, (to_bus, from_bus), b)
+    B_prime = B_full[np.ix_(non_slack, non_slack)]
+    B_dprime = B_full[np.ix_(pq_buses, pq_buses)]
+    return B_prime, B_dprime
+
+
+def _build_network_entry(num_buses, branch_data):
+    """Builds the Y-bus and branch index arrays of one network."""
+    from_bus, to_bus, r, x, b, tap_ratio, shift_deg = branch_arrays(branch_data)
+    return {
+        'Y_bus': build_y_bus(num_buses, branch_data),
+        'from_bus': from_bus,
+        'to_bus': to_bus,
+        'x': x,
+    }
+
+
+def _build_bus_type_entry(num_buses, network, bus_types):
+    """Builds the bus index arrays and B', B'' for one set of bus types."""
+    bus_types = np.asarray(bus_types)
+    pq_buses = np.where(bus_types == 1)[0]
+    pv_buses = np.where(bus_types == 2)[0]
+    non_slack = np.sort(np.concatenate((pq_buses, pv_buses)))
+    B_prime, B_dprime = _build_b_matrices(num_buses, network['from_bus'],
+                                          network['to_bus'], network['x'],
+                                          non_slack, pq_buses)
+    return {
+        'slack_bus': np.where(bus_types == 0)[0][0],
+        'pv_buses': pv_buses,
+        'pq_buses': pq_buses,
+        'non_slack_buses': non_slack,
+        'B_prime': B_prime,
+        'B_dprime': B_dprime,
+    }
+
+
+def _freeze(entry):
+    """Marks all cached arrays read-only."""
+    for value in entry.values():
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+    return entry
+
+
+def _disk_path(key):
+    # The network hash identifies the input only; the code version ties
+    # the file to the builders (build_y_bus, branch_primitives, ...) too
+    from results_cache import code_version
+
+    return os.path.join(_cache_dir, f"ybus_{key}_{code_version()}.npz")
+
+
+def _load_from_disk(key):
+    if _cache_dir is None or not os.path.exists(_disk_path(key)):
+        return None
+    with np.load(_disk_path(key)) as data:
+        entry = {name: data[name] for name in data.files}
+    if 'slack_bus' in entry:
+        entry['slack_bus'] = int(entry['slack_bus'])
+    return entry
+
+
+def _save_to_disk(key, entry):
+    if _cache_dir is None:
+        return
+    os.makedirs(_cache_dir, exist_ok=True)
+    # Write to a temporary file first so that a concurrent reader never
+    # sees a half-written cache file
+    tmp_path = _disk_path(key) + f".{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **entry)
+    os.replace(tmp_path, _disk_path(key))
+
+
+def _lookup(key, build):
+    """Returns the entry for key from memory, disk or build() (LRU)."""
+    if key in _cache:
+        _stats['hits'] += 1
+        _cache.move_to_end(key)
+        return _cache[key]
+
+    entry = _load_from_disk(key)
+    if entry is not None:
+        _stats['disk_hits'] += 1
+    else:
+        _stats['misses'] += 1
+        entry = build()
+        _save_to_disk(key, entry)
+
+    _cache[key] = _freeze(entry)
+    while len(_cache) > MAX_ENTRIES:
+        _cache.popitem(last=False)
+    return entry
+
+
+def get_network_matrices(num_buses, branch_data, bus_types=None):
+    """
+    Returns the cached network matrices, building them on first use.
+
+    Parameters:
+    -----------
+    num_buses : int
+        Total number of buses in the system
+    branch_data : list of tuples
+        Each tuple: (from_bus, to_bus, R, X, B), optionally followed by
+        (tap_ratio, shift_deg)
+    bus_types : array, optional
+        Bus type codes (0=Slack, 1=PQ, 2=PV). Needed for B', B'' and the
+        bus index arrays; without it only Y_bus and branch indices are built.
+
+    Returns:
+    --------
+    matrices : dict
+        Read-only arrays (see module docstring)
+    """
+    key = network_hash(num_buses, branch_data)
+    network = _lookup(key, lambda: _build_network_entry(num_buses, branch_data))
+    if bus_types is None:
+        return dict(network)
+
+    # The bus-type dependent part is cached separately so that different
+    # bus type assignments share one Y-bus
+    bus_key = key + '_' + network_hash(0, [], bus_types)
+    by_type = _lookup(bus_key, lambda: _build_bus_type_entry(num_buses, network, bus_types))
+    return dict(network, **by_type)
+
+
+def get_y_bus(num_buses, branch_data):
+    """Cached drop-in replacement for build_y_bus()."""
+    return get_network_matrices(num_buses, branch_data)['Y_bus']
+
+
+def set_cache_size(max_entries):
+    """Sets the number of networks kept in memory (evicts LRU entries)."""
+    global MAX_ENTRIES
+    MAX_ENTRIES = max_entries
+    while len(_cache) > MAX_ENTRIES:
+        _cache.popitem(last=False)
+
+
+def enable_disk_cache(cache_dir):
+    """Persists cache entries to cache_dir (None disables persistence)."""
+    global _cache_dir
+    _cache_dir = cache_dir
+
+
+def clear_cache():
+    """Empties the in-memory cache and resets the statistics."""
+    _cache.clear()
+    for name in _stats:
+        _stats[name] = 0
+
+
+def cache_info():
+    """Returns cache statistics (hits, misses, disk hits, current size)."""
+    return dict(_stats, size=len(_cache), max_entries=MAX_ENTRIES)
@@ -0,0 +1,155 @@
+"""
+Task Pipeline Runner
+====================
+Runs a set of stages declared as a dependency graph (DAG):
+
+    stages = {
+        'task2_solve': (run_all_methods, ()),
+        'task3_solve': (perform_sensitivity_analysis, ()),
+        'plots': (generate_plots, ('task2_solve', 'task3_solve')),
+    }
+
+- Every stage runs once; its return value is passed (positionally, in the
+  order of its dependencies) to every stage that depends on it
+- Stages whose dependencies are done run concurrently in a process pool
+- The console output of a stage is captured in its worker and printed in
+  one block when the stage finishes, so parallel stages do not interleave
+- If a stage raises, the stages depending on it are skipped
+
+Author: [E/21/291]
+Date: January 2026
+"""
+
+import contextlib
+import io
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+
+def _stage_order(stages, targets=None):
+    """
+    Returns the stages needed for targets in dependency (topological) order.
+
+    Raises ValueError on unknown dependencies or cycles.
+    """
+    order = []
+    state = {}  # name -> 'visiting' | 'done'
+
+    def visit(name, path):
+        if name not in stages:
+            raise ValueError(f"Unknown stage '{name}' (required by {' -> '.join(path)})")
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+        state[name] = 'visiting'
+        for dep in stages[name][1]:
+            visit(dep, path + [name])
+        state[name] = 'done'
+        order.append(name)
+
+    for name in (targets or stages):
+        visit(name, [])
+    return order
+
+
+def _run_stage(func, args, capture_output):
+    """Runs one stage; returns (result, console output, traceback or None)."""
+    buffer = io.StringIO()
+    redirect = contextlib.redirect_stdout(buffer) if capture_output else contextlib.nullcontext()
+    try:
+        with redirect:
+            result = func(*args)
+        return result, buffer.getvalue(), None
+    except Exception:
+        return None, buffer.getvalue(), traceback.format_exc()
+
+
+def run_pipeline(stages, targets=None, max_workers=None, verbose=True):
+    """
+    Runs the stages of a pipeline.
+
+    Parameters:
+    -----------
+    stages : dict
+        Stage name -> (function, tuple of dependency stage names).
+        Functions must be module-level (picklable) when max_workers > 1.
+    targets : list, optional
+        Stages to produce (their dependencies are added); default all
+    max_workers : int, optional
+        Number of worker processes (default: number of CPUs). With 1 the
+        stages run one after another in this process without capturing
+        their output.
+    verbose : bool
+        Print each stage's output and status as it finishes
+
+    Returns:
+    --------
+    results : dict
+        Stage name -> return value (None for failed/skipped stages)
+    status : dict
+        Stage name -> {'state': 'done' | 'failed' | 'skipped',
+        'time': wall-clock seconds, 'error': traceback or None}
+    """
+    order = _stage_order(stages, targets)
+    max_workers = max_workers or os.cpu_count() or 1
+    results = {}
+    status = {}
+
+    def finish(name, result, output, error, elapsed):
+        results[name] = result
+        status[name] = {'state': 'failed' if error else 'done', 'time': elapsed, 'error': error}
+        if verbose:
+            if output:
+                print(output, end='' if output.endswith('\n') else '\n')
+            if error:
+                print(error)
+            print(f"[pipeline] {name}: {status[name]['state']} ({elapsed:.2f} s)")
+
+    def skip_or_args(name):
+        """Returns the stage arguments, or None if a dependency did not finish."""
+        deps = stages[name][1]
+        failed = [dep for dep in deps if status[dep]['state'] != 'done']
+        if failed:
+            results[name] = None
+            status[name] = {'state': 'skipped', 'time': 0.0,
+                            'error': f"dependency {', '.join(failed)} did not finish"}
+            if verbose:
+                print(f"[pipeline] {name}: skipped ({status[name]['error']})")
+            return None
+        return tuple(results[dep] for dep in deps)
+
+    if max_workers == 1:
+        for name in order:
+            args = skip_or_args(name)
+            if args is None:
+                continue
+            start = time.time()
+            result, output, error = _run_stage(stages[name][0], args, capture_output=False)
+            finish(name, result, output, error, time.time() - start)
+        return results, status
+
+    pending = list(order)
+    running = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            # Submit every stage whose dependencies have all finished
+            for name in list(pending):
+                if all(dep in status for dep in stages[name][1]):
+                    pending.remove(name)
+                    args = skip_or_args(name)
+                    if args is not None:
+                        future = pool.submit(_run_stage, stages[name][0], args, True)
+                        running[future] = (name, time.time())
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, start = running.pop(future)
+                result, output, error = future.result()
+                finish(name, result, output, error, time.time() - start)
+
+    return results, status
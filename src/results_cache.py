@@ -0,0 +1,249 @@
+"""
+Solver Results Cache
+====================
+Memoizes load flow solutions so that the plotting stage (and any re-run of
+Task 2 / Task 3) does not solve the same cases again.
+
+Each result is keyed by:
+- the solver (module and function name)
+- the code version: a hash of every Python source file under src/ and
+  legacy/ (solvers share code such as newton_raphson.SolverState, so any
+  edit invalidates all cached results), plus CODE_VERSION
+- the network (ybus_cache.network_hash of buses, branches and bus types)
+- the solver settings (tolerance, iteration limit, ...)
+- the scenario (specified P, Q and initial voltages)
+
+Entries hold the raw return value of the solver together with its original
+solve time, so that every caller with the same key (e.g. the Task 2 and
+Task 3 base cases) shares one entry.
+
+Results live in memory (LRU, MAX_ENTRIES). Disk persistence is opt-in:
+enable_disk_cache(DEFAULT_CACHE_DIR) stores them as pickle files (oldest
+files are removed once the directory exceeds MAX_DISK_BYTES). Cached
+arrays are shared and therefore read-only.
+
+Author: [E/21/291]
+Date: January 2026
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# Bump when the format of cached entries changes
+CACHE_FORMAT = 1
+
+# Bump to invalidate all cached results when a change is not visible in
+# the hashed sources (e.g. a dependency upgrade)
+CODE_VERSION = 1
+
+# Maximum number of results kept in memory
+MAX_ENTRIES = 1024
+
+# Maximum total size of the on-disk cache
+MAX_DISK_BYTES = 256 * 1024**2
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_DIRS = (os.path.join(ROOT_DIR, 'src'), os.path.join(ROOT_DIR, 'legacy'))
+DEFAULT_CACHE_DIR = os.path.join(ROOT_DIR, 'outputs', 'cache', 'results')
+
+# Directory for on-disk persistence (None = memory only)
+_cache_dir = None
+
+_cache = OrderedDict()
+_code_version = None
+_stats = {'hits': 0, 'misses': 0, 'disk_hits': 0}
+
+
+def code_version():
+    """
+    Returns a hash of all Python sources under SOURCE_DIRS and CODE_VERSION.
+
+    Computed once per process: a solver's results depend on every repo
+    module it calls, not only on the file defining it.
+    """
+    global _code_version
+    if _code_version is None:
+        h = hashlib.sha1(f"{CODE_VERSION}:".encode())
+        for source_dir in SOURCE_DIRS:
+            for dirpath, dirnames, filenames in os.walk(source_dir):
+                dirnames[:] = sorted(d for d in dirnames if d != '__pycache__')
+                for name in sorted(filenames):
+                    if name.endswith('.py'):
+                        path = os.path.join(dirpath, name)
+                        h.update(os.path.relpath(path, ROOT_DIR).encode())
+                        with open(path, 'rb') as f:
+                            h.update(hashlib.sha1(f.read()).digest())
+        _code_version = h.hexdigest()[:16]
+    return _code_version
+
+
+def result_key(solver, network, settings=None, scenario=()):
+    """
+    Returns the cache key of one solve.
+
+    Parameters:
+    -----------
+    solver : function
+        Solver function (its name and the code version enter the key)
+    network : str
+        Network hash (see ybus_cache.network_hash)
+    settings : dict, optional
+        Solver settings (JSON-serializable)
+    scenario : tuple of arrays
+        Scenario inputs, e.g. (P_specified, Q_specified, V_init)
+    """
+    h = hashlib.sha1()
+    h.update(f"{CACHE_FORMAT}:{solver.__module__}.{solver.__qualname__}:"
+             f"{code_version()}:{network}:".encode())
+    h.update(json.dumps(settings or {}, sort_keys=True).encode())
+    for values in scenario:
+        values = np.ascontiguousarray(values)
+        h.update(f"{values.dtype.str}{values.shape}".encode())
+        h.update(values.tobytes())
+    return h.hexdigest()
+
+
+def _freeze(value):
+    """Marks all arrays inside a result read-only."""
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _freeze(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _freeze(item)
+    return value
+
+
+def _disk_path(key):
+    return os.path.join(_cache_dir, f"{key}.pkl")
+
+
+def _load_from_disk(key):
+    if _cache_dir is None or not os.path.exists(_disk_path(key)):
+        return None
+    try:
+        with open(_disk_path(key), 'rb') as f:
+            result = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+    # Mark as recently used for the disk eviction
+    os.utime(_disk_path(key))
+    return result
+
+
+def _save_to_disk(key, result):
+    if _cache_dir is None:
+        return
+    os.makedirs(_cache_dir, exist_ok=True)
+    # Write to a temporary file first so that a concurrent reader never
+    # sees a half-written cache file
+    tmp_path = _disk_path(key) + f".{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, _disk_path(key))
+    _evict_disk()
+
+
+def _evict_disk():
+    """Removes the least recently used files beyond MAX_DISK_BYTES."""
+    files = []
+    for name in os.listdir(_cache_dir):
+        if name.endswith('.pkl'):
+            try:
+                info = os.stat(os.path.join(_cache_dir, name))
+            except OSError:
+                continue
+            files.append((info.st_mtime, info.st_size, name))
+    total = sum(size for _, size, _ in files)
+    for _, size, name in sorted(files):
+        if total <= MAX_DISK_BYTES:
+            break
+        try:
+            os.remove(os.path.join(_cache_dir, name))
+        except OSError:
+            pass
+        total -= size
+
+
+def cached_solve(solver, network, settings, scenario, compute):
+    """
+    Returns the cached result of a solve, computing it on a miss.
+
+    Parameters:
+    -----------
+    solver, network, settings, scenario :
+        Key parts (see result_key())
+    compute : callable
+        Zero-argument function calling solver with exactly these settings
+        and scenario and returning its raw output (arrays, numbers, lists,
+        dicts). Exceptions are not cached.
+
+    Returns:
+    --------
+    result : the (read-only) output of compute()
+    solve_time : float
+        Wall-clock time of the original (uncached) solve in seconds
+    """
+    key = result_key(solver, network, settings, scenario)
+    if key in _cache:
+        _stats['hits'] += 1
+        _cache.move_to_end(key)
+        return _cache[key]
+
+    result = _load_from_disk(key)
+    if result is not None:
+        _stats['disk_hits'] += 1
+    else:
+        _stats['misses'] += 1
+        start_time = time.time()
+        output = compute()
+        result = (output, time.time() - start_time)
+        _save_to_disk(key, result)
+
+    _cache[key] = _freeze(result)
+    while len(_cache) > MAX_ENTRIES:
+        _cache.popitem(last=False)
+    return result
+
+
+def set_cache_size(max_entries=None, max_disk_bytes=None):
+    """Sets the memory (entries) and disk (bytes) limits."""
+    global MAX_ENTRIES, MAX_DISK_BYTES
+    if max_entries is not None:
+        MAX_ENTRIES = max_entries
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+    if max_disk_bytes is not None:
+        MAX_DISK_BYTES = max_disk_bytes
+        if _cache_dir is not None and os.path.isdir(_cache_dir):
+            _evict_disk()
+
+
+def enable_disk_cache(cache_dir=DEFAULT_CACHE_DIR):
+    """Stores results under cache_dir (None keeps them in memory only)."""
+    global _cache_dir
+    _cache_dir = cache_dir
+
+
+def clear_cache(disk=False):
+    """Empties the memory cache (and the disk cache if disk=True)."""
+    _cache.clear()
+    for name in _stats:
+        _stats[name] = 0
+    if disk and _cache_dir is not None and os.path.isdir(_cache_dir):
+        for name in os.listdir(_cache_dir):
+            if name.endswith('.pkl'):
+                os.remove(os.path.join(_cache_dir, name))
+
+
+def cache_info():
+    """Returns cache statistics (hits, misses, disk hits, current size)."""
+    return dict(_stats, size=len(_cache), max_entries=MAX_ENTRIES, cache_dir=_cache_dir)
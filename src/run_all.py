@@ -6,13 +6,22 @@ needed for the EE-354 Power Engineering Load Flow Analysis assignment.
 
 Tasks:
 1. Newton-Raphson Load Flow (with 2nd iteration output)
-2. Comparison of all three methods
+2. Comparison of all five methods
 3. Voltage Sensitivity Analysis
 
+The tasks run as a dependency graph (see pipeline.py): the Task 2 and
+Task 3 load flows are solved once and shared with their report/export
+stages and with the plots, and independent stages run in parallel.
+
+Usage:
+    python run_all.py [--jobs N] [--headless] [--only task1 task2 ...]
+
 Author: [E/21/291]
 Date: January 2026
 """
 
+import argparse
+import os
 import sys
 import time
 
@@ -52,15 +61,16 @@ def run_task1():
     
     try:
         from methods.newton_raphson import (
-            get_ieee_9_bus_data, build_y_bus, newton_raphson,
+            get_ieee_9_bus_data, newton_raphson,
             calculate_line_flows, print_results
         )
+        from methods.ybus_cache import get_y_bus
         
         # Load data
         num_buses, bus_types, P_spec, Q_spec, V_init, branch_data = get_ieee_9_bus_data()
         
-        # Build Y-bus
-        Y_bus = build_y_bus(num_buses, branch_data)
+        # Build Y-bus (cached for Tasks 2 and 3 and the plots)
+        Y_bus = get_y_bus(num_buses, branch_data)
         
         # Run Newton-Raphson
         start_time = time.time()
@@ -93,8 +103,20 @@ def run_task1():
         return False
 
 
-def run_task2():
-    """Runs Task 2: Comparison Framework"""
+def solve_task2():
+    """Solves the Task 2 load flows (all five methods)."""
+    from tasks.task2_comparison import run_all_methods
+    return run_all_methods()
+
+
+def solve_task3():
+    """Solves the Task 3 sensitivity load flows."""
+    from tasks.task3_sensitivity import perform_sensitivity_analysis
+    return perform_sensitivity_analysis()
+
+
+def run_task2(results=None):
+    """Runs Task 2: Comparison Framework (reusing solved results if given)"""
     print("\n" + "*"*100)
     print("*" + " "*30 + "TASK 2: METHOD COMPARISON" + " "*44 + "*")
     print("*"*100 + "\n")
@@ -114,8 +136,9 @@ def run_task2():
             save_results_to_csv, print_discussion_points
         )
         
-        # Run all methods
-        results = run_all_methods()
+        # Run all methods (unless already solved by the pipeline)
+        if results is None:
+            results = run_all_methods()
         
         # Generate tables
         df_v, df_a, df_c, df_l, df_d = generate_comparison_tables(results)
@@ -128,7 +151,7 @@ def run_task2():
         
         print("\n" + "="*100)
         print("✓ TASK 2 COMPLETED SUCCESSFULLY")
-        print("  All three methods executed and compared")
+        print("  All five methods executed and compared")
         print("  Comparative tables generated")
         print("  Results saved to CSV files")
         print("="*100)
@@ -142,8 +165,8 @@ def run_task2():
         return False
 
 
-def run_task3():
-    """Runs Task 3: Voltage Sensitivity Analysis"""
+def run_task3(results=None):
+    """Runs Task 3: Voltage Sensitivity Analysis (reusing solved results if given)"""
     print("\n" + "*"*100)
     print("*" + " "*25 + "TASK 3: VOLTAGE SENSITIVITY ANALYSIS" + " "*38 + "*")
     print("*"*100 + "\n")
@@ -165,8 +188,9 @@ def run_task3():
             print_discussion_guidelines
         )
         
-        # Perform sensitivity analysis
-        results = perform_sensitivity_analysis()
+        # Perform sensitivity analysis (unless already solved by the pipeline)
+        if results is None:
+            results = perform_sensitivity_analysis()
         
         # Generate tables
         df_var, df_std, df_rank = generate_sensitivity_tables(results)
@@ -197,8 +221,8 @@ def run_task3():
         return False
 
 
-def generate_plots():
-    """Generates all plots for the report"""
+def generate_plots(task2_results=None, task3_results=None):
+    """Generates all plots for the report (reusing solved results if given)"""
     print("\n" + "*"*100)
     print("*" + " "*30 + "GENERATING REPORT PLOTS" + " "*47 + "*")
     print("*"*100 + "\n")
@@ -215,7 +239,8 @@ def generate_plots():
     try:
         from visualization import create_all_plots_for_report
         
-        create_all_plots_for_report()
+        if not create_all_plots_for_report(task2_results, task3_results):
+            raise RuntimeError("see the plotting error above")
         
         print("\n" + "="*100)
         print("✓ PLOT GENERATION COMPLETED SUCCESSFULLY")
@@ -233,8 +258,8 @@ def generate_plots():
         return False
 
 
-def print_summary(results):
-    """Prints final summary of all tasks"""
+def print_summary(results, stages=None):
+    """Prints final summary of all tasks (stages: pipeline stage names)"""
     print("\n" + "="*100)
     print("="*100)
     print("=" + " "*98 + "=")
@@ -243,8 +268,9 @@ def print_summary(results):
     print("="*100)
     print("="*100 + "\n")
     
-    task_names = ["Task 1: Newton-Raphson", "Task 2: Method Comparison",
-                  "Task 3: Sensitivity Analysis", "Plot Generation"]
+    task_names = {'task1': "Task 1: Newton-Raphson", 'task2': "Task 2: Method Comparison",
+                  'task3': "Task 3: Sensitivity Analysis", 'plots': "Plot Generation"}
+    task_names = [task_names[name] for name in (stages or task_names)]
     
     for i, (task, success) in enumerate(zip(task_names, results)):
         status = "✓ PASSED" if success else "✗ FAILED"
@@ -273,40 +299,58 @@ def print_summary(results):
     print("="*100 + "\n")
 
 
-def main():
+# Pipeline stages: name -> (function, dependency stages). The solved
+# results of task2_solve/task3_solve are passed to the stages needing them.
+PIPELINE = {
+    'task1': (run_task1, ()),
+    'task2_solve': (solve_task2, ()),
+    'task3_solve': (solve_task3, ()),
+    'task2': (run_task2, ('task2_solve',)),
+    'task3': (run_task3, ('task3_solve',)),
+    'plots': (generate_plots, ('task2_solve', 'task3_solve')),
+}
+
+# Stages reported in the summary, in order
+SUMMARY_STAGES = ['task1', 'task2', 'task3', 'plots']
+
+
+def main(argv=None):
     """Main execution function"""
-    print_banner()
-    
-    print("This script will run all three assignment tasks sequentially.")
-    print("Estimated time: 2-5 minutes depending on your system.")
-    print("\nPress Ctrl+C to cancel, or")
-    input("Press Enter to start execution...")
+    from pipeline import run_pipeline
     
-    results = []
+    parser = argparse.ArgumentParser(description="Run all load flow assignment tasks")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="parallel worker processes (default: CPU count, 1 = sequential)")
+    parser.add_argument('--headless', action='store_true',
+                        help="no GUI: render plots off-screen only (for batch servers)")
+    parser.add_argument('--only', nargs='+', choices=SUMMARY_STAGES, default=None,
+                        help="run only these tasks (and what they depend on)")
+    args = parser.parse_args(argv)
     
-    # Task 1
-    results.append(run_task1())
-    time.sleep(1)
+    if args.headless:
+        # Must be set before matplotlib is imported (also by worker processes)
+        os.environ['MPLBACKEND'] = 'Agg'
     
-    # Task 2
-    results.append(run_task2())
-    time.sleep(1)
+    print_banner()
+    targets = args.only or SUMMARY_STAGES
+    print(f"Running: {', '.join(targets)}")
     
-    # Task 3
-    results.append(run_task3())
-    time.sleep(1)
+    start_time = time.time()
+    results, status = run_pipeline(PIPELINE, targets=targets, max_workers=args.jobs)
     
-    # Generate plots
-    results.append(generate_plots())
+    # A stage counts as passed if it finished and did not report failure
+    passed = [status[name]['state'] == 'done' and results[name] is not False
+              for name in targets]
+    print_summary(passed, targets)
+    print(f"Total time: {time.time() - start_time:.2f} seconds")
     
-    # Print summary
-    print_summary(results)
+    return all(passed)
 
 
 
 if __name__ == "__main__":
     try:
-        main()
+        sys.exit(0 if main() else 1)
     except KeyboardInterrupt:
         print("\n\n⚠️  Execution cancelled by user.")
         print("You can run individual task files separately:")
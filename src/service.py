@@ -0,0 +1,392 @@
+"""
+Local Load Flow Service
+=======================
+Long-lived asyncio HTTP service for interactive tools: the network, its
+Y-bus and the solved base case stay loaded, so a request costs a load flow
+instead of seconds of interpreter start-up and imports.
+
+Concurrent requests are collected into micro-batches and solved together
+by methods.batch_newton.newton_raphson_batch(). A batch is every request
+queued when the solver becomes free (up to max_batch): requests arriving
+during a solve wait in the socket buffers and form the next batch, so
+batches grow with the load without a fixed waiting time (batch_window > 0
+adds one). Every scenario is warm-started from the base-case solution.
+
+The batch is solved on the event loop thread: for the interactive network
+sizes a solve takes well under a millisecond, and a worker thread only
+added GIL hand-over latency.
+
+newton_raphson_batch() holds a dense Jacobian per scenario (batch x size x
+size), so networks above BATCH_BUS_LIMIT buses (e.g. large --raw cases)
+are not batched: the scenarios of a micro-batch are solved one after the
+other with the sparse current-injection engine on a sparse Y-bus.
+
+What stays loaded between requests is the Y-bus and the base-case
+solution, not Jacobian factorizations: every scenario's Jacobian depends
+on its own voltages, so every Newton iteration of a batch factorizes its
+own (the warm start from the base case keeps the iterations few).
+
+Endpoints (HTTP/1.1, keep-alive; TCP or Unix socket):
+
+    GET  /health   service and batching statistics (JSON)
+    POST /solve    body: {"P": [...], "Q": [...], "scale": 1.0}
+                   P/Q: specified injections of all buses in pu (default:
+                   base case); scale multiplies both.
+                   Response: JSON (V_mag, V_angle_deg, P, Q, iterations,
+                   converged, max_mismatch, batch_size), or the raw
+                   little-endian complex128 voltages with
+                   'Accept: application/octet-stream' (solver info in
+                   X-Iterations / X-Converged / X-Max-Mismatch headers).
+
+Usage:
+    python src/service.py [--port 8354 | --unix /tmp/loadflow.sock] [--raw case.raw]
+    python src/service.py --benchmark 2000     # latency under concurrent load
+
+    curl -s -X POST localhost:8354/solve -d '{"scale": 1.1}'
+
+Author: [E/21/291]
+Date: January 2026
+"""
+
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from methods.batch_newton import newton_raphson_batch
+from methods.ybus_cache import get_network_matrices
+
+# Largest network solved with the dense batched Newton-Raphson (64 scenarios
+# of 200 buses hold about 80 MB of Jacobians); larger ones are solved per
+# scenario with sparse matrices
+BATCH_BUS_LIMIT = 200
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+
+class LoadFlowService:
+    """
+    Keeps one network loaded and solves micro-batches of scenarios.
+
+    Parameters:
+    -----------
+    num_buses, bus_types, P_specified, Q_specified, V_init, branch_data :
+        Base case (as returned by get_ieee_9_bus_data())
+    max_batch : int
+        Maximum scenarios solved together
+    batch_window : float
+        Extra seconds to wait for further requests after the first of a
+        batch (0: batch only what is already queued)
+    max_iter, tol : int, float
+        Solver settings
+    """
+
+    def __init__(self, num_buses, bus_types, P_specified, Q_specified, V_init, branch_data,
+                 max_batch=64, batch_window=0.0, max_iter=20, tol=1e-4):
+        self.num_buses = num_buses
+        self.bus_types = np.asarray(bus_types)
+        self.P_base = np.asarray(P_specified, dtype=float)
+        self.Q_base = np.asarray(Q_specified, dtype=float)
+        self.batched = num_buses <= BATCH_BUS_LIMIT
+        if self.batched:
+            self.Y_bus = get_network_matrices(num_buses, branch_data, bus_types)['Y_bus']
+        else:
+            from methods.admittance import AdmittanceMatrix
+            self.Y_bus = AdmittanceMatrix(num_buses, branch_data, sparse=True).Y
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.max_iter = max_iter
+        self.tol = tol
+
+        # Base case solution: start point of every request
+        V, _, _, info = self._solve_batch(self.P_base[None], self.Q_base[None], V_init)
+        if not info['converged'][0]:
+            raise ValueError("The base case load flow does not converge")
+        self.V_base = V[0]
+
+        self.requests = 0
+        self.batches = 0
+        self._queue = None
+
+    # ------------------------------------------
+    # Solving
+    # ------------------------------------------
+
+    def parse_scenario(self, payload):
+        """Returns (P, Q) of a /solve request body; raises ValueError if invalid."""
+        if not isinstance(payload, dict):
+            raise ValueError("Request body must be a JSON object")
+        P = np.asarray(payload.get('P', self.P_base), dtype=float)
+        Q = np.asarray(payload.get('Q', self.Q_base), dtype=float)
+        if P.shape != (self.num_buses,) or Q.shape != (self.num_buses,):
+            raise ValueError(f"P and Q must have {self.num_buses} entries")
+        scale = float(payload.get('scale', 1.0))
+        return P * scale, Q * scale
+
+    async def solve(self, P, Q):
+        """Queues one scenario and returns its (V, P_calc, Q_calc, info, batch_size)."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((P, Q, future))
+        return await future
+
+    def _solve_batch(self, P, Q, V_start=None):
+        """Solves scenarios (rows of P, Q) from V_start (default: the base case)."""
+        V_start = self.V_base if V_start is None else V_start
+        if self.batched:
+            return newton_raphson_batch(self.Y_bus, P, Q, V_start, self.bus_types,
+                                        max_iter=self.max_iter, tol=self.tol)
+        return _solve_each(self.Y_bus, P, Q, V_start, self.bus_types, self.max_iter, self.tol)
+
+    async def _batcher(self):
+        """Collects queued scenarios into micro-batches and solves them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            P = np.array([item[0] for item in batch])
+            Q = np.array([item[1] for item in batch])
+            try:
+                V, P_calc, Q_calc, info = self._solve_batch(P, Q)
+            except Exception as exc:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            self.batches += 1
+            self.requests += len(batch)
+            for k, (_, _, future) in enumerate(batch):
+                if not future.done():
+                    future.set_result((V[k], P_calc[k], Q_calc[k],
+                                       {name: values[k] for name, values in info.items()},
+                                       len(batch)))
+
+    # ------------------------------------------
+    # HTTP
+    # ------------------------------------------
+
+    async def _route(self, method, path, headers, body):
+        """Returns (status, content type, payload bytes, extra headers)."""
+        if path == '/health':
+            if method != 'GET':
+                return _json_response(405, {'error': 'Use GET'})
+            return _json_response(200, {
+                'status': 'ok', 'num_buses': self.num_buses, 'batched': self.batched,
+                'requests': self.requests, 'batches': self.batches,
+                'mean_batch_size': self.requests / self.batches if self.batches else 0.0})
+        if path != '/solve':
+            return _json_response(404, {'error': f"Unknown path '{path}'"})
+        if method != 'POST':
+            return _json_response(405, {'error': 'Use POST'})
+
+        try:
+            P, Q = self.parse_scenario(json.loads(body) if body.strip() else {})
+        except (ValueError, TypeError) as exc:
+            return _json_response(400, {'error': str(exc)})
+
+        V, P_calc, Q_calc, info, batch_size = await self.solve(P, Q)
+        if 'application/octet-stream' in headers.get('accept', ''):
+            return 200, 'application/octet-stream', V.astype('<c16').tobytes(), {
+                'X-Iterations': int(info['iterations']),
+                'X-Converged': str(bool(info['converged'])).lower(),
+                'X-Max-Mismatch': repr(float(info['max_mismatch']))}
+        return _json_response(200, {
+            'V_mag': np.abs(V).tolist(), 'V_angle_deg': np.degrees(np.angle(V)).tolist(),
+            'P': P_calc.tolist(), 'Q': Q_calc.tolist(),
+            'iterations': int(info['iterations']), 'converged': bool(info['converged']),
+            'max_mismatch': float(info['max_mismatch']), 'batch_size': batch_size})
+
+    async def handle_connection(self, reader, writer):
+        """Serves HTTP/1.1 requests on one (keep-alive) connection."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break
+                request_line, *header_lines = head.decode('latin-1').split('\r\n')[:-2]
+                method, target, version = request_line.split()
+                headers = {}
+                for line in header_lines:
+                    name, value = line.split(':', 1)
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                status, content_type, payload, extra = await self._route(
+                    method, urlsplit(target).path, headers, body)
+                keep_alive = (version == 'HTTP/1.1' and
+                              headers.get('connection', '').lower() != 'close')
+                head = [f"HTTP/1.1 {status} {_REASONS[status]}",
+                        f"Content-Type: {content_type}",
+                        f"Content-Length: {len(payload)}",
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+                head += [f"{name}: {value}" for name, value in extra.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode('latin-1') + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8354, unix_path=None):
+        """Starts the batcher and the server; returns the asyncio server."""
+        self._queue = asyncio.Queue()
+        self._batcher_task = asyncio.create_task(self._batcher())
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self.handle_connection, path=unix_path)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+
+def _solve_each(Y_bus, P, Q, V_start, bus_types, max_iter, tol):
+    """
+    Solves scenarios one by one with the sparse current-injection engine;
+    same return values as newton_raphson_batch().
+    """
+    from methods.current_injection import newton_raphson_current_injection
+    from methods.reporting import NULL_REPORTER
+
+    V = np.empty(P.shape, dtype=complex)
+    P_calc, Q_calc = np.empty(P.shape), np.empty(P.shape)
+    info = {'iterations': np.empty(len(P), dtype=int), 'max_mismatch': np.empty(len(P)),
+            'converged': np.empty(len(P), dtype=bool)}
+    for k in range(len(P)):
+        V[k], P_calc[k], Q_calc[k], iteration_data = newton_raphson_current_injection(
+            Y_bus, P[k], Q[k], V_start, bus_types, max_iter=max_iter, tol=tol,
+            verbose=False, reporter=NULL_REPORTER)
+        info['iterations'][k] = len(iteration_data)
+        info['max_mismatch'][k] = iteration_data[-1]['max_mismatch']
+        info['converged'][k] = info['max_mismatch'][k] < tol
+    return V, P_calc, Q_calc, info
+
+
+def _json_response(status, data):
+    return status, 'application/json', json.dumps(data).encode(), {}
+
+
+# ==========================================
+# BENCHMARK CLIENT
+# ==========================================
+
+async def _http_post(reader, writer, path, payload):
+    """Sends one keep-alive POST and returns the decoded JSON response."""
+    body = json.dumps(payload).encode()
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1')
+    length = 0
+    for line in head.split('\r\n')[1:]:
+        if line.lower().startswith('content-length:'):
+            length = int(line.split(':', 1)[1])
+    return json.loads(await reader.readexactly(length))
+
+
+async def _run_clients(port, num_requests, clients):
+    """Sends num_requests /solve requests from concurrent keep-alive clients."""
+    rng = np.random.default_rng(0)
+    latencies, responses = [], []
+
+    async def client(count):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        for _ in range(count):
+            payload = {'scale': float(rng.uniform(0.8, 1.2))}
+            start = time.perf_counter()
+            responses.append(await _http_post(reader, writer, '/solve', payload))
+            latencies.append(time.perf_counter() - start)
+        writer.close()
+
+    await asyncio.gather(*(client(num_requests // clients) for _ in range(clients)))
+    return latencies, [(r['converged'], r['batch_size']) for r in responses]
+
+
+def _client_process(port, num_requests, clients):
+    return asyncio.run(_run_clients(port, num_requests, clients))
+
+
+async def benchmark(service, num_requests=2000, clients=16):
+    """
+    Measures request latency with concurrent keep-alive clients running in
+    a separate process (as the control-room tools would).
+
+    Returns:
+    --------
+    latencies : array of per-request latencies (s)
+    results : list of (converged, batch_size) per request
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    server = await service.start(port=0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            latencies, results = await asyncio.get_running_loop().run_in_executor(
+                pool, _client_process, port, num_requests, clients)
+    return np.array(latencies), results
+
+
+# ==========================================
+# MAIN EXECUTION
+# ==========================================
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local load flow service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8354)
+    parser.add_argument('--unix', help="Serve on this Unix socket instead of TCP")
+    parser.add_argument('--raw', help="PSS/E RAW case (default: built-in IEEE 9-bus data)")
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--batch-window-ms', type=float, default=0.0)
+    parser.add_argument('--benchmark', type=int, metavar='N',
+                        help="Serve N requests from concurrent local clients and report latency")
+    parser.add_argument('--clients', type=int, default=16,
+                        help="Concurrent clients of --benchmark")
+    args = parser.parse_args()
+
+    if args.raw:
+        from methods.psse_raw import read_raw_case, raw_to_load_flow_data
+        case_data = raw_to_load_flow_data(read_raw_case(args.raw))
+    else:
+        from methods.newton_raphson import get_ieee_9_bus_data
+        case_data = get_ieee_9_bus_data()
+    service = LoadFlowService(*case_data, max_batch=args.max_batch,
+                              batch_window=args.batch_window_ms / 1000)
+
+    if args.benchmark:
+        start_time = time.perf_counter()
+        latencies, results = asyncio.run(benchmark(service, args.benchmark, args.clients))
+        elapsed = time.perf_counter() - start_time
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+        print(f"{len(latencies)} requests in {elapsed:.2f} s ({len(latencies) / elapsed:.0f}/s), "
+              f"mean batch size {service.requests / service.batches:.1f}")
+        print(f"Latency: p50 {p50:.2f} ms, p95 {p95:.2f} ms, p99 {p99:.2f} ms; "
+              f"{sum(converged for converged, _ in results)} converged")
+    else:
+        async def main():
+            server = await service.start(args.host, args.port, args.unix)
+            print(f"Load flow service ({service.num_buses} buses) on "
+                  f"{args.unix or f'http://{args.host}:{args.port}'}")
+            async with server:
+                await server.serve_forever()
+
+        try:
+            asyncio.run(main())
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,272 @@
+"""
+Synthetic Scalable Test Grids for Performance Testing
+======================================================
+Builds large synthetic networks by tiling copies of the IEEE 9-bus system
+and interconnecting them with tie lines. The generated case is returned in
+exactly the same format as get_ieee_9_bus_data(), so it can be passed
+straight to build_y_bus() and newton_raphson().
+
+Construction:
+- Each tile is one IEEE 9-bus copy (buses 4-9 form the 230 kV ring)
+- Tiles are laid out on a square grid; the centre tile keeps the slack
+  bus and the slack bus of every other tile becomes PV
+- Branch impedances are scaled by a random line-length factor
+- Loads are scaled randomly and each tile's generation is matched to its
+  own load plus its own losses (found by solving every tile on its own in
+  one batched Newton-Raphson pass), so tie-line flows stay small at any size
+- Each tile is tied to its left and upper neighbours on the grid; extra
+  random diagonal ties make the network more meshed
+- Leftover buses (num_buses not a multiple of 9) are added as radial
+  load buses whose demand is picked up by the local generator
+
+V_init is each tile's stand-alone solved voltage profile rather than a
+flat start. From a flat start the first Newton step sees the losses of
+every tile as surplus generation that has to reach the single slack bus,
+which throws the angles far off on cases with thousands of buses.
+
+The same (num_buses, seed) pair always produces the same case.
+
+Author: [E/21/291]
+Date: January 2026
+"""
+
+import numpy as np
+from methods.newton_raphson import get_ieee_9_bus_data, build_y_bus, newton_raphson
+
+# Base-case generation of the IEEE 9-bus system (pu); the 0.716 pu of the
+# slack bus is recomputed per tile so that it covers that tile's losses
+BASE_GENERATION = np.array([0.716, 1.63, 0.85])
+BASE_LOAD_P = 3.15
+
+# 230 kV buses of a tile (0-based, within the tile) that feed radial buses
+HV_BUSES = np.array([3, 4, 5, 6, 7, 8])
+
+# Tie lines land on bus 4 of each tile: it sits right behind the bus-1
+# generator transformer, so its angle differs least from tile to tile and
+# the ties carry almost no circulating flow
+TIE_BUS = 3
+
+# Typical per-unit parameters of a 230 kV tie line: (R, X, B)
+TIE_LINE_MIN = (0.0085, 0.0720, 0.1490)
+TIE_LINE_MAX = (0.0390, 0.1700, 0.3580)
+
+
+def _random_tie_line(rng):
+    """Returns (R, X, B) of a tie line drawn from the 9-bus line range."""
+    r, x, b = rng.uniform(TIE_LINE_MIN, TIE_LINE_MAX)
+    return float(r), float(x), float(b)
+
+
+def _tile_slack_power(f, t, r, x, b, shunt, P, Q, V_init, tol=1e-8, max_iter=20):
+    """
+    Solves every tile as a stand-alone 9-bus system (bus 1 as slack) in one
+    batched Newton-Raphson pass. Returns the slack power of each tile and
+    the solved (num_tiles x 9) voltages.
+
+    f, t, r, x, b are (num_tiles x num_branches) arrays with 0-based,
+    tile-local bus indices; shunt (the charging of tie lines ending at each
+    bus), P, Q and V_init are (num_tiles x 9) arrays.
+    """
+    num_tiles = P.shape[0]
+    tiles = np.arange(num_tiles)[:, None]
+    y = 1 / (r + 1j * x)
+    y_shunt = 1j * b / 2
+
+    Y = np.zeros((num_tiles, 9, 9), dtype=complex)
+    Y[:, np.arange(9), np.arange(9)] = 1j * shunt
+    np.add.at(Y, (tiles, f, f), y + y_shunt)
+    np.add.at(Y, (tiles, t, t), y + y_shunt)
+    np.add.at(Y, (tiles, f, t), -y)
+    np.add.at(Y, (tiles, t, f), -y)
+
+    _, bus_types, _, _, _, _ = get_ieee_9_bus_data()
+    non_slack = np.where(bus_types != 0)[0]
+    pq = np.where(bus_types == 1)[0]
+    eye = np.eye(9)
+
+    V = V_init.copy()
+    for _ in range(max_iter):
+        I = np.einsum('tij,tj->ti', Y, V)
+        S = V * np.conj(I)
+        mismatch = np.concatenate((P[:, non_slack] - S.real[:, non_slack],
+                                   Q[:, pq] - S.imag[:, pq]), axis=1)
+        if np.max(np.abs(mismatch)) < tol:
+            break
+
+        # Batched polar Jacobian: dS/d(angle) and dS/d|V| for every tile
+        V_norm = V / np.abs(V)
+        dS_dang = 1j * V[:, :, None] * np.conj(I[:, :, None] * eye - Y * V[:, None, :])
+        dS_dmag = (V[:, :, None] * np.conj(Y * V_norm[:, None, :])
+                   + np.conj(I)[:, :, None] * eye * V_norm[:, None, :])
+        J = np.concatenate((
+            np.concatenate((dS_dang.real[:, non_slack][:, :, non_slack],
+                            dS_dmag.real[:, non_slack][:, :, pq]), axis=2),
+            np.concatenate((dS_dang.imag[:, pq][:, :, non_slack],
+                            dS_dmag.imag[:, pq][:, :, pq]), axis=2),
+        ), axis=1)
+        dx = np.linalg.solve(J, mismatch[:, :, None])[:, :, 0]
+
+        angles = np.angle(V)
+        mags = np.abs(V)
+        angles[:, non_slack] += dx[:, :len(non_slack)]
+        mags[:, pq] += dx[:, len(non_slack):]
+        V = mags * np.exp(1j * angles)
+
+    S = V * np.conj(np.einsum('tij,tj->ti', Y, V))
+    return S.real[:, 0], V
+
+
+def generate_synthetic_grid(num_buses, seed=0, load_spread=0.2,
+                            impedance_spread=0.2, extra_tie_prob=0.3):
+    """
+    Generates a deterministic synthetic test grid of any size.
+
+    Parameters:
+    -----------
+    num_buses : int
+        Total number of buses (at least 9)
+    seed : int
+        Random seed; identical seeds give identical cases
+    load_spread : float
+        Loads are scaled by a factor drawn from [1 - spread, 1 + spread]
+    impedance_spread : float
+        Branch R, X and B are scaled by a line-length factor drawn from
+        [1 - spread, 1 + spread]
+    extra_tie_prob : float
+        Probability that a tile gets an extra diagonal tie line
+
+    Returns:
+    --------
+    Same tuple as get_ieee_9_bus_data():
+    num_buses, bus_types, P_specified, Q_specified, V_init, branch_data
+    """
+    if num_buses < 9:
+        raise ValueError("Synthetic grids need at least 9 buses (one 9-bus tile)")
+
+    rng = np.random.default_rng(seed)
+    _, base_types, base_P, base_Q, base_V, base_branches = get_ieee_9_bus_data()
+    V_tile, _, _, _ = newton_raphson(build_y_bus(9, base_branches), base_P, base_Q,
+                                     base_V, base_types, verbose=False)
+
+    num_tiles = num_buses // 9
+    num_radial = num_buses - 9 * num_tiles
+
+    # Square layout of tiles with the slack tile in the centre, so that the
+    # electrical distance to the slack grows only with sqrt(num_tiles)
+    cols = int(np.ceil(np.sqrt(num_tiles)))
+    rows = int(np.ceil(num_tiles / cols))
+    slack_tile = min((rows // 2) * cols + cols // 2, num_tiles - 1)
+
+    bus_types = np.tile(base_types, num_tiles)
+    bus_types[0::9] = 2  # Slack bus of every tile becomes PV...
+    bus_types[9 * slack_tile] = 0  # ...except in the centre tile
+
+    V_init = np.tile(V_tile, num_tiles)
+
+    # Loads: scale each load bus of each tile independently
+    load_scale = rng.uniform(1 - load_spread, 1 + load_spread, size=(num_tiles, 9))
+    load_P = np.minimum(base_P, 0) * load_scale
+    load_Q = np.minimum(base_Q, 0) * load_scale
+
+    # Branches of every tile, scaled by a random line-length factor
+    base = np.array(base_branches, dtype=float)
+    length = rng.uniform(1 - impedance_spread, 1 + impedance_spread,
+                         size=(num_tiles, len(base)))
+    f_local = np.broadcast_to(base[:, 0].astype(int) - 1, length.shape)
+    t_local = np.broadcast_to(base[:, 1].astype(int) - 1, length.shape)
+    r = base[:, 2] * length
+    x = base[:, 3] * length
+    b = base[:, 4] * length
+
+    offsets = 9 * np.arange(num_tiles)[:, None]
+    branch_data = [
+        (int(f), int(t), float(rr), float(xx), float(bb))
+        for f, t, rr, xx, bb in zip((f_local + offsets + 1).ravel(),
+                                    (t_local + offsets + 1).ravel(),
+                                    r.ravel(), x.ravel(), b.ravel())
+    ]
+
+    # Tie lines between bus 4 of neighbouring tiles on the grid
+    tie_shunt = np.zeros((num_tiles, 9))
+
+    def add_tie(tile, other):
+        r_tie, x_tie, b_tie = _random_tie_line(rng)
+        branch_data.append((int(9 * tile + TIE_BUS + 1), int(9 * other + TIE_BUS + 1),
+                            r_tie, x_tie, b_tie))
+        tie_shunt[[tile, other], TIE_BUS] += b_tie / 2
+
+    for tile in range(1, num_tiles):
+        row, col = divmod(tile, cols)
+        if col > 0:
+            add_tie(tile, tile - 1)
+        if row > 0:
+            add_tie(tile, tile - cols)
+            if col > 0 and rng.random() < extra_tie_prob:
+                add_tie(tile, tile - cols - 1)
+
+    # Generation: buses 2 and 3 follow the tile load, bus 1 then covers
+    # whatever is left over, including the tile's own losses with the
+    # charging of its tie lines in place
+    tile_load = -load_P.sum(axis=1)
+    P_tiles = load_P.copy()
+    P_tiles[:, 1:3] = np.outer(tile_load / BASE_LOAD_P, BASE_GENERATION[1:])
+    P_tiles[:, 0], V_tiles = _tile_slack_power(f_local, t_local, r, x, b, tie_shunt,
+                                               P_tiles, load_Q,
+                                               V_init.reshape(num_tiles, 9))
+    V_init = V_tiles.ravel()
+    P_specified = P_tiles.ravel()
+    Q_specified = load_Q.ravel()
+
+    # Leftover buses: radial load buses served by the local generator
+    if num_radial:
+        radial_types = np.ones(num_radial, dtype=bus_types.dtype)
+        radial_P = -rng.uniform(0.1, 0.3, size=num_radial)
+        radial_Q = radial_P * rng.uniform(0.3, 0.4, size=num_radial)
+        radial_V = np.ones(num_radial, dtype=complex)
+
+        for k in range(num_radial):
+            tile = rng.integers(num_tiles)
+            bus = 9 * num_tiles + k + 1
+            feeder = 9 * tile + rng.choice(HV_BUSES) + 1
+            branch_data.append((int(bus), int(feeder)) + _random_tie_line(rng))
+            P_specified[9 * tile + 1] -= radial_P[k]  # Bus 2 of the tile
+            radial_V[k] = np.exp(1j * np.angle(V_init[feeder - 1]))
+
+        bus_types = np.concatenate((bus_types, radial_types))
+        P_specified = np.concatenate((P_specified, radial_P))
+        Q_specified = np.concatenate((Q_specified, radial_Q))
+        V_init = np.concatenate((V_init, radial_V))
+
+    return num_buses, bus_types, P_specified, Q_specified, V_init, branch_data
+
+
+# ==========================================
+# MAIN EXECUTION
+# ==========================================
+
+if __name__ == "__main__":
+    import time
+
+    print("="*80)
+    print("SYNTHETIC TEST GRID GENERATOR")
+    print("="*80)
+
+    for size in [100, 1000, 10000, 100000]:
+        start_time = time.time()
+        num_buses, bus_types, P_spec, Q_spec, V_init, branch_data = \
+            generate_synthetic_grid(size, seed=0)
+        print(f"{size:>7} buses: {len(branch_data):>7} branches, "
+              f"{np.sum(bus_types == 2):>6} PV buses, "
+              f"generated in {time.time() - start_time:.3f} s")
+
+    # Check that a small case solves with the Newton-Raphson program
+    num_buses, bus_types, P_spec, Q_spec, V_init, branch_data = \
+        generate_synthetic_grid(100, seed=0)
+    Y_bus = build_y_bus(num_buses, branch_data)
+    V, P_calc, Q_calc, iter_data = newton_raphson(
+        Y_bus, P_spec, Q_spec, V_init, bus_types, verbose=False
+    )
+    print(f"\n100-bus case: {len(iter_data)} NR iterations, "
+          f"final mismatch {iter_data[-1]['max_mismatch']:.2e} pu, "
+          f"V range {np.min(np.abs(V)):.4f}-{np.max(np.abs(V)):.4f} pu")
+    print("="*80)
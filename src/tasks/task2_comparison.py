@@ -2,10 +2,12 @@
 """
 Task 2: Verification and Comparison Framework
 ==============================================
-This script runs all three load flow methods and generates comparative analysis:
+This script runs all five load flow methods and generates comparative analysis:
 1. Newton-Raphson (your implementation)
 2. Gauss-Seidel
 3. Fast Decoupled Load Flow
+4. Holomorphic Embedding Load Flow (HELM, non-iterative)
+5. Broyden quasi-Newton (one Jacobian, rank-one updates)
 
 Outputs:
 - Comparative tables (bus voltages, line flows, losses)
@@ -31,23 +33,25 @@ sys.path.insert(0, root_dir)
 sys.path.insert(0, legacy_dir)
 
 import numpy as np
-import pandas as pd
-import time
 from methods.newton_raphson import (
-    get_ieee_9_bus_data, build_y_bus, newton_raphson, calculate_line_flows
+    get_ieee_9_bus_data, newton_raphson, calculate_line_flows
 )
+from methods.helm import helm
+from methods.broyden import broyden
+from methods.ybus_cache import get_network_matrices, network_hash
+from results_cache import cached_solve
 from Gauss_Seidel_Load_Flow import gauss_seidel
-from Fast_Decoupled_Load_Flow import fast_decoupled, build_b_matrices
+from Fast_Decoupled_Load_Flow import fast_decoupled
 
 
 def run_all_methods():
     """
-    Runs all three load flow methods and collects results for comparison.
+    Runs all five load flow methods and collects results for comparison.
     
     Returns:
     --------
     results : dict
-        Contains results from all three methods
+        Contains results from all five methods
     """
     print("="*100)
     print(" "*30 + "TASK 2: COMPARISON FRAMEWORK")
@@ -55,7 +59,13 @@ def run_all_methods():
     
     # Load system data
     num_buses, bus_types, P_spec, Q_spec, V_init, branch_data = get_ieee_9_bus_data()
-    Y_bus = build_y_bus(num_buses, branch_data)
+    network = get_network_matrices(num_buses, branch_data, bus_types)
+    Y_bus = network['Y_bus']
+    
+    # Solutions are cached by network, solver, settings and scenario, so
+    # re-runs (e.g. for the plots) skip the load flows
+    network_key = network_hash(num_buses, branch_data, bus_types)
+    scenario = (P_spec, Q_spec, V_init)
     
     results = {
         'system_data': {
@@ -72,12 +82,11 @@ def run_all_methods():
     print("Running Method 1: NEWTON-RAPHSON")
     print("-"*100)
     
-    start_time = time.time()
-    V_nr, P_nr, Q_nr, iter_data_nr = newton_raphson(
-        Y_bus, P_spec, Q_spec, V_init, bus_types, 
-        max_iter=100, tol=1e-4, verbose=False
+    (V_nr, P_nr, Q_nr, iter_data_nr), time_nr = cached_solve(
+        newton_raphson, network_key, {'max_iter': 100, 'tol': 1e-4}, scenario,
+        lambda: newton_raphson(Y_bus, P_spec, Q_spec, V_init, bus_types, 
+                               max_iter=100, tol=1e-4, verbose=False)
     )
-    time_nr = time.time() - start_time
     
     line_flows_nr, loss_P_nr, loss_Q_nr = calculate_line_flows(V_nr, branch_data)
     
@@ -102,10 +111,11 @@ def run_all_methods():
     print("Running Method 2: GAUSS-SEIDEL")
     print("-"*100)
     
-    start_time = time.time()
-    V_gs, iter_gs = gauss_seidel(Y_bus, P_spec, Q_spec, V_init, bus_types, 
-                                  max_iter=1000, tol=1e-4)
-    time_gs = time.time() - start_time
+    (V_gs, iter_gs), time_gs = cached_solve(
+        gauss_seidel, network_key, {'max_iter': 1000, 'tol': 1e-4}, scenario,
+        lambda: gauss_seidel(Y_bus, P_spec, Q_spec, V_init, bus_types, 
+                             max_iter=1000, tol=1e-4)
+    )
     
     # Calculate power injections for GS results
     S_gs = V_gs * np.conj(Y_bus @ V_gs)
@@ -135,10 +145,12 @@ def run_all_methods():
     print("Running Method 3: FAST DECOUPLED LOAD FLOW")
     print("-"*100)
     
-    start_time = time.time()
-    V_fd, iter_fd = fast_decoupled(Y_bus, P_spec, Q_spec, V_init, bus_types, 
-                                     branch_data, max_iter=100, tol=1e-4)
-    time_fd = time.time() - start_time
+    (V_fd, iter_fd), time_fd = cached_solve(
+        fast_decoupled, network_key, {'max_iter': 100, 'tol': 1e-4}, scenario,
+        lambda: fast_decoupled(Y_bus, P_spec, Q_spec, V_init, bus_types, 
+                               branch_data, max_iter=100, tol=1e-4,
+                               B_matrices=(network['B_prime'], network['B_dprime']))
+    )
     
     # Calculate power injections for FD results
     S_fd = V_fd * np.conj(Y_bus @ V_fd)
@@ -161,6 +173,66 @@ def run_all_methods():
     
     print(f"✓ Fast Decoupled completed: {iter_fd} iterations, {time_fd:.6f} seconds")
     
+    # ==========================================
+    # Method 4: Holomorphic Embedding (HELM)
+    # ==========================================
+    print("\n" + "-"*100)
+    print("Running Method 4: HOLOMORPHIC EMBEDDING LOAD FLOW (HELM)")
+    print("-"*100)
+    
+    (V_he, P_he, Q_he, iter_data_he), time_he = cached_solve(
+        helm, network_key, {'max_iter': 60, 'tol': 1e-4}, scenario,
+        lambda: helm(Y_bus, P_spec, Q_spec, V_init, bus_types,
+                     max_iter=60, tol=1e-4, verbose=False)
+    )
+    
+    line_flows_he, loss_P_he, loss_Q_he = calculate_line_flows(V_he, branch_data)
+    
+    # 'iterations' counts series terms (one substitution with the single
+    # factorized matrix each)
+    results['methods']['HELM'] = {
+        'V': V_he,
+        'P': P_he,
+        'Q': Q_he,
+        'iterations': iter_data_he[-1]['iteration'],
+        'time': time_he,
+        'line_flows': line_flows_he,
+        'total_loss_P': loss_P_he,
+        'total_loss_Q': loss_Q_he,
+        'converged': iter_data_he[-1]['max_mismatch'] < 1e-4
+    }
+    
+    print(f"✓ HELM completed: {iter_data_he[-1]['iteration']} series terms, {time_he:.6f} seconds")
+
+    # ==========================================
+    # Method 5: Broyden quasi-Newton
+    # ==========================================
+    print("\n" + "-"*100)
+    print("Running Method 5: BROYDEN QUASI-NEWTON")
+    print("-"*100)
+    
+    (V_br, P_br, Q_br, iter_data_br), time_br = cached_solve(
+        broyden, network_key, {'max_iter': 100, 'tol': 1e-4}, scenario,
+        lambda: broyden(Y_bus, P_spec, Q_spec, V_init, bus_types,
+                        max_iter=100, tol=1e-4, verbose=False)
+    )
+    
+    line_flows_br, loss_P_br, loss_Q_br = calculate_line_flows(V_br, branch_data)
+    
+    results['methods']['Broyden'] = {
+        'V': V_br,
+        'P': P_br,
+        'Q': Q_br,
+        'iterations': len(iter_data_br),
+        'time': time_br,
+        'line_flows': line_flows_br,
+        'total_loss_P': loss_P_br,
+        'total_loss_Q': loss_Q_br,
+        'converged': iter_data_br[-1]['max_mismatch'] < 1e-4
+    }
+    
+    print(f"✓ Broyden completed: {len(iter_data_br)} iterations, {time_br:.6f} seconds")
+    
     return results
 
 
@@ -168,6 +240,9 @@ def generate_comparison_tables(results):
     """
     Generates formatted comparison tables for Task 2 report.
     """
+    # pandas is only needed for the report tables (keeps solver imports light)
+    import pandas as pd
+    
     num_buses = results['system_data']['num_buses']
     methods = results['methods']
     
@@ -288,49 +363,48 @@ def generate_comparison_tables(results):
     return df_voltage, df_angle, df_convergence, df_losses, df_diff
 
 
-def save_results_to_csv(results):
+def save_results_to_csv(results, fmt='csv'):
     """
     Saves comparison results to CSV files for use in reports.
+    
+    Parameters:
+    -----------
+    results : dict
+        Output of run_all_methods()
+    fmt : str
+        Table format: 'csv' (default), 'npz' or 'parquet' (needs pyarrow)
     """
     import os
+    from results_io import write_table
     
-    # Create results directory if it doesn't exist
-    if not os.path.exists('../outputs/tables/comparison_results'):
-        os.makedirs('../outputs/tables/comparison_results')
+    out_dir = '../outputs/tables/comparison_results'
+    os.makedirs(out_dir, exist_ok=True)
     
     num_buses = results['system_data']['num_buses']
     methods = results['methods']
     
-    # Save voltage magnitudes
-    voltage_data = []
-    for i in range(num_buses):
-        row = {'Bus': i+1}
-        for method_name, method_results in methods.items():
-            row[f'{method_name}_Vmag'] = np.abs(method_results['V'][i])
-            row[f'{method_name}_Vang'] = np.degrees(np.angle(method_results['V'][i]))
-        voltage_data.append(row)
-    
-    df_voltages = pd.DataFrame(voltage_data)
-    df_voltages.to_csv('../outputs/tables/comparison_results/bus_voltages.csv', index=False)
-    
-    # Save convergence data
-    convergence_data = []
+    # Save voltage magnitudes (one column per method, straight from V)
+    voltage_columns = {'Bus': np.arange(1, num_buses + 1)}
     for method_name, method_results in methods.items():
-        convergence_data.append({
-            'Method': method_name,
-            'Iterations': method_results['iterations'],
-            'Time_seconds': method_results['time'],
-            'Loss_P_pu': method_results['total_loss_P'],
-            'Loss_Q_pu': method_results['total_loss_Q']
-        })
+        voltage_columns[f'{method_name}_Vmag'] = np.abs(method_results['V'])
+        voltage_columns[f'{method_name}_Vang'] = np.degrees(np.angle(method_results['V']))
+    write_table(os.path.join(out_dir, f'bus_voltages.{fmt}'), voltage_columns)
     
-    df_convergence = pd.DataFrame(convergence_data)
-    df_convergence.to_csv('../outputs/tables/comparison_results/convergence_comparison.csv', index=False)
+    # Save convergence data
+    names = list(methods)
+    convergence_columns = {
+        'Method': np.array(names),
+        'Iterations': np.array([methods[m]['iterations'] for m in names]),
+        'Time_seconds': np.array([methods[m]['time'] for m in names]),
+        'Loss_P_pu': np.array([methods[m]['total_loss_P'] for m in names]),
+        'Loss_Q_pu': np.array([methods[m]['total_loss_Q'] for m in names])
+    }
+    write_table(os.path.join(out_dir, f'convergence_comparison.{fmt}'), convergence_columns)
     
     print("\n" + "="*100)
-    print("Results saved to CSV files in 'outputs/tables/comparison_results/' directory:")
-    print("  - bus_voltages.csv")
-    print("  - convergence_comparison.csv")
+    print(f"Results saved to {fmt.upper()} files in 'outputs/tables/comparison_results/' directory:")
+    print(f"  - bus_voltages.{fmt}")
+    print(f"  - convergence_comparison.{fmt}")
     print("="*100)
 
 
@@ -346,7 +420,7 @@ def print_discussion_points():
     
 NUMERICAL ACCURACY:
 -------------------
-1. Compare the voltage magnitudes and angles from all three methods
+1. Compare the voltage magnitudes and angles from all five methods
 2. Discuss the maximum differences observed
 3. Explain why differences occur (approximations in Fast Decoupled, 
    sequential updates in Gauss-Seidel)
@@ -357,6 +431,7 @@ CONVERGENCE CHARACTERISTICS:
    - Newton-Raphson: Typically 3-5 iterations (quadratic convergence)
    - Gauss-Seidel: Much higher iteration count (linear convergence)
    - Fast Decoupled: Slightly more than NR due to approximations
+   - Broyden: A few more than NR (superlinear), but only one Jacobian
    
 2. Computational Time:
    - Compare total time and time per iteration
@@ -371,6 +446,10 @@ REASONS FOR DEVIATIONS:
 1. Newton-Raphson: Full formulation, most accurate
 2. Gauss-Seidel: Sequential voltage updates, slower convergence
 3. Fast Decoupled: Approximations (decoupling P-θ and Q-V), slightly less accurate
+4. HELM: Exact equations, no start point; accuracy set by the number of
+   series terms (Padé approximant at s = 1)
+5. Broyden: Exact mismatch equations, so the same solution as NR; only the
+   path (secant Jacobian approximations) differs
 
 COMPARISON WITH PSSE:
 ---------------------
@@ -387,7 +466,7 @@ COMPARISON WITH PSSE:
 # ==========================================
 
 if __name__ == "__main__":
-    # Run all three methods
+    # Run all five methods
     results = run_all_methods()
     
     # Generate comparison tables
@@ -15,11 +15,9 @@ Date: January 2026
 """
 
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from methods.newton_raphson import (
-    get_ieee_9_bus_data, build_y_bus, newton_raphson
-)
+from methods.newton_raphson import get_ieee_9_bus_data, newton_raphson
+from methods.ybus_cache import get_y_bus, network_hash
+from results_cache import cached_solve
 
 
 def perform_sensitivity_analysis():
@@ -37,7 +35,23 @@ def perform_sensitivity_analysis():
     
     # Load base case data
     num_buses, bus_types, P_base, Q_base, V_init, branch_data = get_ieee_9_bus_data()
-    Y_bus = build_y_bus(num_buses, branch_data)
+    Y_bus = get_y_bus(num_buses, branch_data)
+    
+    # Load flows are cached by network and load scenario, so re-runs (e.g.
+    # for the plots) skip the solves
+    network_key = network_hash(num_buses, branch_data, bus_types)
+    
+    # Line search keeps stressed scenarios from diverging; where the full
+    # Newton step is good it is taken unchanged
+    def solve(P, Q):
+        result, _ = cached_solve(
+            newton_raphson, network_key,
+            {'max_iter': 100, 'tol': 1e-4, 'step_control': 'line_search'}, (P, Q, V_init),
+            lambda: newton_raphson(Y_bus, P, Q, V_init, bus_types,
+                                   max_iter=100, tol=1e-4, verbose=False,
+                                   step_control='line_search')
+        )
+        return result
     
     # Identify load buses (PQ buses)
     load_buses = np.where(bus_types == 1)[0]
@@ -64,10 +78,7 @@ def perform_sensitivity_analysis():
     print("Running BASE CASE (no load variations)")
     print("-"*100)
     
-    V_base, P_calc_base, Q_calc_base, _ = newton_raphson(
-        Y_bus, P_base, Q_base, V_init, bus_types, 
-        max_iter=100, tol=1e-4, verbose=False
-    )
+    V_base, P_calc_base, Q_calc_base, _ = solve(P_base, Q_base)
     
     base_voltages = np.abs(V_base)
     print(f"✓ Base case completed")
@@ -104,10 +115,7 @@ def perform_sensitivity_analysis():
                 
                 # Run load flow with modified loads
                 try:
-                    V_result, _, _, _ = newton_raphson(
-                        Y_bus, P_modified, Q_modified, V_init, bus_types,
-                        max_iter=100, tol=1e-4, verbose=False
-                    )
+                    V_result, _, _, _ = solve(P_modified, Q_modified)
                     
                     # Store voltage magnitudes
                     voltage_mags = np.abs(V_result)
@@ -159,6 +167,9 @@ def generate_sensitivity_tables(results):
     """
     Generates formatted tables for Task 3 report.
     """
+    # pandas/matplotlib are imported on first use (keeps solver imports light)
+    import pandas as pd
+    
     print("\n" + "="*100)
     print(" "*30 + "SENSITIVITY ANALYSIS TABLES")
     print("="*100)
@@ -246,6 +257,8 @@ def generate_voltage_profile_table(results, load_bus):
     """
     Generates detailed voltage profile table for a specific load bus.
     """
+    import pandas as pd
+    
     print("\n" + "-"*100)
     print(f"DETAILED VOLTAGE PROFILES FOR LOAD BUS {load_bus} VARIATIONS")
     print("-"*100)
@@ -277,7 +290,11 @@ def generate_voltage_profile_table(results, load_bus):
 def plot_sensitivity_results(results):
     """
     Creates visualization plots for sensitivity analysis.
+    
+    Rendered off-screen (Agg) and saved to 'sensitivity_analysis_plots.png'.
     """
+    from visualization import new_figure, plot_scenario_profiles
+    
     print("\n" + "-"*100)
     print("GENERATING PLOTS...")
     print("-"*100)
@@ -286,12 +303,12 @@ def plot_sensitivity_results(results):
     load_buses = results['load_buses']
     
     # Create figure with multiple subplots
-    fig = plt.figure(figsize=(16, 12))
+    fig = new_figure(figsize=(16, 12))
     
     # ==========================================
     # Plot 1: Voltage Variance Heatmap
     # ==========================================
-    ax1 = plt.subplot(2, 2, 1)
+    ax1 = fig.add_subplot(2, 2, 1)
     variance_matrix = np.zeros((num_buses, len(load_buses)))
     for j, load_bus in enumerate(load_buses):
         variance_matrix[:, j] = results['load_analysis'][load_bus]['voltage_variance']
@@ -304,12 +321,12 @@ def plot_sensitivity_results(results):
     ax1.set_xticklabels(load_buses)
     ax1.set_yticks(range(num_buses))
     ax1.set_yticklabels(range(1, num_buses + 1))
-    plt.colorbar(im1, ax=ax1)
+    fig.colorbar(im1, ax=ax1)
     
     # ==========================================
     # Plot 2: Sensitivity Ranking Bar Chart
     # ==========================================
-    ax2 = plt.subplot(2, 2, 2)
+    ax2 = fig.add_subplot(2, 2, 2)
     avg_variances = [results['load_analysis'][lb]['avg_variance'] for lb in load_buses]
     ax2.bar(range(len(load_buses)), avg_variances, color='steelblue')
     ax2.set_xlabel('Load Bus')
@@ -322,25 +339,27 @@ def plot_sensitivity_results(results):
     # ==========================================
     # Plot 3: Voltage Profiles for Most Influential Load
     # ==========================================
-    ax3 = plt.subplot(2, 2, 3)
+    ax3 = fig.add_subplot(2, 2, 3)
     most_influential_bus = load_buses[np.argmax(avg_variances)]
     analysis = results['load_analysis'][most_influential_bus]
     
-    for result in analysis['voltage_results']:
-        label = f"ΔP={result['P_variation']:+.0f}%, ΔQ={result['Q_variation']:+.0f}%"
-        ax3.plot(range(1, num_buses + 1), result['voltages'], marker='o', label=label)
+    labels = [f"ΔP={result['P_variation']:+.0f}%, ΔQ={result['Q_variation']:+.0f}%"
+              for result in analysis['voltage_results']]
+    lines = plot_scenario_profiles(ax3, np.arange(1, num_buses + 1), analysis['all_voltages'],
+                                   labels, marker='o')
     
     ax3.set_xlabel('Bus Number')
     ax3.set_ylabel('Voltage Magnitude (pu)')
     ax3.set_title(f'Voltage Profiles - Load Bus {most_influential_bus} Varied')
-    ax3.legend(fontsize=6, ncol=2)
+    if lines is None:
+        ax3.legend(fontsize=6, ncol=2)
     ax3.grid(True, alpha=0.3)
     ax3.set_xticks(range(1, num_buses + 1))
     
     # ==========================================
     # Plot 4: Standard Deviation Comparison
     # ==========================================
-    ax4 = plt.subplot(2, 2, 4)
+    ax4 = fig.add_subplot(2, 2, 4)
     for load_bus in load_buses:
         std = results['load_analysis'][load_bus]['voltage_std']
         ax4.plot(range(1, num_buses + 1), std, marker='s', label=f'Load Bus {load_bus}')
@@ -352,83 +371,76 @@ def plot_sensitivity_results(results):
     ax4.grid(True, alpha=0.3)
     ax4.set_xticks(range(1, num_buses + 1))
     
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Save figure
-    plt.savefig('sensitivity_analysis_plots.png', dpi=300, bbox_inches='tight')
+    fig.savefig('sensitivity_analysis_plots.png', dpi=300, bbox_inches='tight')
     print("✓ Plots saved to 'sensitivity_analysis_plots.png'")
     
-    plt.show()
-    
     return fig
 
 
-def save_sensitivity_results(results):
+def save_sensitivity_results(results, fmt='csv'):
     """
     Saves sensitivity analysis results to CSV files.
+    
+    Parameters:
+    -----------
+    results : dict
+        Output of perform_sensitivity_analysis()
+    fmt : str
+        Table format: 'csv' (default), 'npz' or 'parquet' (needs pyarrow)
     """
     import os
+    from results_io import write_table
     
-    if not os.path.exists('../outputs/tables/sensitivity_results'):
-        os.makedirs('../outputs/tables/sensitivity_results')
+    out_dir = '../outputs/tables/sensitivity_results'
+    os.makedirs(out_dir, exist_ok=True)
     
     num_buses = results['num_buses']
     load_buses = results['load_buses']
+    analyses = results['load_analysis']
     
     # Save variance data
-    variance_data = []
-    for bus in range(num_buses):
-        row = {'Bus': bus + 1}
-        for load_bus in load_buses:
-            variance = results['load_analysis'][load_bus]['voltage_variance'][bus]
-            std = results['load_analysis'][load_bus]['voltage_std'][bus]
-            row[f'Load{load_bus}_Variance'] = variance
-            row[f'Load{load_bus}_StdDev'] = std
-        variance_data.append(row)
-    
-    df_variance = pd.DataFrame(variance_data)
-    df_variance.to_csv('../outputs/tables/sensitivity_results/voltage_variance.csv', index=False)
-    
-    # Save detailed results for each load bus
+    variance_columns = {'Bus': np.arange(1, num_buses + 1)}
     for load_bus in load_buses:
-        analysis = results['load_analysis'][load_bus]
-        detailed_data = []
-        for result in analysis['voltage_results']:
-            row = {
-                'P_variation_%': result['P_variation'],
-                'Q_variation_%': result['Q_variation'],
-                'P_load_pu': result['P_load'],
-                'Q_load_pu': result['Q_load']
-            }
-            for bus in range(num_buses):
-                row[f'V{bus+1}_pu'] = result['voltages'][bus]
-            detailed_data.append(row)
-        
-        df_detailed = pd.DataFrame(detailed_data)
-        df_detailed.to_csv(f'../outputs/tables/sensitivity_results/load_bus_{load_bus}_detailed.csv', index=False)
+        variance_columns[f'Load{load_bus}_Variance'] = analyses[load_bus]['voltage_variance']
+        variance_columns[f'Load{load_bus}_StdDev'] = analyses[load_bus]['voltage_std']
+    write_table(os.path.join(out_dir, f'voltage_variance.{fmt}'), variance_columns)
     
-    # Save ranking
-    ranking_data = []
+    # Save detailed results for each load bus (voltages from the
+    # scenarios x buses array all_voltages)
     for load_bus in load_buses:
-        analysis = results['load_analysis'][load_bus]
-        ranking_data.append({
-            'Load_Bus': load_bus,
-            'Avg_Variance': analysis['avg_variance'],
-            'Max_Variance': analysis['max_variance'],
-            'Avg_StdDev': np.mean(analysis['voltage_std']),
-            'Max_StdDev': np.max(analysis['voltage_std'])
-        })
-    
-    df_ranking = pd.DataFrame(ranking_data)
-    df_ranking = df_ranking.sort_values('Avg_Variance', ascending=False)
-    df_ranking.to_csv('../outputs/tables/sensitivity_results/sensitivity_ranking.csv', index=False)
+        analysis = analyses[load_bus]
+        scenarios = analysis['voltage_results']
+        detailed_columns = {
+            'P_variation_%': np.array([r['P_variation'] for r in scenarios]),
+            'Q_variation_%': np.array([r['Q_variation'] for r in scenarios]),
+            'P_load_pu': np.array([r['P_load'] for r in scenarios]),
+            'Q_load_pu': np.array([r['Q_load'] for r in scenarios])
+        }
+        for bus in range(num_buses):
+            detailed_columns[f'V{bus+1}_pu'] = analysis['all_voltages'][:, bus]
+        write_table(os.path.join(out_dir, f'load_bus_{load_bus}_detailed.{fmt}'), detailed_columns)
+    
+    # Save ranking (sorted by average variance, highest first)
+    avg_variance = np.array([analyses[b]['avg_variance'] for b in load_buses])
+    order = np.argsort(-avg_variance, kind='stable')
+    ranking_columns = {
+        'Load_Bus': np.asarray(load_buses)[order],
+        'Avg_Variance': avg_variance[order],
+        'Max_Variance': np.array([analyses[b]['max_variance'] for b in load_buses])[order],
+        'Avg_StdDev': np.array([np.mean(analyses[b]['voltage_std']) for b in load_buses])[order],
+        'Max_StdDev': np.array([np.max(analyses[b]['voltage_std']) for b in load_buses])[order]
+    }
+    write_table(os.path.join(out_dir, f'sensitivity_ranking.{fmt}'), ranking_columns)
     
     print("\n" + "="*100)
-    print("Sensitivity results saved to CSV files in 'outputs/tables/sensitivity_results/' directory:")
-    print("  - voltage_variance.csv")
-    print("  - sensitivity_ranking.csv")
+    print(f"Sensitivity results saved to {fmt.upper()} files in 'outputs/tables/sensitivity_results/' directory:")
+    print(f"  - voltage_variance.{fmt}")
+    print(f"  - sensitivity_ranking.{fmt}")
     for load_bus in load_buses:
-        print(f"  - load_bus_{load_bus}_detailed.csv")
+        print(f"  - load_bus_{load_bus}_detailed.{fmt}")
     print("="*100)
 
 
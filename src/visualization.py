@@ -11,14 +11,80 @@ Author: [E/21/291]
 Date: January 2026
 """
 
+import os
+
 import numpy as np
-import matplotlib.pyplot as plt
-import pandas as pd
-import seaborn as sns
 
-# Set style for better-looking plots
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+# Figures are built with the object-oriented API (matplotlib.figure.Figure)
+# and rendered with the Agg backend: no global pyplot state, no GUI windows,
+# and figures can be rendered in worker processes (see render_figures()).
+# matplotlib itself is imported on first use so that importing this module
+# does not slow down solver-only workers.
+
+# seaborn 'husl' palette (6 colors), used as the default line color cycle
+HUSL_COLORS = ['#f77189', '#bb9832', '#50b131', '#36ada4', '#3ba3ec', '#e866f4']
+
+# Scenario sets larger than this are drawn as one LineCollection
+MAX_LABELED_SCENARIOS = 12
+
+_style_applied = False
+
+
+def new_figure(**kwargs):
+    """
+    Returns a new Agg-backed Figure with the report style applied.
+    
+    Keyword arguments are passed to matplotlib.figure.Figure (e.g. figsize).
+    """
+    global _style_applied
+    import matplotlib
+    import matplotlib.style
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    
+    if not _style_applied:
+        # Set style for better-looking plots
+        matplotlib.style.use('seaborn-v0_8-darkgrid')
+        matplotlib.rcParams['axes.prop_cycle'] = matplotlib.cycler(color=HUSL_COLORS)
+        _style_applied = True
+    
+    fig = Figure(**kwargs)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def plot_scenario_profiles(ax, x, profiles, labels=None, cmap='viridis', **line_kwargs):
+    """
+    Draws one line per scenario (e.g. bus voltage profiles).
+    
+    Small sets get one labeled line each; sets larger than
+    MAX_LABELED_SCENARIOS are drawn as a single LineCollection colored by
+    scenario number, which stays fast for thousands of scenarios.
+    
+    Parameters:
+    -----------
+    ax : matplotlib Axes
+    x : array (num_points)
+        Shared x values (e.g. bus numbers)
+    profiles : array (num_scenarios x num_points)
+    labels : list of str, optional
+        Legend labels (used for small sets only)
+    """
+    from matplotlib.collections import LineCollection
+    
+    profiles = np.asarray(profiles)
+    if len(profiles) <= MAX_LABELED_SCENARIOS:
+        for k, profile in enumerate(profiles):
+            ax.plot(x, profile, label=labels[k] if labels is not None else None, **line_kwargs)
+        return None
+    
+    segments = np.stack(np.broadcast_arrays(np.asarray(x)[None, :], profiles), axis=-1)
+    lines = LineCollection(segments, cmap=cmap, linewidths=line_kwargs.get('linewidth', 1.0),
+                           alpha=line_kwargs.get('alpha', 0.5))
+    lines.set_array(np.arange(len(profiles)))
+    ax.add_collection(lines)
+    ax.autoscale_view()
+    return lines
 
 
 def plot_voltage_comparison(results_dict, save_path='voltage_comparison.png'):
@@ -31,7 +97,8 @@ def plot_voltage_comparison(results_dict, save_path='voltage_comparison.png'):
         Dictionary containing results from different methods
         Format: {'Method Name': {'V': voltage_array, ...}, ...}
     """
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+    fig = new_figure(figsize=(12, 10))
+    ax1, ax2 = fig.subplots(2, 1)
     
     # Extract data
     num_buses = len(list(results_dict.values())[0]['V'])
@@ -67,10 +134,9 @@ def plot_voltage_comparison(results_dict, save_path='voltage_comparison.png'):
     ax2.grid(True, alpha=0.3)
     ax2.set_xticks(buses)
     
-    plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches='tight')
+    fig.tight_layout()
+    fig.savefig(save_path, dpi=300, bbox_inches='tight')
     print(f"✓ Voltage comparison plot saved to '{save_path}'")
-    plt.show()
     
     return fig
 
@@ -79,14 +145,15 @@ def plot_convergence_comparison(results_dict, save_path='convergence_comparison.
     """
     Creates bar charts comparing convergence characteristics.
     """
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    fig = new_figure(figsize=(14, 6))
+    ax1, ax2 = fig.subplots(1, 2)
     
     methods = list(results_dict.keys())
     iterations = [results_dict[m]['iterations'] for m in methods]
     times = [results_dict[m]['time'] for m in methods]
     
     # Iterations comparison
-    colors = ['#2E86AB', '#A23B72', '#F18F01']
+    colors = ['#2E86AB', '#A23B72', '#F18F01', '#3B8B5A', '#C73E1D']
     bars1 = ax1.bar(methods, iterations, color=colors, alpha=0.8, edgecolor='black')
     ax1.set_ylabel('Number of Iterations', fontsize=12)
     ax1.set_title('Convergence: Iterations Required', fontsize=14, fontweight='bold')
@@ -110,10 +177,9 @@ def plot_convergence_comparison(results_dict, save_path='convergence_comparison.
         ax2.text(bar.get_x() + bar.get_width()/2., height,
                 f'{height:.4f}', ha='center', va='bottom', fontsize=10, fontweight='bold')
     
-    plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches='tight')
+    fig.tight_layout()
+    fig.savefig(save_path, dpi=300, bbox_inches='tight')
     print(f"✓ Convergence comparison plot saved to '{save_path}'")
-    plt.show()
     
     return fig
 
@@ -135,7 +201,8 @@ def plot_voltage_difference_heatmap(results_dict, reference_method='Newton-Raphs
         diff_matrix[:, j] = np.abs(np.abs(V) - np.abs(V_ref)) * 1000  # Convert to per mille
     
     # Create heatmap
-    fig, ax = plt.subplots(figsize=(10, 8))
+    fig = new_figure(figsize=(10, 8))
+    ax = fig.subplots()
     im = ax.imshow(diff_matrix, aspect='auto', cmap='RdYlGn_r', interpolation='nearest')
     
     # Set ticks and labels
@@ -145,10 +212,11 @@ def plot_voltage_difference_heatmap(results_dict, reference_method='Newton-Raphs
     ax.set_yticklabels([f'Bus {i+1}' for i in range(num_buses)])
     
     # Rotate x labels
-    plt.setp(ax.get_xticklabels(), rotation=45, ha="right", rotation_mode="anchor")
+    for label in ax.get_xticklabels():
+        label.set(rotation=45, ha="right", rotation_mode="anchor")
     
     # Add colorbar
-    cbar = plt.colorbar(im, ax=ax)
+    cbar = fig.colorbar(im, ax=ax)
     cbar.set_label('Voltage Magnitude Difference (×10⁻³ pu)', rotation=270, labelpad=20)
     
     # Add text annotations
@@ -162,10 +230,9 @@ def plot_voltage_difference_heatmap(results_dict, reference_method='Newton-Raphs
     ax.set_xlabel('Method', fontsize=12)
     ax.set_ylabel('Bus Number', fontsize=12)
     
-    plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches='tight')
+    fig.tight_layout()
+    fig.savefig(save_path, dpi=300, bbox_inches='tight')
     print(f"✓ Voltage difference heatmap saved to '{save_path}'")
-    plt.show()
     
     return fig
 
@@ -174,7 +241,8 @@ def plot_power_loss_comparison(results_dict, save_path='power_loss_comparison.pn
     """
     Creates comparison plot for system power losses.
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig = new_figure(figsize=(10, 6))
+    ax = fig.subplots()
     
     methods = list(results_dict.keys())
     p_losses = [results_dict[m]['total_loss_P'] for m in methods]
@@ -203,10 +271,9 @@ def plot_power_loss_comparison(results_dict, save_path='power_loss_comparison.pn
             ax.text(bar.get_x() + bar.get_width()/2., height,
                    f'{height:.6f}', ha='center', va='bottom', fontsize=9)
     
-    plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches='tight')
+    fig.tight_layout()
+    fig.savefig(save_path, dpi=300, bbox_inches='tight')
     print(f"✓ Power loss comparison plot saved to '{save_path}'")
-    plt.show()
     
     return fig
 
@@ -223,7 +290,7 @@ def plot_sensitivity_analysis_comprehensive(sensitivity_results,
     n_profile_rows = (len(load_buses) + 1) // 2  # Ceiling division
     total_rows = 1 + n_profile_rows
     
-    fig = plt.figure(figsize=(18, 4 + 4*n_profile_rows))
+    fig = new_figure(figsize=(18, 4 + 4*n_profile_rows))
     gs = fig.add_gridspec(total_rows, 3, hspace=0.3, wspace=0.3)
     
     # ==========================================
@@ -242,7 +309,7 @@ def plot_sensitivity_analysis_comprehensive(sensitivity_results,
     ax1.set_xticklabels(load_buses)
     ax1.set_yticks(range(num_buses))
     ax1.set_yticklabels(range(1, num_buses + 1))
-    cbar1 = plt.colorbar(im1, ax=ax1)
+    cbar1 = fig.colorbar(im1, ax=ax1)
     cbar1.set_label('Variance (pu²)', rotation=270, labelpad=15)
     
     # ==========================================
@@ -271,25 +338,19 @@ def plot_sensitivity_analysis_comprehensive(sensitivity_results,
         ax = fig.add_subplot(gs[1 + idx//2, idx%2])
         analysis = sensitivity_results['load_analysis'][load_bus]
         
-        # Plot only a subset of scenarios for clarity
-        scenarios_to_plot = [
-            (-10, -10), (-10, 0), (-10, 10),
-            (0, -10), (0, 0), (0, 10),
-            (10, -10), (10, 0), (10, 10)
-        ]
-        
-        for result in analysis['voltage_results']:
-            p_var = result['P_variation']
-            q_var = result['Q_variation']
-            if (p_var, q_var) in scenarios_to_plot:
-                label = f"({p_var:+.0f},{q_var:+.0f})"
-                ax.plot(range(1, num_buses + 1), result['voltages'], 
-                       marker='o', linewidth=1.5, markersize=4, label=label, alpha=0.7)
+        # All scenarios of this load bus (collection-drawn for large sets)
+        scenarios = analysis['voltage_results']
+        labels = [f"({r['P_variation']:+.0f},{r['Q_variation']:+.0f})" for r in scenarios]
+        lines = plot_scenario_profiles(ax, np.arange(1, num_buses + 1), analysis['all_voltages'],
+                                       labels, marker='o', linewidth=1.5, markersize=4, alpha=0.7)
         
         ax.set_xlabel('Bus Number', fontsize=10)
         ax.set_ylabel('Voltage (pu)', fontsize=10)
         ax.set_title(f'Load Bus {load_bus} Varied', fontsize=11, fontweight='bold')
-        ax.legend(fontsize=7, ncol=3, title='(ΔP%,ΔQ%)')
+        if lines is None:
+            ax.legend(fontsize=7, ncol=3, title='(ΔP%,ΔQ%)')
+        else:
+            fig.colorbar(lines, ax=ax).set_label('Scenario')
         ax.grid(True, alpha=0.3)
         ax.set_xticks(range(1, num_buses + 1))
         ax.axhline(y=1.0, color='k', linestyle='--', linewidth=1, alpha=0.3)
@@ -310,19 +371,67 @@ def plot_sensitivity_analysis_comprehensive(sensitivity_results,
     ax_std.grid(True, alpha=0.3)
     ax_std.set_xticks(range(1, num_buses + 1))
     
-    plt.suptitle('Comprehensive Voltage Sensitivity Analysis', 
+    fig.suptitle('Comprehensive Voltage Sensitivity Analysis', 
                 fontsize=16, fontweight='bold', y=0.995)
     
-    plt.savefig(save_path, dpi=300, bbox_inches='tight')
+    fig.savefig(save_path, dpi=300, bbox_inches='tight')
     print(f"✓ Comprehensive sensitivity analysis plot saved to '{save_path}'")
-    plt.show()
     
     return fig
 
 
-def create_all_plots_for_report():
+def _init_render_worker():
+    """Makes sure worker processes never try to open a GUI backend."""
+    os.environ['MPLBACKEND'] = 'Agg'
+
+
+def _render(plot_function, args):
+    """Renders one figure in a worker and returns nothing heavy."""
+    plot_function(*args)
+    return args[-1]
+
+
+def render_figures(jobs, max_workers=None):
+    """
+    Renders figures, in a process pool when there are several.
+    
+    Parameters:
+    -----------
+    jobs : list of (plot_function, args)
+        Module-level plot functions taking the save path as last argument
+    max_workers : int, optional
+        Number of worker processes (default: number of CPUs; 1 renders
+        in this process)
+    
+    Returns:
+    --------
+    paths : list of the saved files, in job order
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    max_workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+    if max_workers <= 1:
+        return [_render(func, args) for func, args in jobs]
+    
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_render_worker) as pool:
+        futures = [pool.submit(_render, func, args) for func, args in jobs]
+        return [future.result() for future in futures]
+
+
+def create_all_plots_for_report(task2_results=None, task3_results=None, max_workers=None):
     """
     Master function to create all plots needed for the assignment report.
+    
+    The five report figures are rendered in parallel (see render_figures()).
+    
+    Parameters:
+    -----------
+    task2_results : dict, optional
+        Output of run_all_methods() (solved here if not given)
+    task3_results : dict, optional
+        Output of perform_sensitivity_analysis() (solved here if not given)
+    max_workers : int, optional
+        Number of rendering processes (default: number of CPUs)
     """
     print("="*100)
     print(" "*30 + "GENERATING ALL PLOTS FOR REPORT")
@@ -332,21 +441,26 @@ def create_all_plots_for_report():
     from tasks.task2_comparison import run_all_methods
     from tasks.task3_sensitivity import perform_sensitivity_analysis
     
+    os.makedirs('../outputs/figures', exist_ok=True)
+    
     try:
-        # Generate Task 2 plots
-        print("\n--- Generating Task 2 Comparison Plots ---")
-        task2_results = run_all_methods()
-        
-        plot_voltage_comparison(task2_results['methods'], '../outputs/figures/report_voltage_comparison.png')
-        plot_convergence_comparison(task2_results['methods'], '../outputs/figures/report_convergence_comparison.png')
-        plot_voltage_difference_heatmap(task2_results['methods'], 'Newton-Raphson', 
-                                       '../outputs/figures/report_voltage_difference_heatmap.png')
-        plot_power_loss_comparison(task2_results['methods'], '../outputs/figures/report_power_loss_comparison.png')
+        # Solve (or reuse) the Task 2 and Task 3 results
+        if task2_results is None:
+            task2_results = run_all_methods()
+        if task3_results is None:
+            task3_results = perform_sensitivity_analysis()
+        methods = task2_results['methods']
         
-        # Generate Task 3 plots
-        print("\n--- Generating Task 3 Sensitivity Analysis Plots ---")
-        task3_results = perform_sensitivity_analysis()
-        plot_sensitivity_analysis_comprehensive(task3_results, '../outputs/figures/report_sensitivity_comprehensive.png')
+        print("\n--- Rendering Task 2 Comparison and Task 3 Sensitivity Plots ---")
+        render_figures([
+            (plot_voltage_comparison, (methods, '../outputs/figures/report_voltage_comparison.png')),
+            (plot_convergence_comparison, (methods, '../outputs/figures/report_convergence_comparison.png')),
+            (plot_voltage_difference_heatmap, (methods, 'Newton-Raphson',
+                                               '../outputs/figures/report_voltage_difference_heatmap.png')),
+            (plot_power_loss_comparison, (methods, '../outputs/figures/report_power_loss_comparison.png')),
+            (plot_sensitivity_analysis_comprehensive,
+             (task3_results, '../outputs/figures/report_sensitivity_comprehensive.png')),
+        ], max_workers)
         
         print("\n" + "="*100)
         print("ALL PLOTS GENERATED SUCCESSFULLY!")
@@ -359,11 +473,13 @@ def create_all_plots_for_report():
         print("  5. outputs/figures/report_sensitivity_comprehensive.png")
         print("\nUse these high-quality plots in your assignment report.")
         print("="*100)
+        return True
         
     except Exception as e:
         print(f"\nError generating plots: {str(e)}")
         import traceback
         traceback.print_exc()
+        return False
 
 
 if __name__ == "__main__":